@@ -0,0 +1,203 @@
+'''This module contains an asyncio-friendly API to Radon.
+
+Parsing and analyzing code is CPU-bound, so calling Radon from a coroutine
+blocks the event loop. The coroutines of this module offload the analysis to
+an executor (by default a pool of worker processes) and limit the number of
+concurrent analyses::
+
+    >>> import radon.aio
+    >>> blocks = await radon.aio.cc(source)
+    >>> async for path, blocks in radon.aio.harvest(paths, config):
+    ...     print(path, blocks)
+
+When a coroutine is cancelled, the analyses that have not started yet are
+cancelled too, while those already running in the executor are completed and
+their results discarded.
+'''
+
+import asyncio
+import concurrent.futures
+import functools
+import os
+import weakref
+
+from radon.cli.harvest import CCHarvester
+from radon.cli.screen import is_generated
+from radon.complexity import cc_visit
+from radon.metrics import h_visit, mi_visit
+from radon.raw import analyze
+
+
+def _discover(harvester):
+    '''Return the list of the files to analyze.'''
+    return list(harvester._iter_filenames())
+
+
+def _harvest_path(harvester, name):
+    '''Analyze a single path with the harvester and return its results.'''
+    return list(harvester._analyze_path(name))
+
+
+class AsyncAnalyzer(object):
+    '''Run the analysis in an executor, at most *concurrency* at a time.
+
+    :param executor: A :class:`concurrent.futures.Executor`. If it is not
+        given, a :class:`~concurrent.futures.ProcessPoolExecutor` is created
+        when it is first needed and it is shut down by :meth:`close`.
+    :param concurrency: The maximum number of analyses running at the same
+        time. Default to the number of processors.
+    '''
+
+    def __init__(self, executor=None, concurrency=None):
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self._executor = executor
+        self._owns_executor = executor is None
+        # Semaphores are bound to an event loop
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self):
+        '''The executor running the analysis.'''
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self.concurrency
+            )
+        return self._executor
+
+    def close(self):
+        '''Shut down the executor, if it was created by this object.'''
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def run(self, func, *args, **kwargs):
+        '''Call ``func(*args, **kwargs)`` in the executor and return its
+        result. When the function is run by worker processes, it and its
+        arguments must be picklable.
+        '''
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphores[loop] = semaphore
+        async with semaphore:
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def cc(self, source, **kwargs):
+        '''Asynchronous version of :func:`~radon.complexity.cc_visit`.'''
+        return await self.run(cc_visit, source, **kwargs)
+
+    async def raw(self, source):
+        '''Asynchronous version of :func:`~radon.raw.analyze`.'''
+        return await self.run(analyze, source)
+
+    async def mi(self, source, multi=True):
+        '''Asynchronous version of :func:`~radon.metrics.mi_visit`.'''
+        return await self.run(mi_visit, source, multi)
+
+    async def hal(self, source):
+        '''Asynchronous version of :func:`~radon.metrics.h_visit`.'''
+        return await self.run(h_visit, source)
+
+    async def harvest(self, paths, config, harvester_class=CCHarvester):
+        '''Analyze *paths* with a Harvester of class *harvester_class* and
+        *config* as configuration, yielding ``(path, results)`` tuples as
+        :meth:`~radon.cli.harvest.Harvester.run` does, but in the order in
+        which the files are completed. At most :attr:`concurrency` files are
+        scheduled at the same time.
+
+        Every path is analyzed on its own in the executor, so the parts of
+        :meth:`~radon.cli.harvest.Harvester.run` that hold state across the
+        files are left out, and these config values are ignored:
+
+        * ``journal`` and ``resume``: nothing is recorded in the journal or
+          read back from it;
+        * ``dedup``: the files with the same content are all analyzed;
+        * ``cache_dir``, ``cache_verify``, ``cache_compress`` and
+          ``cache_max_size``: the result cache and the stat index are neither
+          read nor written;
+        * ``jobs``, ``prefetch``, ``timeout`` and ``memory_limit``: the
+          executor and :attr:`concurrency` take their place, and there is no
+          time or memory budget.
+
+        The modules that look generated are left out when ``generated`` is
+        set, but no summary of the skipped files is written.
+        '''
+        harvester = harvester_class(paths, config)
+        names = iter(await self.run(_discover, harvester))
+        pending = set()
+        try:
+            while True:
+                for name in names:
+                    pending.add(
+                        asyncio.ensure_future(
+                            self.run(_harvest_path, harvester, name)
+                        )
+                    )
+                    if len(pending) >= self.concurrency:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    for path, result in task.result():
+                        if harvester._screen is not None and is_generated(
+                            result
+                        ):
+                            continue
+                        yield path, result
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+_default_analyzer = None
+
+
+def default_analyzer():
+    '''Return the :class:`AsyncAnalyzer` used by the module-level
+    functions, creating it the first time.
+    '''
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = AsyncAnalyzer()
+    return _default_analyzer
+
+
+async def cc(source, **kwargs):
+    '''Compute the Cyclomatic Complexity of *source* in the default
+    executor. See :meth:`AsyncAnalyzer.cc`.
+    '''
+    return await default_analyzer().cc(source, **kwargs)
+
+
+async def raw(source):
+    '''Compute the raw metrics of *source* in the default executor. See
+    :meth:`AsyncAnalyzer.raw`.
+    '''
+    return await default_analyzer().raw(source)
+
+
+async def mi(source, multi=True):
+    '''Compute the Maintainability Index of *source* in the default executor.
+    See :meth:`AsyncAnalyzer.mi`.
+    '''
+    return await default_analyzer().mi(source, multi)
+
+
+async def hal(source):
+    '''Compute the Halstead metrics of *source* in the default executor. See
+    :meth:`AsyncAnalyzer.hal`.
+    '''
+    return await default_analyzer().hal(source)
+
+
+def harvest(paths, config, harvester_class=CCHarvester):
+    '''Analyze *paths* in the default executor. See
+    :meth:`AsyncAnalyzer.harvest`.
+    '''
+    return default_analyzer().harvest(paths, config, harvester_class)
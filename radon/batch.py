@@ -0,0 +1,204 @@
+'''This module contains a batch API to analyze many in-memory sources at once.
+
+The sources are analyzed by a pool of worker processes, which is kept alive
+between calls, and the results are yielded as soon as they are ready::
+
+    >>> from radon.batch import BatchAnalyzer
+    >>> with BatchAnalyzer(metrics=('cc', 'mi'), workers=4) as batch:
+    ...     for key, results in batch.analyze_many(sources):
+    ...         print(key, results['mi'])
+
+The results of every source are a dictionary mapping each requested metric to
+its results: a list of blocks for ``cc``, a :class:`~radon.raw.Module` for
+``raw``, a float for ``mi`` and a :class:`~radon.metrics.Halstead` for
+``hal``. If the analysis fails, the value is a dictionary holding the error
+message, as in ``{'error': 'invalid syntax (<unknown>, line 1)'}``.
+'''
+
+import concurrent.futures
+import os
+
+from radon.cache import content_hash
+from radon.complexity import cc_visit
+from radon.metrics import h_visit, mi_visit
+from radon.raw import analyze
+from radon.serialize import dumps, loads
+
+METRICS = ('cc', 'raw', 'mi', 'hal')
+
+
+def analyze_source(source, metrics=METRICS, no_assert=False, multi=True):
+    '''Analyze a single source and return a dictionary mapping each metric in
+    *metrics* to its results. *no_assert* is passed to
+    :func:`~radon.complexity.cc_visit`, while *multi* is passed to
+    :func:`~radon.metrics.mi_visit`.
+    '''
+    functions = {
+        'cc': lambda: cc_visit(source, no_assert=no_assert),
+        'raw': lambda: analyze(source),
+        'mi': lambda: mi_visit(source, multi),
+        'hal': lambda: h_visit(source),
+    }
+    results = {}
+    for metric in metrics:
+        try:
+            results[metric] = functions[metric]()
+        except Exception as e:
+            results[metric] = {'error': str(e)}
+    return results
+
+
+def _analyze_task(args):
+    '''Unpack the arguments of :func:`analyze_source` inside a worker. The
+    results are sent back in the binary format of :mod:`radon.serialize`,
+    which is much cheaper to transfer than the pickled result objects.
+    '''
+    key, source, metrics, no_assert, multi = args
+    return key, dumps(analyze_source(source, metrics, no_assert, multi))
+
+
+class BatchAnalyzer(object):
+    '''Analyze many sources, using a pool of worker processes.
+
+    :param metrics: The metrics to compute, any of ``cc``, ``raw``, ``mi`` and
+        ``hal``. Default to all of them.
+    :param workers: The number of worker processes. If it is `None`, it
+        defaults to the number of processors; if it is 0, the sources are
+        analyzed in the calling process.
+    :param cache: An optional mapping used to cache the results, keyed by the
+        hash of the content of the sources. A plain dictionary works, as does
+        a persistent :class:`~radon.cache.ResultCache`.
+    :param no_assert: If True, `assert` statements are not counted when
+        computing the complexity.
+    :param multi: If True, multiline strings are counted as comments when
+        computing the Maintainability Index.
+
+    The pool is created the first time it is needed and it is reused by every
+    call to :meth:`analyze_many`, until :meth:`close` is called.
+    '''
+
+    def __init__(
+        self,
+        metrics=METRICS,
+        workers=None,
+        cache=None,
+        no_assert=False,
+        multi=True,
+    ):
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(
+                'unknown metrics: {0}'.format(', '.join(sorted(unknown)))
+            )
+        self.metrics = tuple(metrics)
+        self.workers = os.cpu_count() if workers is None else workers
+        self.cache = cache
+        self.no_assert = no_assert
+        self.multi = multi
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def executor(self):
+        '''The pool of worker processes.'''
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self.workers
+            )
+        return self._executor
+
+    def close(self):
+        '''Shut down the worker processes.'''
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def cache_key(self, source):
+        '''Return the key of *source* in the cache. It depends on the content
+        of the source and on the options of the analysis.
+        '''
+        return content_hash(
+            source, ','.join(self.metrics), self.no_assert, self.multi
+        )
+
+    def analyze_many(self, sources):
+        '''Analyze every ``(key, source)`` tuple in the iterable *sources* and
+        yield ``(key, results)`` tuples, in the order in which they are
+        completed.
+
+        The iterable is consumed lazily: at most a few tasks per worker are
+        pending at any time.
+        '''
+        if not self.workers:
+            for key, source in sources:
+                yield key, self.analyze(source)
+            return
+
+        pending = {}
+        max_pending = 4 * self.workers
+        sources = iter(sources)
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    key, source = next(sources)
+                except StopIteration:
+                    exhausted = True
+                    break
+                cache_key = None
+                if self.cache is not None:
+                    cache_key = self.cache_key(source)
+                    results = self.cache.get(cache_key)
+                    if results is not None:
+                        yield key, results
+                        continue
+                task = (key, source, self.metrics, self.no_assert, self.multi)
+                future = self.executor.submit(_analyze_task, task)
+                pending[future] = cache_key
+            if not pending:
+                return
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                cache_key = pending.pop(future)
+                key, results = future.result()
+                results = loads(results)
+                if self.cache is not None:
+                    self.cache[cache_key] = results
+                yield key, results
+
+    def analyze(self, source):
+        '''Analyze a single source in the calling process, looking it up in
+        the cache first.
+        '''
+        if self.cache is None:
+            return analyze_source(
+                source, self.metrics, self.no_assert, self.multi
+            )
+        cache_key = self.cache_key(source)
+        results = self.cache.get(cache_key)
+        if results is None:
+            results = analyze_source(
+                source, self.metrics, self.no_assert, self.multi
+            )
+            self.cache[cache_key] = results
+        return results
+
+
+def analyze_many(
+    sources, metrics=METRICS, workers=None, cache=None, **kwargs
+):
+    '''Analyze every ``(key, source)`` tuple in the iterable *sources* with a
+    temporary :class:`BatchAnalyzer` and yield ``(key, results)`` tuples as
+    soon as they are ready. All the other arguments are passed to
+    :class:`BatchAnalyzer`.
+    '''
+    with BatchAnalyzer(metrics, workers, cache, **kwargs) as batch:
+        for result in batch.analyze_many(sources):
+            yield result
@@ -0,0 +1,772 @@
+'''This module contains a persistent cache for analysis results.
+
+The results are stored on disk and they are keyed by a hash of the analyzed
+source and of the options of the analysis, so that stale entries are never
+returned: when a file changes, its key changes too::
+
+    >>> from radon.cache import ResultCache, content_hash
+    >>> cache = ResultCache('.radon-cache')
+    >>> key = content_hash(source, 'cc')
+    >>> results = cache.get(key)
+    >>> if results is None:
+    ...     results = cache[key] = {'cc': cc_visit(source)}
+
+Two layouts of the cache directory are available, with the same interface:
+
+* a :class:`ResultCache` stores one file per entry. It can be shared by
+  several processes, since every entry is written to a temporary file first
+  and then atomically renamed to its final name, but it gets slow to write,
+  back up and clean when there are millions of entries;
+* a :class:`PackedResultCache` appends the entries to a few ``.pack`` files,
+  one per process, each with an ``.idx`` file holding its keys sorted for a
+  binary search (see :class:`PackedResultCache` for the details).
+
+The command line (``--cache-dir``) uses a :class:`PackedResultCache`, while
+the flake8 plugin keeps a :class:`ResultCache`.
+
+Hashing the content of a file requires reading it, which is the most
+expensive part of a run on a cold page cache. A :class:`StatIndex` remembers
+the content hash of every file together with its inode, size and modification
+time, so that the files that did not change are recognized from a single
+``stat`` call: their content is hashed again only when their fingerprint
+differs.
+'''
+
+import errno
+import hashlib
+import os
+import struct
+import tempfile
+import time
+import uuid
+import zlib
+
+import radon
+from radon.serialize import (
+    FormatError,
+    _pack_str,
+    _Unpacker,
+    dumps,
+    loads,
+)
+
+INDEX_MAGIC = b'RDNX'
+
+# The inode, the size and the modification time (in nanoseconds) of a file,
+# followed by the time when its content was hashed
+INDEX_ENTRY = struct.Struct('<QQqd')
+
+PACK_MAGIC = b'RDNP'
+PACK_INDEX_MAGIC = b'RDNQ'
+
+# Every entry of a pack starts with its binary key, the size and the CRC-32 of
+# its data and its flags
+PACK_ENTRY = struct.Struct('<20sIIB')
+# The index of a pack starts with the size of the part of the pack that it
+# covers and its flags...
+PACK_INDEX = struct.Struct('<QB')
+# ...and it is followed by the binary key and the offset of every entry,
+# sorted by key
+PACK_ROW = struct.Struct('<20sQ')
+
+# The flag of the compressed entries
+COMPRESSED = 1
+# The flag of the indexes of the packs that are no longer written
+SEALED = 1
+
+# The packs are merged when there are more than this many of them
+MAX_PACKS = 16
+# A pack that was not modified for this many seconds, or a lock that old, was
+# abandoned by its process
+STALE_AGE = 3600
+
+LOCK_NAME = 'compact.lock'
+
+# A file modified less than this many seconds before its content was hashed
+# may have changed again without a visible change of its modification time,
+# on file systems with a coarse timestamp resolution. Its content is hashed
+# again on the next lookup.
+RACY_WINDOW = 2
+
+
+def _makedirs(dirname):
+    '''Create the directory *dirname*, if it does not exist.'''
+    if not os.path.isdir(dirname):
+        try:
+            os.makedirs(dirname)
+        except OSError:
+            # Another process may have created it in the meantime
+            if not os.path.isdir(dirname):
+                raise
+
+
+def _write_atomic(path, encode, *args):
+    '''Write the bytes returned by ``encode(*args)`` to a temporary file in
+    the directory of *path* and then rename it to *path*, so that readers
+    never see a partial file.
+    '''
+    dirname = os.path.dirname(path)
+    _makedirs(dirname)
+    fd, tmp = tempfile.mkstemp(dir=dirname, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as fobj:
+            fobj.write(encode(*args))
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def content_hash(source, *options):
+    '''Return the hexadecimal hash of *source*, which can be either text or
+    bytes, together with the analysis *options* and the version of Radon.
+    '''
+    if not isinstance(source, bytes):
+        source = source.encode('utf-8', 'surrogatepass')
+    options = '|'.join(
+        str(option) for option in (radon.__version__,) + options
+    )
+    digest = hashlib.sha1(options.encode('utf-8') + b'\0' + source)
+    return digest.hexdigest()
+
+
+class ResultCache(object):
+    '''A mapping-like cache of analysis results stored in *directory*.
+
+    Every entry is a dictionary mapping some metrics (``cc``, ``raw``, ``mi``
+    and ``hal``) to their results, which are stored in the binary format of
+    :mod:`radon.serialize`. Entries that cannot be read are treated as
+    missing.
+    '''
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, key):
+        '''Return the path of the file holding the entry *key*.'''
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, key, default=None):
+        '''Return the entry *key*, or *default* if it is not in the cache.'''
+        try:
+            with open(self.path(key), 'rb') as fobj:
+                return loads(fobj.read())
+        except Exception:
+            return default
+
+    def __getitem__(self, key):
+        value = self.get(key, self)
+        if value is self:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return os.path.exists(self.path(key))
+
+    def __setitem__(self, key, value):
+        _write_atomic(self.path(key), dumps, value)
+
+
+def _index_path(path):
+    '''Return the path of the index of the pack at *path*.'''
+    return path[:-len('.pack')] + '.idx'
+
+
+def _read_pack_index(data):
+    '''Decode the index of a pack and return a tuple ``(size, flags, rows)``,
+    *rows* being the bytes of the sorted rows.
+    '''
+    start = len(PACK_INDEX_MAGIC) + PACK_INDEX.size
+    if data[:len(PACK_INDEX_MAGIC)] != PACK_INDEX_MAGIC or len(data) < start:
+        raise FormatError('not a Radon pack index')
+    if (len(data) - start) % PACK_ROW.size:
+        raise FormatError('truncated pack index')
+    size, flags = PACK_INDEX.unpack_from(data, len(PACK_INDEX_MAGIC))
+    return size, flags, data[start:]
+
+
+def _dump_pack_index(offsets, size, flags):
+    '''Encode the index of a pack whose entries are at the *offsets* given by
+    a dictionary keyed by the binary keys, and which covers the first *size*
+    bytes of the pack.
+    '''
+    parts = [PACK_INDEX_MAGIC, PACK_INDEX.pack(size, flags)]
+    for key in sorted(offsets):
+        parts.append(PACK_ROW.pack(key, offsets[key]))
+    return b''.join(parts)
+
+
+def _read_entry(fobj, offset):
+    '''Read the entry of a pack at *offset* and return a tuple ``(key,
+    flags, data)``. Raise :exc:`~radon.serialize.FormatError` if it is
+    truncated or corrupted.
+    '''
+    fobj.seek(offset)
+    header = fobj.read(PACK_ENTRY.size)
+    if len(header) < PACK_ENTRY.size:
+        raise FormatError('truncated pack entry')
+    key, size, crc, flags = PACK_ENTRY.unpack(header)
+    data = fobj.read(size)
+    if len(data) < size or zlib.crc32(data) & 0xffffffff != crc:
+        raise FormatError('corrupted pack entry')
+    return key, flags, data
+
+
+class _Pack(object):
+    '''A pack of a :class:`PackedResultCache`, opened for reading. The
+    entries that are not covered by the index of the pack, if any, are found
+    by scanning the pack.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.fobj = open(path, 'rb')
+        try:
+            if self.fobj.read(len(PACK_MAGIC)) != PACK_MAGIC:
+                raise FormatError('not a Radon pack')
+            self.fobj.seek(0, os.SEEK_END)
+            end = self.fobj.tell()
+            covered, self.flags, self.rows = len(PACK_MAGIC), 0, b''
+            try:
+                with open(_index_path(path), 'rb') as fobj:
+                    index = _read_pack_index(fobj.read())
+                if index[0] <= end:
+                    covered, self.flags, self.rows = index
+            except (IOError, OSError, FormatError):
+                pass
+            self.tail = {}
+            self.size = self._scan(covered, end)
+        except BaseException:
+            self.fobj.close()
+            raise
+
+    @property
+    def sealed(self):
+        '''True if the pack is no longer written.'''
+        return bool(self.flags & SEALED)
+
+    def _scan(self, offset, end):
+        '''Find the entries between *offset* and *end*, and return the
+        offset of the first incomplete one.'''
+        while offset + PACK_ENTRY.size <= end:
+            self.fobj.seek(offset)
+            key, size, _, _ = PACK_ENTRY.unpack(
+                self.fobj.read(PACK_ENTRY.size)
+            )
+            if offset + PACK_ENTRY.size + size > end:
+                break
+            self.tail[key] = offset
+            offset += PACK_ENTRY.size + size
+        return offset
+
+    def find(self, key):
+        '''Return the offset of the entry *key*, or `None`.'''
+        offset = self.tail.get(key)
+        if offset is not None:
+            return offset
+        # Binary search of the sorted rows of the index
+        low, high = 0, len(self.rows) // PACK_ROW.size
+        while low < high:
+            middle = (low + high) // 2
+            start = middle * PACK_ROW.size
+            if self.rows[start:start + len(key)] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low * PACK_ROW.size < len(self.rows):
+            row_key, offset = PACK_ROW.unpack_from(
+                self.rows, low * PACK_ROW.size
+            )
+            if row_key == key:
+                return offset
+        return None
+
+    def offsets(self):
+        '''Return the offsets of all the entries, in the order in which they
+        were written.'''
+        offsets = set(self.tail.values())
+        offsets.update(offset for _, offset in PACK_ROW.iter_unpack(self.rows))
+        return sorted(offsets)
+
+    def close(self):
+        self.fobj.close()
+
+
+def _acquire(path):
+    '''Try to create the lock file *path*, removing it first if it was
+    abandoned. Return True if the lock was acquired.
+    '''
+    for _ in range(2):
+        try:
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+            return True
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                return False
+        try:
+            if time.time() - os.path.getmtime(path) < STALE_AGE:
+                return False
+            os.remove(path)
+        except OSError:
+            pass
+    return False
+
+
+def _remove(path):
+    '''Remove the file *path*, ignoring the errors: it may have been removed
+    by another process or, on Windows, still be open.'''
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class PackedResultCache(object):
+    '''A mapping-like cache of analysis results stored in *directory*, with
+    the same interface as :class:`ResultCache`, whose entries are stored in a
+    few pack files.
+
+    Every process appends the entries that it writes to a pack of its own, so
+    that no locking is needed. An index of the pack, with the keys sorted for
+    a binary search, is written by :meth:`flush` and when the cache is
+    closed; the entries written after it, as those left by a process that
+    crashed, are found by scanning the pack. If *compress* is True, the
+    entries are compressed with zlib.
+
+    When the cache is closed, the packs are compacted if there are too many
+    of them or if their total size is over *max_size* bytes (0 means no
+    limit): see :meth:`compact`.
+    '''
+
+    def __init__(self, directory, compress=False, max_size=0):
+        self.directory = directory
+        self.compress = compress
+        self.max_size = max_size
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._packs = None
+        self._path = None
+        self._fd = None
+        self._reader = None
+        self._size = 0
+        self._offsets = {}
+
+    def __getstate__(self):
+        '''Only the configuration of the cache is sent to the worker
+        processes: they open their own packs.'''
+        return {
+            'directory': self.directory,
+            'compress': self.compress,
+            'max_size': self.max_size,
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _check_pid(self):
+        '''Forget the files inherited from the parent process after a fork,
+        since their offsets are shared with it.'''
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _pack_paths(self):
+        '''Return the paths of the packs, the newest first.'''
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(
+            (
+                os.path.join(self.directory, name)
+                for name in names
+                if name.startswith('pack-') and name.endswith('.pack')
+            ),
+            reverse=True,
+        )
+
+    @property
+    def packs(self):
+        '''The packs written by the other processes, the newest first.'''
+        self._check_pid()
+        if self._packs is None:
+            self._packs = []
+            for path in self._pack_paths():
+                if path == self._path:
+                    continue
+                try:
+                    self._packs.append(_Pack(path))
+                except (IOError, OSError, FormatError):
+                    # Removed by a compaction in the meantime
+                    pass
+        return self._packs
+
+    def _lookup(self, key):
+        '''Return a tuple ``(fobj, offset)`` locating the entry *key*, or
+        `None` if it is not in the cache.'''
+        key = bytes.fromhex(key)
+        offset = self._offsets.get(key)
+        if offset is not None:
+            return self._reader, offset
+        for pack in self.packs:
+            offset = pack.find(key)
+            if offset is not None:
+                return pack.fobj, offset
+        return None
+
+    def get(self, key, default=None):
+        '''Return the entry *key*, or *default* if it is not in the cache.'''
+        try:
+            location = self._lookup(key)
+            if location is None:
+                return default
+            _, flags, data = _read_entry(*location)
+            if flags & COMPRESSED:
+                data = zlib.decompress(data)
+            return loads(data)
+        except Exception:
+            return default
+
+    def __getitem__(self, key):
+        value = self.get(key, self)
+        if value is self:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        try:
+            return self._lookup(key) is not None
+        except ValueError:
+            return False
+
+    def __setitem__(self, key, value):
+        key = bytes.fromhex(key)
+        data = dumps(value)
+        flags = 0
+        if self.compress:
+            data = zlib.compress(data)
+            flags |= COMPRESSED
+        crc = zlib.crc32(data) & 0xffffffff
+        entry = memoryview(PACK_ENTRY.pack(key, len(data), crc, flags) + data)
+        self._open_pack()
+        offset = self._size
+        try:
+            while entry:
+                entry = entry[os.write(self._fd, entry):]
+        except BaseException:
+            # Do not leave a partial entry before the next ones
+            os.ftruncate(self._fd, offset)
+            raise
+        self._size += PACK_ENTRY.size + len(data)
+        self._offsets[key] = offset
+
+    def _open_pack(self):
+        '''Create the pack of this process, if it does not exist yet. The
+        names of the packs start with their creation time, so that they sort
+        from the oldest to the newest.'''
+        self._check_pid()
+        if self._fd is not None:
+            return
+        _makedirs(self.directory)
+        name = 'pack-{0:016x}-{1}.pack'.format(
+            int(time.time() * 1e6), uuid.uuid4().hex[:16]
+        )
+        path = os.path.join(self.directory, name)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_APPEND
+        fd = os.open(path, flags | getattr(os, 'O_BINARY', 0), 0o666)
+        os.write(fd, PACK_MAGIC)
+        self._path, self._fd = path, fd
+        self._size = len(PACK_MAGIC)
+        self._reader = open(path, 'rb')
+
+    @property
+    def path(self):
+        '''The path of the pack written by this process, or `None` if it
+        did not write anything.'''
+        self._check_pid()
+        return self._path
+
+    def seal(self, path):
+        '''Mark the pack at *path*, written by a process that exited without
+        closing its cache, as no longer written, so that it can be compacted.
+        '''
+        index_path = _index_path(path)
+        with open(index_path, 'rb') as fobj:
+            size, flags, rows = _read_pack_index(fobj.read())
+        _write_atomic(
+            index_path,
+            b''.join,
+            [PACK_INDEX_MAGIC, PACK_INDEX.pack(size, flags | SEALED), rows],
+        )
+
+    def flush(self, flags=0):
+        '''Write the index of the pack of this process, so that the other
+        processes do not have to scan it.'''
+        self._check_pid()
+        if self._fd is None:
+            return
+        _write_atomic(
+            _index_path(self._path),
+            _dump_pack_index,
+            self._offsets,
+            self._size,
+            flags,
+        )
+
+    def close(self):
+        '''Seal the pack of this process, close all the packs and compact
+        them if needed.'''
+        self._check_pid()
+        written = self._fd is not None
+        try:
+            if written:
+                self.flush(SEALED)
+        finally:
+            if written:
+                os.close(self._fd)
+                self._reader.close()
+            for pack in self._packs or ():
+                pack.close()
+            self._reset()
+        if written:
+            paths = self._pack_paths()
+            size = sum(os.path.getsize(path) for path in paths)
+            if len(paths) > MAX_PACKS or 0 < self.max_size < size:
+                self.compact()
+
+    def compact(self):
+        '''Merge the packs that are no longer written into a single one,
+        keeping only the newest copy of every entry and, if the total size of
+        the entries is over *max_size*, only the newest entries that fit.
+        Return False if another process is already compacting the cache.
+
+        The other processes are never blocked: the new pack is written beside
+        the old ones and renamed into place, and then the old ones are
+        removed. The processes that already opened them can still read them
+        until they close them.
+        '''
+        self._check_pid()
+        lock = os.path.join(self.directory, LOCK_NAME)
+        if not _acquire(lock):
+            return False
+        try:
+            self._compact()
+        finally:
+            _remove(lock)
+        return True
+
+    def _compact(self):
+        now = time.time()
+        packs = []
+        for path in self._pack_paths():
+            if path == self._path:
+                continue
+            try:
+                pack = _Pack(path)
+            except (IOError, OSError, FormatError):
+                continue
+            if pack.sealed or now - os.path.getmtime(path) > STALE_AGE:
+                packs.append(pack)
+            else:
+                pack.close()
+        try:
+            if not packs:
+                return
+            size = sum(pack.size for pack in packs)
+            if len(packs) < 2 and not 0 < self.max_size < size:
+                return
+            self._merge(packs)
+        finally:
+            for pack in packs:
+                pack.close()
+        for pack in packs:
+            _remove(_index_path(pack.path))
+            _remove(pack.path)
+        self._remove_leftovers(now)
+
+    def _merge(self, packs):
+        '''Write the entries to keep from *packs*, the newest first, into a
+        new pack.'''
+        kept = []
+        seen = set()
+        size = len(PACK_MAGIC)
+        for pack in packs:
+            for offset in reversed(pack.offsets()):
+                try:
+                    entry = _read_entry(pack.fobj, offset)
+                except FormatError:
+                    continue
+                if entry[0] in seen:
+                    continue
+                seen.add(entry[0])
+                entry_size = PACK_ENTRY.size + len(entry[2])
+                if self.max_size and size + entry_size > self.max_size:
+                    continue
+                size += entry_size
+                kept.append((pack, offset))
+        # The new pack takes the place of the newest one in the order
+        name = os.path.basename(packs[0].path)[:len('pack-') + 16]
+        path = os.path.join(
+            self.directory,
+            '{0}-{1}.pack'.format(name, uuid.uuid4().hex[:16]),
+        )
+        offsets = {}
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as fobj:
+                fobj.write(PACK_MAGIC)
+                for pack, offset in reversed(kept):
+                    key, flags, data = _read_entry(pack.fobj, offset)
+                    offsets[key] = fobj.tell()
+                    crc = zlib.crc32(data) & 0xffffffff
+                    fobj.write(PACK_ENTRY.pack(key, len(data), crc, flags))
+                    fobj.write(data)
+                size = fobj.tell()
+                fobj.flush()
+                os.fsync(fobj.fileno())
+            # The index is renamed first: an index without its pack is ignored
+            _write_atomic(
+                _index_path(path), _dump_pack_index, offsets, size, SEALED
+            )
+            os.replace(tmp, path)
+        except BaseException:
+            _remove(tmp)
+            _remove(_index_path(path))
+            raise
+
+    def _remove_leftovers(self, now):
+        '''Remove the temporary files and the indexes without a pack left
+        by the processes that crashed.'''
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith('.tmp-'):
+                pass
+            elif name.startswith('pack-') and name.endswith('.idx'):
+                if os.path.exists(path[:-len('.idx')] + '.pack'):
+                    continue
+            else:
+                continue
+            try:
+                if now - os.path.getmtime(path) > STALE_AGE:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+def fingerprint(st):
+    '''Return the fingerprint of a file from the result of :func:`os.stat`:
+    a tuple ``(inode, size, mtime_ns)``.
+    '''
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def read_index(data):
+    '''Decode the bytes of a stat index and return a dictionary mapping every
+    path to a tuple ``(inode, size, mtime_ns, verified, digest)``, *verified*
+    being the time when *digest* was computed.
+    '''
+    data = memoryview(data)
+    if bytes(data[:len(INDEX_MAGIC)]) != INDEX_MAGIC:
+        raise FormatError('not a Radon stat index')
+    unpacker = _Unpacker(data)
+    unpacker.offset = len(INDEX_MAGIC)
+    entries = {}
+    while unpacker.offset < len(data):
+        path = unpacker.string()
+        values = unpacker.unpack(INDEX_ENTRY)
+        entries[path] = values + (unpacker.string(),)
+    return entries
+
+
+def dump_index(entries):
+    '''Encode the *entries* of a stat index, as returned by
+    :func:`read_index`, into bytes.
+    '''
+    parts = [INDEX_MAGIC]
+    for path, entry in entries.items():
+        _pack_str(parts, path)
+        parts.append(INDEX_ENTRY.pack(*entry[:4]))
+        _pack_str(parts, entry[4])
+    return b''.join(parts)
+
+
+class StatIndex(object):
+    '''A persistent index, stored at *path*, mapping the paths of the files
+    to their fingerprint (see :func:`fingerprint`) and to the hash of their
+    content.
+
+    If *verify_after* is greater than 0, the entries whose content was
+    hashed more than that many seconds ago are not trusted: the content of
+    their files is hashed again, even if their fingerprint did not change.
+
+    Several processes can share the same index: when it is saved, the
+    entries updated by this process are merged with the ones on disk.
+    '''
+
+    def __init__(self, path, verify_after=0):
+        self.path = path
+        self.verify_after = verify_after
+        self.entries = self._load()
+        self.updates = {}
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as fobj:
+                return read_index(fobj.read())
+        except (IOError, OSError, FormatError):
+            return {}
+
+    def lookup(self, path, st):
+        '''Return the content hash of the file *path*, whose :func:`os.stat`
+        result is *st*, or `None` if its content must be hashed again.
+        '''
+        entry = self.entries.get(path)
+        if entry is None or entry[:3] != fingerprint(st):
+            return None
+        verified = entry[3]
+        if verified * 1e9 < st.st_mtime_ns + RACY_WINDOW * 1e9:
+            return None
+        if self.verify_after and time.time() - verified > self.verify_after:
+            return None
+        return entry[4]
+
+    def update(self, path, st, digest):
+        '''Record *digest* as the content hash of the file *path*, whose
+        :func:`os.stat` result is *st*. The file must have been read after
+        it was stat'ed.
+        '''
+        entry = fingerprint(st) + (time.time(), digest)
+        self.entries[path] = self.updates[path] = entry
+
+    def take_updates(self):
+        '''Return the entries updated since the last call, and forget them.
+        They can be merged into another index with :meth:`merge`.
+        '''
+        updates, self.updates = self.updates, {}
+        return updates
+
+    def merge(self, updates):
+        '''Merge the entries returned by :meth:`take_updates` on another
+        index into this one.'''
+        self.entries.update(updates)
+        self.updates.update(updates)
+
+    def save(self):
+        '''Write the index to disk, merging the updated entries with the
+        ones written in the meantime by the other processes.
+        '''
+        if not self.updates:
+            return
+        entries = self._load()
+        entries.update(self.updates)
+        _write_atomic(self.path, dump_index, entries)
+        self.entries = entries
+        self.updates = {}
@@ -1,6 +1,7 @@
 '''In this module the CLI interface is created.'''
 
 import inspect
+import json as json_mod
 import os
 import sys
 from contextlib import contextmanager
@@ -19,6 +20,7 @@ except ImportError:
         TOMLLIB_PRESENT = False
 
 import radon.complexity as cc_mod
+from radon.cli.baseline import Baseline, is_failure
 from radon.cli.colors import BRIGHT, RED, RESET
 from radon.cli.harvest import (
     CCHarvester,
@@ -26,6 +28,9 @@ from radon.cli.harvest import (
     MIHarvester,
     RawHarvester,
 )
+from radon.cli.history import HistoryMiner
+from radon.cli.output import TerminalWriter, output_fd
+from radon.cli.screen import LINE_LENGTH, MODES
 
 if sys.version_info[0] == 2:
     import ConfigParser as configparser
@@ -55,6 +60,10 @@ class FileConfig(object):
             return self.file_cfg.getboolean(
                 CONFIG_SECTION_NAME, key, fallback=default
             )
+        if type == float:
+            return self.file_cfg.getfloat(
+                CONFIG_SECTION_NAME, key, fallback=default
+            )
         else:
             return self.file_cfg.get(
                 CONFIG_SECTION_NAME, key, fallback=default
@@ -93,7 +102,7 @@ program = Program(version=sys.modules['radon'].__version__)
 
 
 @program.command
-@program.arg('paths', nargs='+')
+@program.arg('paths', nargs='*')
 def cc(
     paths,
     min=_cfg.get_value('cc_min', str, 'A'),
@@ -109,7 +118,31 @@ def cc(
     total_average=_cfg.get_value('total_average', bool, False),
     xml=False,
     md=False,
+    binary=False,
     codeclimate=False,
+    sqlite=_cfg.get_value('sqlite', str, None),
+    baseline=_cfg.get_value('baseline', str, None),
+    baseline_threshold=_cfg.get_value('baseline_threshold', float, 0.0),
+    new_threshold=_cfg.get_value('new_threshold', float, None),
+    jobs=_cfg.get_value('jobs', int, 1),
+    timeout=_cfg.get_value('timeout', float, 0.0),
+    memory_limit=_cfg.get_value('memory_limit', int, 0),
+    journal=_cfg.get_value('journal', str, None),
+    resume=False,
+    prefetch=_cfg.get_value('prefetch', int, 0),
+    dedup=_cfg.get_value('dedup', bool, False),
+    cache_dir=_cfg.get_value('cache_dir', str, None),
+    cache_verify=_cfg.get_value('cache_verify', float, 0.0),
+    cache_compress=_cfg.get_value('cache_compress', bool, False),
+    cache_max_size=_cfg.get_value('cache_max_size', int, 0),
+    files_from=None,
+    gitignore=_cfg.get_value('gitignore', bool, False),
+    generated=_cfg.get_value('generated', str, None),
+    generated_markers=_cfg.get_value('generated_markers', str, None),
+    generated_size=_cfg.get_value('generated_size', int, 0),
+    generated_line_length=_cfg.get_value(
+        'generated_line_length', int, LINE_LENGTH
+    ),
     output_file=_cfg.get_value('output_file', str, None),
     include_ipynb=_cfg.get_value('include_ipynb', bool, False),
     ipynb_cells=_cfg.get_value('ipynb_cells', bool, False),
@@ -122,6 +155,9 @@ def cc(
 
     :param paths: The paths where to find modules or packages to analyze. More
         than one path is allowed.
+    :param --files-from <str>: Also analyze the files listed in this file,
+        separated by newlines or NUL characters. If it is `-`, the list is
+        read from the standard input.
     :param -n, --min <str>: The minimum complexity to display (default to A).
     :param -x, --max <str>: The maximum complexity to display (default to F).
     :param -e, --exclude <str>: Exclude files only when their path matches one
@@ -129,6 +165,20 @@ def cc(
     :param -i, --ignore <str>: Ignore directories when their name matches one
         of these glob patterns: radon won't even descend into them. By default,
         hidden directories (starting with '.') are ignored.
+    :param --gitignore: Skip the files and the directories ignored by Git,
+        according to the `.gitignore` files met while exploring the
+        directories.
+    :param --generated <str>: Do not analyze the modules that look generated
+        or minified, and leave them out of the results. Can be skip, or
+        report to list them with the skipped files as well.
+    :param --generated-markers <str>: With `--generated`, the comma-separated
+        markers of the generated modules, searched in the comments at their
+        start. Default to 'DO NOT EDIT', 'Generated by' and a few others.
+    :param --generated-size <int>: With `--generated`, the modules larger
+        than this size, in KiB, look generated. Default to 0 (no limit).
+    :param --generated-line-length <int>: With `--generated`, the modules
+        whose lines are longer than this on average at their start look
+        minified. Default to 200, 0 disables the rule.
     :param -s, --show-complexity: Whether or not to show the actual complexity
         score together with the A-F rank. Default to False.
     :param -a, --average: If True, at the end of the analysis display the
@@ -141,10 +191,50 @@ def cc(
     :param -j, --json: Format results in JSON.
     :param --xml: Format results in XML (compatible with CCM).
     :param --md: Format results in Markdown.
+    :param --binary: Write the results in the compact binary format of
+        `radon.serialize`.
     :param --codeclimate: Format results for Code Climate.
+    :param --sqlite <str>: Store the results in the given SQLite database.
     :param --no-assert: Do not count `assert` statements when computing
         complexity.
     :param --show-closures: Add closures/inner classes to the output.
+    :param --baseline <str>: Compare the results with the JSON output of a
+        previous run, reporting only the new blocks and those that got worse.
+    :param --baseline-threshold <float>: With `--baseline`, exit with a
+        non-zero status if a block got worse by more than this value (default
+        to 0).
+    :param --new-threshold <float>: With `--baseline`, exit with a non-zero
+        status if a new block is worse than this value. By default new blocks
+        are reported but never fail.
+    :param --jobs <int>: The number of worker processes analyzing the files.
+        If 0, one per processor. Default to 1.
+    :param --timeout <float>: The time budget of every file, in seconds. The
+        files that exceed it are skipped and reported as errors. Default to 0
+        (no limit).
+    :param --memory-limit <int>: The memory budget of every worker process,
+        in MiB. The files that exceed it are skipped and reported as errors.
+        Default to 0 (no limit).
+    :param --journal <str>: Record the results of every file in this journal
+        as soon as it is analyzed, so that an interrupted run can be resumed.
+    :param --resume: With `--journal`, do not analyze again the files
+        recorded in the journal whose content did not change, and reuse their
+        results.
+    :param --prefetch <int>: The number of threads reading the files ahead
+        of the analysis. Only used when the files are analyzed in the main
+        process. Default to 0 (no read-ahead).
+    :param --dedup: Analyze only once the files with the same content, and
+        reuse their results for all the copies.
+    :param --cache-dir <str>: Cache the results in this directory, and do
+        not analyze again the files that did not change.
+    :param --cache-verify <float>: With `--cache-dir`, hash again the
+        content of the files hashed more than this many seconds ago, even if
+        their size and modification time did not change. Default to 0
+        (never).
+    :param --cache-compress: With `--cache-dir`, compress the cached
+        results.
+    :param --cache-max-size <int>: With `--cache-dir`, evict the oldest
+        results when the cache grows over this size, in MiB. Default to 0
+        (no limit).
     :param -O, --output-file <str>: The output file (default to stdout).
     :param --include-ipynb: Include IPython Notebook files
     :param --ipynb-cells: Include reports for individual IPYNB cells
@@ -162,7 +252,26 @@ def cc(
         show_closures=show_closures,
         include_ipynb=include_ipynb,
         ipynb_cells=ipynb_cells,
+        jobs=jobs,
+        timeout=timeout,
+        memory_limit=memory_limit,
+        journal=journal,
+        resume=resume,
+        prefetch=prefetch,
+        dedup=dedup,
+        cache_dir=cache_dir,
+        cache_verify=cache_verify,
+        cache_compress=cache_compress,
+        cache_max_size=cache_max_size,
+        files_from=files_from,
+        gitignore=gitignore,
+        generated=generated,
+        generated_markers=generated_markers,
+        generated_size=generated_size,
+        generated_line_length=generated_line_length,
     )
+    _check_paths(paths, files_from)
+    _check_generated(generated)
     harvester = CCHarvester(paths, config)
     with outstream(output_file) as stream:
         log_result(
@@ -170,19 +279,49 @@ def cc(
             json=json,
             xml=xml,
             md=md,
+            binary=binary,
             codeclimate=codeclimate,
+            sqlite=sqlite,
+            baseline=baseline,
+            baseline_threshold=baseline_threshold,
+            new_threshold=new_threshold,
             stream=stream,
         )
 
 
 @program.command
-@program.arg('paths', nargs='+')
+@program.arg('paths', nargs='*')
 def raw(
     paths,
     exclude=_cfg.get_value('exclude', str, None),
     ignore=_cfg.get_value('ignore', str, None),
     summary=False,
     json=False,
+    md=False,
+    binary=False,
+    sqlite=_cfg.get_value('sqlite', str, None),
+    baseline=_cfg.get_value('baseline', str, None),
+    baseline_threshold=_cfg.get_value('baseline_threshold', float, 0.0),
+    new_threshold=_cfg.get_value('new_threshold', float, None),
+    jobs=_cfg.get_value('jobs', int, 1),
+    timeout=_cfg.get_value('timeout', float, 0.0),
+    memory_limit=_cfg.get_value('memory_limit', int, 0),
+    journal=_cfg.get_value('journal', str, None),
+    resume=False,
+    prefetch=_cfg.get_value('prefetch', int, 0),
+    dedup=_cfg.get_value('dedup', bool, False),
+    cache_dir=_cfg.get_value('cache_dir', str, None),
+    cache_verify=_cfg.get_value('cache_verify', float, 0.0),
+    cache_compress=_cfg.get_value('cache_compress', bool, False),
+    cache_max_size=_cfg.get_value('cache_max_size', int, 0),
+    files_from=None,
+    gitignore=_cfg.get_value('gitignore', bool, False),
+    generated=_cfg.get_value('generated', str, None),
+    generated_markers=_cfg.get_value('generated_markers', str, None),
+    generated_size=_cfg.get_value('generated_size', int, 0),
+    generated_line_length=_cfg.get_value(
+        'generated_line_length', int, LINE_LENGTH
+    ),
     output_file=_cfg.get_value('output_file', str, None),
     include_ipynb=_cfg.get_value('include_ipynb', bool, False),
     ipynb_cells=_cfg.get_value('ipynb_cells', bool, False),
@@ -191,15 +330,73 @@ def raw(
 
     :param paths: The paths where to find modules or packages to analyze. More
         than one path is allowed.
+    :param --files-from <str>: Also analyze the files listed in this file,
+        separated by newlines or NUL characters. If it is `-`, the list is
+        read from the standard input.
     :param -e, --exclude <str>: Exclude files only when their path matches one
         of these glob patterns. Usually needs quoting at the command line.
     :param -i, --ignore <str>: Ignore directories when their name matches one
         of these glob patterns: radon won't even descend into them. By default,
         hidden directories (starting with '.') are ignored.
+    :param --gitignore: Skip the files and the directories ignored by Git,
+        according to the `.gitignore` files met while exploring the
+        directories.
+    :param --generated <str>: Do not analyze the modules that look generated
+        or minified, and leave them out of the results. Can be skip, or
+        report to list them with the skipped files as well.
+    :param --generated-markers <str>: With `--generated`, the comma-separated
+        markers of the generated modules, searched in the comments at their
+        start. Default to 'DO NOT EDIT', 'Generated by' and a few others.
+    :param --generated-size <int>: With `--generated`, the modules larger
+        than this size, in KiB, look generated. Default to 0 (no limit).
+    :param --generated-line-length <int>: With `--generated`, the modules
+        whose lines are longer than this on average at their start look
+        minified. Default to 200, 0 disables the rule.
     :param -s, --summary:  If given, at the end of the analysis display the
         summary of the gathered metrics. Default to False.
     :param -j, --json: Format results in JSON. Note that the JSON export does
         not include the summary (enabled with `-s, --summary`).
+    :param --md: Format results in Markdown.
+    :param --binary: Write the results in the compact binary format of
+        `radon.serialize`.
+    :param --sqlite <str>: Store the results in the given SQLite database.
+    :param --baseline <str>: Compare the results with the JSON output of a
+        previous run, reporting only the new blocks and those that got worse.
+    :param --baseline-threshold <float>: With `--baseline`, exit with a
+        non-zero status if a block got worse by more than this value (default
+        to 0).
+    :param --new-threshold <float>: With `--baseline`, exit with a non-zero
+        status if a new block is worse than this value. By default new blocks
+        are reported but never fail.
+    :param --jobs <int>: The number of worker processes analyzing the files.
+        If 0, one per processor. Default to 1.
+    :param --timeout <float>: The time budget of every file, in seconds. The
+        files that exceed it are skipped and reported as errors. Default to 0
+        (no limit).
+    :param --memory-limit <int>: The memory budget of every worker process,
+        in MiB. The files that exceed it are skipped and reported as errors.
+        Default to 0 (no limit).
+    :param --journal <str>: Record the results of every file in this journal
+        as soon as it is analyzed, so that an interrupted run can be resumed.
+    :param --resume: With `--journal`, do not analyze again the files
+        recorded in the journal whose content did not change, and reuse their
+        results.
+    :param --prefetch <int>: The number of threads reading the files ahead
+        of the analysis. Only used when the files are analyzed in the main
+        process. Default to 0 (no read-ahead).
+    :param --dedup: Analyze only once the files with the same content, and
+        reuse their results for all the copies.
+    :param --cache-dir <str>: Cache the results in this directory, and do
+        not analyze again the files that did not change.
+    :param --cache-verify <float>: With `--cache-dir`, hash again the
+        content of the files hashed more than this many seconds ago, even if
+        their size and modification time did not change. Default to 0
+        (never).
+    :param --cache-compress: With `--cache-dir`, compress the cached
+        results.
+    :param --cache-max-size <int>: With `--cache-dir`, evict the oldest
+        results when the cache grows over this size, in MiB. Default to 0
+        (no limit).
     :param -O, --output-file <str>: The output file (default to stdout).
     :param --include-ipynb: Include IPython Notebook files
     :param --ipynb-cells: Include reports for individual IPYNB cells
@@ -210,14 +407,43 @@ def raw(
         summary=summary,
         include_ipynb=include_ipynb,
         ipynb_cells=ipynb_cells,
+        jobs=jobs,
+        timeout=timeout,
+        memory_limit=memory_limit,
+        journal=journal,
+        resume=resume,
+        prefetch=prefetch,
+        dedup=dedup,
+        cache_dir=cache_dir,
+        cache_verify=cache_verify,
+        cache_compress=cache_compress,
+        cache_max_size=cache_max_size,
+        files_from=files_from,
+        gitignore=gitignore,
+        generated=generated,
+        generated_markers=generated_markers,
+        generated_size=generated_size,
+        generated_line_length=generated_line_length,
     )
+    _check_paths(paths, files_from)
+    _check_generated(generated)
     harvester = RawHarvester(paths, config)
     with outstream(output_file) as stream:
-        log_result(harvester, json=json, stream=stream)
+        log_result(
+            harvester,
+            json=json,
+            md=md,
+            binary=binary,
+            sqlite=sqlite,
+            baseline=baseline,
+            baseline_threshold=baseline_threshold,
+            new_threshold=new_threshold,
+            stream=stream,
+        )
 
 
 @program.command
-@program.arg('paths', nargs='+')
+@program.arg('paths', nargs='*')
 def mi(
     paths,
     min=_cfg.get_value('mi_min', str, 'A'),
@@ -227,7 +453,32 @@ def mi(
     ignore=_cfg.get_value('ignore', str, None),
     show=_cfg.get_value('show_mi', bool, False),
     json=False,
+    md=False,
+    binary=False,
     sort=False,
+    sqlite=_cfg.get_value('sqlite', str, None),
+    baseline=_cfg.get_value('baseline', str, None),
+    baseline_threshold=_cfg.get_value('baseline_threshold', float, 0.0),
+    new_threshold=_cfg.get_value('new_threshold', float, None),
+    jobs=_cfg.get_value('jobs', int, 1),
+    timeout=_cfg.get_value('timeout', float, 0.0),
+    memory_limit=_cfg.get_value('memory_limit', int, 0),
+    journal=_cfg.get_value('journal', str, None),
+    resume=False,
+    prefetch=_cfg.get_value('prefetch', int, 0),
+    dedup=_cfg.get_value('dedup', bool, False),
+    cache_dir=_cfg.get_value('cache_dir', str, None),
+    cache_verify=_cfg.get_value('cache_verify', float, 0.0),
+    cache_compress=_cfg.get_value('cache_compress', bool, False),
+    cache_max_size=_cfg.get_value('cache_max_size', int, 0),
+    files_from=None,
+    gitignore=_cfg.get_value('gitignore', bool, False),
+    generated=_cfg.get_value('generated', str, None),
+    generated_markers=_cfg.get_value('generated_markers', str, None),
+    generated_size=_cfg.get_value('generated_size', int, 0),
+    generated_line_length=_cfg.get_value(
+        'generated_line_length', int, LINE_LENGTH
+    ),
     output_file=_cfg.get_value('output_file', str, None),
     include_ipynb=_cfg.get_value('include_ipynb', bool, False),
     ipynb_cells=_cfg.get_value('ipynb_cells', bool, False),
@@ -240,6 +491,9 @@ def mi(
 
     :param paths: The paths where to find modules or packages to analyze. More
         than one path is allowed.
+    :param --files-from <str>: Also analyze the files listed in this file,
+        separated by newlines or NUL characters. If it is `-`, the list is
+        read from the standard input.
     :param -n, --min <str>: The minimum MI to display (default to A).
     :param -x, --max <str>: The maximum MI to display (default to C).
     :param -e, --exclude <str>: Exclude files only when their path matches one
@@ -247,11 +501,66 @@ def mi(
     :param -i, --ignore <str>: Ignore directories when their name matches one
         of these glob patterns: radon won't even descend into them. By default,
         hidden directories (starting with '.') are ignored.
+    :param --gitignore: Skip the files and the directories ignored by Git,
+        according to the `.gitignore` files met while exploring the
+        directories.
+    :param --generated <str>: Do not analyze the modules that look generated
+        or minified, and leave them out of the results. Can be skip, or
+        report to list them with the skipped files as well.
+    :param --generated-markers <str>: With `--generated`, the comma-separated
+        markers of the generated modules, searched in the comments at their
+        start. Default to 'DO NOT EDIT', 'Generated by' and a few others.
+    :param --generated-size <int>: With `--generated`, the modules larger
+        than this size, in KiB, look generated. Default to 0 (no limit).
+    :param --generated-line-length <int>: With `--generated`, the modules
+        whose lines are longer than this on average at their start look
+        minified. Default to 200, 0 disables the rule.
     :param -m, --multi: If given, multiline strings are not counted as
         comments.
     :param -s, --show: If given, the actual MI value is shown in results.
     :param -j, --json: Format results in JSON.
+    :param --md: Format results in Markdown.
+    :param --binary: Write the results in the compact binary format of
+        `radon.serialize`.
     :param --sort: If given, results are sorted in ascending order.
+    :param --sqlite <str>: Store the results in the given SQLite database.
+    :param --baseline <str>: Compare the results with the JSON output of a
+        previous run, reporting only the new blocks and those that got worse.
+    :param --baseline-threshold <float>: With `--baseline`, exit with a
+        non-zero status if a block got worse by more than this value (default
+        to 0).
+    :param --new-threshold <float>: With `--baseline`, exit with a non-zero
+        status if a new block is worse than this value. By default new blocks
+        are reported but never fail.
+    :param --jobs <int>: The number of worker processes analyzing the files.
+        If 0, one per processor. Default to 1.
+    :param --timeout <float>: The time budget of every file, in seconds. The
+        files that exceed it are skipped and reported as errors. Default to 0
+        (no limit).
+    :param --memory-limit <int>: The memory budget of every worker process,
+        in MiB. The files that exceed it are skipped and reported as errors.
+        Default to 0 (no limit).
+    :param --journal <str>: Record the results of every file in this journal
+        as soon as it is analyzed, so that an interrupted run can be resumed.
+    :param --resume: With `--journal`, do not analyze again the files
+        recorded in the journal whose content did not change, and reuse their
+        results.
+    :param --prefetch <int>: The number of threads reading the files ahead
+        of the analysis. Only used when the files are analyzed in the main
+        process. Default to 0 (no read-ahead).
+    :param --dedup: Analyze only once the files with the same content, and
+        reuse their results for all the copies.
+    :param --cache-dir <str>: Cache the results in this directory, and do
+        not analyze again the files that did not change.
+    :param --cache-verify <float>: With `--cache-dir`, hash again the
+        content of the files hashed more than this many seconds ago, even if
+        their size and modification time did not change. Default to 0
+        (never).
+    :param --cache-compress: With `--cache-dir`, compress the cached
+        results.
+    :param --cache-max-size <int>: With `--cache-dir`, evict the oldest
+        results when the cache grows over this size, in MiB. Default to 0
+        (no limit).
     :param -O, --output-file <str>: The output file (default to stdout).
     :param --include-ipynb: Include IPython Notebook files
     :param --ipynb-cells: Include reports for individual IPYNB cells
@@ -266,21 +575,75 @@ def mi(
         sort=sort,
         include_ipynb=include_ipynb,
         ipynb_cells=ipynb_cells,
+        jobs=jobs,
+        timeout=timeout,
+        memory_limit=memory_limit,
+        journal=journal,
+        resume=resume,
+        prefetch=prefetch,
+        dedup=dedup,
+        cache_dir=cache_dir,
+        cache_verify=cache_verify,
+        cache_compress=cache_compress,
+        cache_max_size=cache_max_size,
+        files_from=files_from,
+        gitignore=gitignore,
+        generated=generated,
+        generated_markers=generated_markers,
+        generated_size=generated_size,
+        generated_line_length=generated_line_length,
     )
 
+    _check_paths(paths, files_from)
+    _check_generated(generated)
     harvester = MIHarvester(paths, config)
     with outstream(output_file) as stream:
-        log_result(harvester, json=json, stream=stream)
+        log_result(
+            harvester,
+            json=json,
+            md=md,
+            binary=binary,
+            sqlite=sqlite,
+            baseline=baseline,
+            baseline_threshold=baseline_threshold,
+            new_threshold=new_threshold,
+            stream=stream,
+        )
 
 
 @program.command
-@program.arg("paths", nargs="+")
+@program.arg("paths", nargs="*")
 def hal(
     paths,
     exclude=_cfg.get_value('exclude', str, None),
     ignore=_cfg.get_value('ignore', str, None),
     json=False,
+    md=False,
+    binary=False,
     functions=_cfg.get_value('functions', bool, False),
+    sqlite=_cfg.get_value('sqlite', str, None),
+    baseline=_cfg.get_value('baseline', str, None),
+    baseline_threshold=_cfg.get_value('baseline_threshold', float, 0.0),
+    new_threshold=_cfg.get_value('new_threshold', float, None),
+    jobs=_cfg.get_value('jobs', int, 1),
+    timeout=_cfg.get_value('timeout', float, 0.0),
+    memory_limit=_cfg.get_value('memory_limit', int, 0),
+    journal=_cfg.get_value('journal', str, None),
+    resume=False,
+    prefetch=_cfg.get_value('prefetch', int, 0),
+    dedup=_cfg.get_value('dedup', bool, False),
+    cache_dir=_cfg.get_value('cache_dir', str, None),
+    cache_verify=_cfg.get_value('cache_verify', float, 0.0),
+    cache_compress=_cfg.get_value('cache_compress', bool, False),
+    cache_max_size=_cfg.get_value('cache_max_size', int, 0),
+    files_from=None,
+    gitignore=_cfg.get_value('gitignore', bool, False),
+    generated=_cfg.get_value('generated', str, None),
+    generated_markers=_cfg.get_value('generated_markers', str, None),
+    generated_size=_cfg.get_value('generated_size', int, 0),
+    generated_line_length=_cfg.get_value(
+        'generated_line_length', int, LINE_LENGTH
+    ),
     output_file=_cfg.get_value('output_file', str, None),
     include_ipynb=_cfg.get_value('include_ipynb', bool, False),
     ipynb_cells=_cfg.get_value('ipynb_cells', bool, False),
@@ -294,14 +657,72 @@ def hal(
 
     :param paths: The paths where to find modules or packages to analyze. More
         than one path is allowed.
+    :param --files-from <str>: Also analyze the files listed in this file,
+        separated by newlines or NUL characters. If it is `-`, the list is
+        read from the standard input.
     :param -e, --exclude <str>: Exclude files only when their path matches one
         of these glob patterns. Usually needs quoting at the command line.
     :param -i, --ignore <str>: Ignore directories when their name matches one
         of these glob patterns: radon won't even descend into them. By default,
         hidden directories (starting with '.') are ignored.
+    :param --gitignore: Skip the files and the directories ignored by Git,
+        according to the `.gitignore` files met while exploring the
+        directories.
+    :param --generated <str>: Do not analyze the modules that look generated
+        or minified, and leave them out of the results. Can be skip, or
+        report to list them with the skipped files as well.
+    :param --generated-markers <str>: With `--generated`, the comma-separated
+        markers of the generated modules, searched in the comments at their
+        start. Default to 'DO NOT EDIT', 'Generated by' and a few others.
+    :param --generated-size <int>: With `--generated`, the modules larger
+        than this size, in KiB, look generated. Default to 0 (no limit).
+    :param --generated-line-length <int>: With `--generated`, the modules
+        whose lines are longer than this on average at their start look
+        minified. Default to 200, 0 disables the rule.
     :param -j, --json: Format results in JSON.
+    :param --md: Format results in Markdown.
+    :param --binary: Write the results in the compact binary format of
+        `radon.serialize`.
     :param -f, --functions: Analyze files by top-level functions instead of as
         a whole.
+    :param --sqlite <str>: Store the results in the given SQLite database.
+    :param --baseline <str>: Compare the results with the JSON output of a
+        previous run, reporting only the new blocks and those that got worse.
+    :param --baseline-threshold <float>: With `--baseline`, exit with a
+        non-zero status if a block got worse by more than this value (default
+        to 0).
+    :param --new-threshold <float>: With `--baseline`, exit with a non-zero
+        status if a new block is worse than this value. By default new blocks
+        are reported but never fail.
+    :param --jobs <int>: The number of worker processes analyzing the files.
+        If 0, one per processor. Default to 1.
+    :param --timeout <float>: The time budget of every file, in seconds. The
+        files that exceed it are skipped and reported as errors. Default to 0
+        (no limit).
+    :param --memory-limit <int>: The memory budget of every worker process,
+        in MiB. The files that exceed it are skipped and reported as errors.
+        Default to 0 (no limit).
+    :param --journal <str>: Record the results of every file in this journal
+        as soon as it is analyzed, so that an interrupted run can be resumed.
+    :param --resume: With `--journal`, do not analyze again the files
+        recorded in the journal whose content did not change, and reuse their
+        results.
+    :param --prefetch <int>: The number of threads reading the files ahead
+        of the analysis. Only used when the files are analyzed in the main
+        process. Default to 0 (no read-ahead).
+    :param --dedup: Analyze only once the files with the same content, and
+        reuse their results for all the copies.
+    :param --cache-dir <str>: Cache the results in this directory, and do
+        not analyze again the files that did not change.
+    :param --cache-verify <float>: With `--cache-dir`, hash again the
+        content of the files hashed more than this many seconds ago, even if
+        their size and modification time did not change. Default to 0
+        (never).
+    :param --cache-compress: With `--cache-dir`, compress the cached
+        results.
+    :param --cache-max-size <int>: With `--cache-dir`, evict the oldest
+        results when the cache grows over this size, in MiB. Default to 0
+        (no limit).
     :param -O, --output-file <str>: The output file (default to stdout).
     :param --include-ipynb: Include IPython Notebook files
     :param --ipynb-cells: Include reports for individual IPYNB cells
@@ -312,11 +733,99 @@ def hal(
         by_function=functions,
         include_ipynb=include_ipynb,
         ipynb_cells=ipynb_cells,
+        jobs=jobs,
+        timeout=timeout,
+        memory_limit=memory_limit,
+        journal=journal,
+        resume=resume,
+        prefetch=prefetch,
+        dedup=dedup,
+        cache_dir=cache_dir,
+        cache_verify=cache_verify,
+        cache_compress=cache_compress,
+        cache_max_size=cache_max_size,
+        files_from=files_from,
+        gitignore=gitignore,
+        generated=generated,
+        generated_markers=generated_markers,
+        generated_size=generated_size,
+        generated_line_length=generated_line_length,
     )
 
+    _check_paths(paths, files_from)
+    _check_generated(generated)
     harvester = HCHarvester(paths, config)
     with outstream(output_file) as stream:
-        log_result(harvester, json=json, xml=False, md=False, stream=stream)
+        log_result(
+            harvester,
+            json=json,
+            xml=False,
+            md=md,
+            binary=binary,
+            sqlite=sqlite,
+            baseline=baseline,
+            baseline_threshold=baseline_threshold,
+            new_threshold=new_threshold,
+            stream=stream,
+        )
+
+
+@program.command
+@program.arg('rev_range')
+def history(
+    rev_range,
+    metric='cc',
+    repo='.',
+    exclude=_cfg.get_value('exclude', str, None),
+    ignore=_cfg.get_value('ignore', str, None),
+    json=False,
+    output_file=_cfg.get_value('output_file', str, None),
+):
+    '''Analyze the Python modules of every commit in a Git revision range.
+
+    Files are read directly from the Git object database, without checking
+    out any commit, and every distinct version of a file is analyzed only
+    once.
+
+    :param rev_range: The revision range to analyze, e.g. `v1.0..HEAD`. Every
+        argument accepted by `git rev-list` is allowed.
+    :param -m, --metric <str>: The metric to compute. Can be cc, raw, mi or
+        hal (default to cc).
+    :param -r, --repo <str>: The path of the Git repository (default to the
+        current directory).
+    :param -e, --exclude <str>: Exclude files only when their path matches one
+        of these glob patterns. Usually needs quoting at the command line.
+    :param -i, --ignore <str>: Ignore directories when their name matches one
+        of these glob patterns. By default, hidden directories (starting with
+        '.') are ignored.
+    :param -j, --json: Format results in JSON, one line per commit.
+    :param -O, --output-file <str>: The output file (default to stdout).
+    '''
+    if metric not in HISTORY_HARVESTERS:
+        raise ValueError('unknown metric: {0}'.format(metric))
+    harvester_class, values = HISTORY_HARVESTERS[metric]
+    config = Config(
+        exclude=exclude,
+        ignore=ignore,
+        include_ipynb=False,
+        ipynb_cells=False,
+        **values
+    )
+    harvester = harvester_class([], config)
+    miner = HistoryMiner(repo, rev_range, harvester, exclude, ignore)
+    with outstream(output_file) as stream:
+        for commit, results in miner.run():
+            harvester._results = results
+            if json:
+                log(
+                    '{{"commit": {0}, "results": {1}}}',
+                    json_mod.dumps(commit),
+                    harvester.as_json(),
+                    stream=stream,
+                )
+            else:
+                log('{0}commit {1}{2}', BRIGHT, commit, RESET, stream=stream)
+                log_result(harvester, stream=stream)
 
 
 class Config(object):
@@ -344,6 +853,17 @@ class Config(object):
         '''Two Config objects are equals if their contents are equal.'''
         return self.config_values == other.config_values
 
+    def __getstate__(self):
+        '''Return the state to pickle. This method and :meth:`__setstate__`
+        are defined so that pickle does not look them up through
+        :meth:`__getattr__` before the config values are restored.
+        '''
+        return self.__dict__
+
+    def __setstate__(self, state):
+        '''Restore the pickled state.'''
+        self.__dict__.update(state)
+
     @classmethod
     def from_function(cls, func):
         '''Construct a Config object from a function's defaults.'''
@@ -359,39 +879,130 @@ class Config(object):
         return cls(**values)
 
 
+# The harvester and the configuration values used by the history command for
+# every metric
+HISTORY_HARVESTERS = {
+    'cc': (
+        CCHarvester,
+        dict(
+            min='A',
+            max='F',
+            show_complexity=True,
+            average=False,
+            total_average=False,
+            order=cc_mod.SCORE,
+            no_assert=False,
+            show_closures=False,
+        ),
+    ),
+    'raw': (RawHarvester, dict(summary=False)),
+    'mi': (
+        MIHarvester,
+        dict(min='A', max='C', multi=True, show=True, sort=False),
+    ),
+    'hal': (HCHarvester, dict(by_function=False)),
+}
+
+
 def log_result(harvester, **kwargs):
     '''Log the results of an :class:`~radon.cli.harvest.Harvester object.
 
     Keywords parameters determine how the results are formatted. If *json* is
     `True`, then `harvester.as_json()` is called. If *xml* is `True`, then
-    `harvester.as_xml()` is called. If *codeclimate* is True, then
-    `harvester.as_codeclimate_issues()` is called.
-    Otherwise, `harvester.to_terminal()` is executed and `kwargs` is directly
-    passed to the :func:`~radon.cli.log` function.
+    the chunks yielded by `harvester.iter_xml()` are written as they come. If
+    *codeclimate* is True, then the issues yielded by
+    `harvester.iter_codeclimate_issues()` are written and flushed file by
+    file. If *md* is True, the chunks yielded by `harvester.iter_md()` are
+    written as they come. If *sqlite* is given, the results are stored in
+    that database with `harvester.to_sqlite()` and nothing is logged. If
+    *binary* is True, the results are written to the binary buffer of
+    *stream* with `harvester.to_binary()`. If
+    *baseline* is given, only the regressions with respect to that JSON file
+    are logged (see :func:`log_regressions`), and the program exits with
+    status 1 if any of them is an error, got worse by more than
+    *baseline_threshold* or is a new block worse than *new_threshold*. The
+    program exits with an error as well if the
+    baseline cannot be loaded.
+    Otherwise, the lines yielded by `harvester.to_terminal()` are written to
+    *stream* in large chunks by a :class:`~radon.cli.output.TerminalWriter`.
     '''
-    if kwargs.get('json'):
+    if kwargs.get('baseline'):
+        baseline = load_baseline(harvester.metric, kwargs['baseline'])
+        threshold = kwargs.get('baseline_threshold') or 0
+        if log_regressions(harvester, baseline, threshold, **kwargs):
+            raise SystemExit(1)
+    elif kwargs.get('json'):
         log(harvester.as_json(), noformat=True, **kwargs)
     elif kwargs.get('xml'):
-        log(harvester.as_xml(), noformat=True, **kwargs)
+        log_list(harvester.iter_xml(), delimiter='', noformat=True, **kwargs)
+        log('', noformat=True, **kwargs)
     elif kwargs.get('codeclimate'):
-        log_list(
-            harvester.as_codeclimate_issues(),
-            delimiter='\0',
+        stream = kwargs.get('stream', sys.stdout)
+        for issues in harvester.iter_codeclimate_issues():
+            log_list(issues, delimiter='\0', noformat=True, **kwargs)
+            stream.flush()
+    elif kwargs.get('md'):
+        log_list(harvester.iter_md(), delimiter='', noformat=True, **kwargs)
+        log('', noformat=True, **kwargs)
+    elif kwargs.get('sqlite'):
+        harvester.to_sqlite(kwargs['sqlite'])
+    elif kwargs.get('binary'):
+        stream = kwargs.get('stream', sys.stdout)
+        stream.flush()
+        buffer = getattr(stream, 'buffer', stream)
+        harvester.to_binary(buffer)
+        buffer.flush()
+    else:
+        stream = kwargs.get('stream', sys.stdout)
+        with TerminalWriter(stream, output_fd(stream)) as writer:
+            writer.write_lines(harvester.to_terminal())
+
+
+def load_baseline(metric, path):
+    '''Load the :class:`~radon.cli.baseline.Baseline` of *metric* from the
+    JSON file at *path*, and exit with an error if it cannot be read or if it
+    is not valid.
+    '''
+    try:
+        with open(path) as fobj:
+            return Baseline.load(metric, fobj)
+    except (IOError, OSError, ValueError) as e:
+        raise SystemExit(
+            'radon: error: cannot load the baseline {0}: {1}'.format(path, e)
+        )
+
+
+def log_regressions(harvester, index, threshold=0, **kwargs):
+    '''Compare the results of *harvester* with the
+    :class:`~radon.cli.baseline.Baseline` *index* as they are produced, and
+    log only the blocks that are new or that got worse, and the files that
+    cannot be analyzed any more, in JSON if *json* is `True`. Return the
+    number of errors, of blocks that got worse by more than *threshold* and
+    of new blocks worse than *new_threshold*.
+    '''
+    new_threshold = kwargs.get('new_threshold')
+    failed = [0]
+
+    def count(regressions):
+        for regression in regressions:
+            if is_failure(regression, threshold, new_threshold, index.metric):
+                failed[0] += 1
+            yield regression
+
+    regressions = count(index.compare(harvester._iter_results()))
+    if kwargs.get('json'):
+        log(
+            json_mod.dumps([dict(r._asdict()) for r in regressions]),
             noformat=True,
             **kwargs
         )
-    elif kwargs.get('md'):
-        log(harvester.as_md(), noformat=True, **kwargs)
     else:
-        for msg, h_args, h_kwargs in harvester.to_terminal():
-            kw = kwargs.copy()
-            kw.update(h_kwargs)
-            if h_kwargs.get('error', False):
-                log(msg, **kw)
-                log_error(h_args[0], indent=1)
-                continue
-            msg = [msg] if not isinstance(msg, (list, tuple)) else msg
-            log_list(msg, *h_args, **kw)
+        stream = kwargs.get('stream', sys.stdout)
+        with TerminalWriter(stream, output_fd(stream)) as writer:
+            writer.write_lines(
+                index.to_terminal(regressions, threshold, new_threshold)
+            )
+    return failed[0]
 
 
 def log(msg, *args, **kwargs):
@@ -423,6 +1034,39 @@ def log_error(msg, *args, **kwargs):
     log('{0}{1}ERROR{2}: {3}'.format(BRIGHT, RED, RESET, msg), *args, **kwargs)
 
 
+def _check_paths(paths, files_from):
+    '''Exit with an error if there is nothing to analyze, if the standard
+    input is both a source and the list of the files to analyze, or if the
+    list cannot be read.'''
+    if not paths and not files_from:
+        raise SystemExit('radon: error: no paths given')
+    if files_from == '-' and '-' in paths:
+        raise SystemExit(
+            'radon: error: the standard input cannot be both a source and '
+            'the list of the files'
+        )
+    if files_from and files_from != '-':
+        try:
+            with open(files_from, 'rb'):
+                pass
+        except (IOError, OSError) as e:
+            raise SystemExit(
+                'radon: error: cannot read the list of the files: '
+                '{0}'.format(e)
+            )
+
+
+def _check_generated(generated):
+    '''Exit with an error if the mode of the pre-screen of the generated
+    modules is not valid.'''
+    if generated and generated not in MODES:
+        raise SystemExit(
+            'radon: error: --generated must be one of: {0}'.format(
+                ', '.join(MODES)
+            )
+        )
+
+
 @contextmanager
 def outstream(outfile=None):
     '''Encapsulate output stream creation as a context manager'''
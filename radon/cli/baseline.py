@@ -0,0 +1,229 @@
+'''This module implements the comparison of the results against a baseline.
+
+A baseline is the JSON output of a previous run (for example on the main
+branch) of the same command. It is loaded once into an index keyed by path
+and block name, and the results of the current run are compared against it
+as they are produced: only the blocks that are new or that got worse are
+reported.
+
+The blocks that got worse are judged on how much they got worse, against a
+threshold on the difference with the baseline. The new blocks have nothing to
+be compared with, so they are judged on their own value, against a separate
+threshold: without one they are reported but never fail.
+
+Every metric is compared through a single value:
+
+    * ``cc``: the complexity of every block;
+    * ``raw``: the SLOC of every file;
+    * ``mi``: the Maintainability Index of every file (lower is worse);
+    * ``hal``: the Halstead effort of every file and of every function.
+
+The file-level values have an empty block name. A file that cannot be
+analyzed any more is a regression as well, unless it could not be analyzed in
+the baseline either.
+'''
+
+import collections
+import json
+
+from radon.cli.colors import RED, RESET
+from radon.cli.tools import cc_to_dict
+
+# A block that is new or that got worse. *delta* is how much the value got
+# worse; both *baseline* and *delta* are None for new blocks. For a file that
+# cannot be analyzed, *error* is the error message, while *name*, *value* and
+# *delta* are None.
+Regression = collections.namedtuple(
+    'Regression', 'path name baseline value delta error'
+)
+Regression.__new__.__defaults__ = (None,)
+
+
+def is_failure(regression, threshold=0, new_threshold=None, metric='cc'):
+    '''Return True if *regression* is an error, if it got worse by more than
+    *threshold*, or if it is a new block whose value of *metric* is worse
+    than *new_threshold*. New blocks never fail if *new_threshold* is `None`.
+    '''
+    if regression.error is not None:
+        return True
+    if regression.baseline is not None:
+        return regression.delta > threshold
+    if new_threshold is None:
+        return False
+    if METRICS[metric].higher_is_worse:
+        return regression.value > new_threshold
+    return regression.value < new_threshold
+
+
+def _cc_values(result):
+    '''Yield the ``(name, value)`` pairs of a CC result.'''
+    for block in result:
+        name = block['name']
+        if 'classname' in block:
+            name = '{0}.{1}'.format(block['classname'], block['name'])
+        yield name, block['complexity']
+
+
+def _raw_values(result):
+    '''Yield the ``(name, value)`` pairs of a raw metrics result.'''
+    yield '', result['sloc']
+
+
+def _mi_values(result):
+    '''Yield the ``(name, value)`` pairs of an MI result.'''
+    yield '', result['mi']
+
+
+def _hal_values(result):
+    '''Yield the ``(name, value)`` pairs of a Halstead result.'''
+    yield '', result['total']['effort']
+    for name, report in result['functions'].items():
+        yield name, report['effort']
+
+
+def _hal_to_dict(result):
+    '''Convert a :class:`~radon.metrics.Halstead` result into the same
+    dictionary exported in JSON.'''
+    return {
+        'total': result.total._asdict(),
+        'functions': dict(
+            (name, report._asdict()) for name, report in result.functions
+        ),
+    }
+
+
+# How every metric is compared: *values* yields the ``(name, value)`` pairs
+# of a JSON result, *to_dict* converts a result into its JSON form, *label*
+# names the value and *higher_is_worse* tells the direction.
+Metric = collections.namedtuple(
+    'Metric', 'values to_dict label higher_is_worse'
+)
+
+METRICS = {
+    'cc': Metric(
+        _cc_values, lambda r: [cc_to_dict(b) for b in r], 'complexity', True
+    ),
+    'raw': Metric(_raw_values, lambda r: r, 'sloc', True),
+    'mi': Metric(_mi_values, lambda r: r, 'mi', False),
+    'hal': Metric(_hal_values, _hal_to_dict, 'effort', True),
+}
+
+
+def _format_value(value):
+    '''Format a value of a metric.'''
+    if isinstance(value, float):
+        return '{0:.2f}'.format(value)
+    return str(value)
+
+
+def format_regression(regression, label):
+    '''Format a :data:`Regression` as a line, *label* being the name of the
+    compared value.'''
+    if regression.error is not None:
+        return 'error: {0}'.format(regression.error)
+    prefix = '{0}: '.format(regression.name) if regression.name else ''
+    if regression.baseline is None:
+        return '{0}{1} {2} (new)'.format(
+            prefix, label, _format_value(regression.value)
+        )
+    return '{0}{1} {2} -> {3} (+{4})'.format(
+        prefix,
+        label,
+        _format_value(regression.baseline),
+        _format_value(regression.value),
+        _format_value(regression.delta),
+    )
+
+
+class Baseline(object):
+    '''An index of the results of a previous run for *metric*.
+
+    *index* is a dictionary mapping ``(path, name)`` tuples to values. When
+    the same name appears more than once in a file, the worst value is kept.
+    *errors* is the set of the paths that could not be analyzed.
+    '''
+
+    def __init__(self, metric, index=None, errors=None):
+        if metric not in METRICS:
+            raise ValueError('unknown metric: {0}'.format(metric))
+        self.metric = metric
+        self.spec = METRICS[metric]
+        self.index = {} if index is None else index
+        self.errors = set() if errors is None else errors
+
+    @classmethod
+    def load(cls, metric, fobj):
+        '''Build the baseline from the JSON results read from *fobj*. Raise
+        :exc:`ValueError` if they are not valid JSON results of *metric*.
+        '''
+        baseline = cls(metric)
+        data = json.load(fobj)
+        if not isinstance(data, dict):
+            raise ValueError('expected an object mapping paths to results')
+        for path, result in data.items():
+            if isinstance(result, dict) and 'error' in result:
+                baseline.errors.add(path)
+                continue
+            try:
+                baseline.add(path, baseline.spec.values(result))
+            except (AttributeError, KeyError, TypeError):
+                raise ValueError(
+                    'invalid {0} results for {1}'.format(metric, path)
+                )
+        return baseline
+
+    def add(self, path, values):
+        '''Add the ``(name, value)`` pairs in *values* for *path*.'''
+        for name, value in values:
+            key = (path, name)
+            old = self.index.get(key)
+            if old is None or self._delta(old, value) > 0:
+                self.index[key] = value
+
+    def _delta(self, old, new):
+        '''How much *new* is worse than *old*.'''
+        return new - old if self.spec.higher_is_worse else old - new
+
+    def to_terminal(self, regressions, threshold=0, new_threshold=None):
+        '''Yield the lines to print for *regressions*, in the same format as
+        :meth:`~radon.cli.harvest.Harvester.to_terminal`. The failures, as
+        told by :func:`is_failure` with *threshold* and *new_threshold*, are
+        highlighted.
+        '''
+        path = None
+        failed = 0
+        for regression in regressions:
+            if regression.path != path:
+                path = regression.path
+                yield path, (), {}
+            line = format_regression(regression, self.spec.label)
+            if is_failure(
+                regression, threshold, new_threshold, self.metric
+            ):
+                failed += 1
+                line = '{0}{1}{2}'.format(RED, line, RESET)
+            yield line, (), {'indent': 1}
+        if failed:
+            yield '\n{0} regressions above the thresholds', (failed,), {}
+
+    def compare(self, results):
+        '''Yield a :data:`Regression` for every block of *results*, an
+        iterable of ``(path, result)`` tuples as produced by the harvesters,
+        that is new or worse than in the baseline, and for every file that
+        cannot be analyzed any more.
+        '''
+        for path, result in results:
+            if 'error' in result:
+                if path not in self.errors:
+                    yield Regression(
+                        path, None, None, None, None, result['error']
+                    )
+                continue
+            for name, value in self.spec.values(self.spec.to_dict(result)):
+                old = self.index.get((path, name))
+                if old is None:
+                    yield Regression(path, name, None, value, None)
+                    continue
+                delta = self._delta(old, value)
+                if delta > 0:
+                    yield Regression(path, name, old, value, delta)
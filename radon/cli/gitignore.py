@@ -0,0 +1,242 @@
+'''This module implements the pruning of the files ignored by Git during the
+exploration of the directories (see
+:func:`~radon.cli.tools.explore_directories`).
+
+The patterns of every ``.gitignore`` file are compiled into regular
+expressions when its directory is reached, and they are matched against the
+entries of that directory and of all its subdirectories, following the rules
+of Git:
+
+* blank lines and lines starting with ``#`` are skipped, trailing spaces are
+  removed unless they are escaped with a backslash;
+* a pattern starting with ``!`` re-includes what a previous pattern excluded;
+* a pattern ending with ``/`` only matches directories;
+* a pattern with a ``/`` at the start or in the middle is relative to the
+  directory of the ``.gitignore`` file, otherwise it matches at any depth;
+* ``*`` and ``?`` do not match ``/``, while ``**`` matches any number of
+  directories;
+* the last matching pattern wins, and the patterns of a deeper
+  ``.gitignore`` file take precedence over the ones of the outer files.
+
+The ignored directories are pruned before they are explored, so none of the
+files below them are visited. The ``.gitignore`` files of the parent
+directories, up to the root of the repository, apply as well, together with
+its ``.git/info/exclude`` file.
+'''
+
+import os
+import re
+
+GITIGNORE = '.gitignore'
+EXCLUDE = os.path.join('.git', 'info', 'exclude')
+
+# The trailing spaces not escaped with a backslash
+TRAILING_SPACES_RE = re.compile(r'(?<!\\) +$')
+
+
+def _translate_class(pattern, i):
+    '''Translate the bracket expression starting at ``pattern[i]``, which is
+    ``[``, and return a tuple ``(regex, end)``. If the bracket is not closed,
+    it is a literal character.
+    '''
+    j = i + 1
+    if j < len(pattern) and pattern[j] in '!^':
+        j += 1
+    if j < len(pattern) and pattern[j] == ']':
+        j += 1
+    j = pattern.find(']', j)
+    if j == -1:
+        return re.escape('['), i + 1
+    content = pattern[i + 1:j].replace('\\', '\\\\').replace('[', '\\[')
+    if content[0] in '!^':
+        # A bracket expression never matches a slash
+        content = '^/' + content[1:]
+    return '[{0}]'.format(content), j + 1
+
+
+def translate(pattern):
+    '''Translate a glob *pattern* of a ``.gitignore`` file, without its
+    leading ``!`` and trailing ``/``, into a regular expression matching the
+    paths relative to the directory of the file.
+    '''
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+    parts = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i) and (
+                i == 0 or pattern[i - 1] == '/'
+            ):
+                if pattern.startswith('/', i + 2):
+                    # Any number of directories, even none
+                    parts.append('(?:.*/)?')
+                    i += 3
+                    continue
+                if i + 2 == len(pattern):
+                    # Everything inside
+                    parts.append('.*')
+                    i += 2
+                    continue
+            while i < len(pattern) and pattern[i] == '*':
+                i += 1
+            parts.append('[^/]*')
+            continue
+        if c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            regex, i = _translate_class(pattern, i)
+            parts.append(regex)
+            continue
+        elif c == '\\' and i + 1 < len(pattern):
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    regex = ''.join(parts)
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    return '^' + regex + '$'
+
+
+def parse(lines):
+    '''Parse the *lines* of a ``.gitignore`` file and return a list of
+    ``(regex, negated, dir_only)`` tuples, *regex* being compiled.
+    '''
+    rules = []
+    for line in lines:
+        line = TRAILING_SPACES_RE.sub('', line.rstrip('\r\n'))
+        if not line or line.startswith('#'):
+            continue
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        try:
+            regex = re.compile(translate(line), re.DOTALL)
+        except re.error:
+            # Git skips the patterns it cannot understand as well
+            continue
+        rules.append((regex, negated, dir_only))
+    return rules
+
+
+class GitIgnore(object):
+    '''The compiled patterns of a ``.gitignore`` file, which apply to the
+    paths under the absolute directory *base*.
+    '''
+
+    def __init__(self, base, rules):
+        self.base = base
+        self.rules = rules
+
+    @classmethod
+    def load(cls, base, filename=GITIGNORE):
+        '''Load the file *filename* in the directory *base*, and return `None`
+        if it does not exist or if it has no patterns.'''
+        try:
+            with open(
+                os.path.join(base, filename),
+                encoding='utf-8',
+                errors='replace',
+            ) as fobj:
+                rules = parse(fobj)
+        except (IOError, OSError):
+            return None
+        return cls(base, rules) if rules else None
+
+    def match(self, path, is_dir):
+        '''Return True if the absolute *path* is ignored by these patterns,
+        False if it is explicitly re-included by them and `None` if no
+        pattern matches.'''
+        relpath = path[len(self.base):].lstrip(os.sep)
+        if os.sep != '/':
+            relpath = relpath.replace(os.sep, '/')
+        for regex, negated, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relpath):
+                return not negated
+        return None
+
+
+def is_ignored(gitignores, path, is_dir):
+    '''Return True if the absolute *path* is ignored by the sequence of
+    *gitignores*, ordered from the outermost to the innermost.'''
+    for gitignore in reversed(gitignores):
+        ignored = gitignore.match(path, is_dir)
+        if ignored is not None:
+            return ignored
+    return False
+
+
+def find_repository(path):
+    '''Return the root of the Git repository containing the absolute *path*,
+    or `None` if it is not inside a repository.'''
+    while True:
+        if os.path.exists(os.path.join(path, '.git')):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def parent_gitignores(start):
+    '''Return the patterns that apply to the absolute directory *start*, from
+    the root of its repository down to its parent, outermost first.'''
+    root = find_repository(start)
+    if root is None:
+        return []
+    gitignores = [GitIgnore.load(root, EXCLUDE)]
+    directory = start
+    parents = []
+    while directory != root:
+        directory = os.path.dirname(directory)
+        parents.append(directory)
+    for directory in reversed(parents):
+        gitignores.append(GitIgnore.load(directory))
+    return [gitignore for gitignore in gitignores if gitignore is not None]
+
+
+class GitIgnoreFilter(object):
+    '''Filter the entries found by :func:`os.walk` under *start* through the
+    ``.gitignore`` files, as they are found.'''
+
+    def __init__(self, start):
+        start = os.path.abspath(start)
+        # The patterns that apply to the directories still to be explored
+        self._pending = {start: tuple(parent_gitignores(start))}
+
+    def filter(self, root, dirs, files):
+        '''Return a tuple ``(dirs, files)`` without the subdirectories and the
+        files of *root* that are ignored. *root*, *dirs* and *files* are as
+        yielded by :func:`os.walk`, which must explore the directories top
+        down.
+        '''
+        base = os.path.abspath(root)
+        gitignores = self._pending.pop(base, ())
+        gitignore = GitIgnore.load(base)
+        if gitignore is not None:
+            gitignores += (gitignore,)
+        if not gitignores:
+            return dirs, files
+        kept_dirs = []
+        for name in dirs:
+            path = os.path.join(base, name)
+            if not is_ignored(gitignores, path, True):
+                kept_dirs.append(name)
+                self._pending[path] = gitignores
+        kept_files = [
+            name
+            for name in files
+            if not is_ignored(gitignores, os.path.join(base, name), False)
+        ]
+        return kept_dirs, kept_files
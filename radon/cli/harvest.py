@@ -1,20 +1,54 @@
 '''This module holds the base Harvester class and all its subclassess.'''
 
 import collections
+import itertools
 import json
+import os
 import sys
 from builtins import super
 
+from radon.cache import PackedResultCache, StatIndex, content_hash
 from radon.cli.colors import MI_RANKS, RANKS_COLORS, RESET
+from radon.cli.journal import Journal
+from radon.cli.pipeline import run_pipeline
+from radon.cli.schedule import MEMORY_ERROR, TIMEOUT_ERROR, run_parallel
+from radon.cli.screen import (
+    GENERATED_ERROR,
+    REPORT,
+    Screen,
+    generated_error,
+    is_generated,
+)
+from radon.cli.store import SQLiteStore
 from radon.cli.tools import (
+    CC_MD_COLUMNS,
+    HAL_MD_COLUMNS,
+    MI_MD_COLUMNS,
+    RAW_MD_COLUMNS,
+    _is_archive,
+    SourceFile,
     _open,
     cc_to_dict,
+    cc_to_json,
+    cc_to_md_rows,
     cc_to_terminal,
     dict_to_codeclimate_issues,
     dict_to_xml,
     dict_to_md,
+    file_to_codeclimate_issues,
+    get_content,
+    hal_to_json,
+    hal_to_md_rows,
+    iter_archive,
+    iter_json,
+    iter_md,
+    iter_xml,
     iter_filenames,
+    iter_listed_files,
+    mi_to_md_rows,
     raw_to_dict,
+    raw_to_md_rows,
+    read_file,
     strip_ipython,
 )
 from radon.complexity import (
@@ -23,14 +57,24 @@ from radon.complexity import (
     cc_visit,
     sorted_results,
 )
-from radon.metrics import h_visit, mi_rank, mi_visit
+from radon.metrics import (
+    Halstead,
+    h_visit,
+    halstead_report,
+    mi_rank,
+    mi_visit,
+)
 from radon.raw import analyze
+from radon.serialize import ResultWriter
 
 if sys.version_info[0] < 3:
     from StringIO import StringIO
 else:
     from io import StringIO
 
+# The name of the stat index inside the cache directory
+INDEX_NAME = 'index'
+
 try:
     import nbformat
 
@@ -39,6 +83,25 @@ except ImportError:
     SUPPORTS_IPYNB = False
 
 
+def _read_source(fobj):
+    '''Return the content of *fobj* to be parsed by :func:`ast.parse`. The
+    files read from the disk are passed as bytes, without decoding them.
+    '''
+    if isinstance(fobj, SourceFile):
+        return fobj.read_source()
+    return fobj.read()
+
+
+def _over_budget(results):
+    '''Return True if one of the *results* is the error of a file that went
+    over its time or memory budget.'''
+    return any(
+        isinstance(result, dict)
+        and result.get('error') in (TIMEOUT_ERROR, MEMORY_ERROR)
+        for _, result in results
+    )
+
+
 class Harvester(object):
     '''Base class defining the interface of a Harvester object.
 
@@ -53,13 +116,17 @@ class Harvester(object):
 
     3. **Reporting**: the methods *as_json* and *as_xml* return a string
        with the corresponding format. The method *to_terminal* is a generator
-       that yields the lines to be printed in the terminal.
+       that yields the lines to be printed in the terminal. The method
+       *to_sqlite* stores the results in a SQLite database, while *to_binary*
+       writes them in a compact binary format.
 
     This class is meant to be subclasses and cannot be used directly, since
     the methods :meth:`gobble`, :meth:`as_xml` and :meth:`to_terminal` are
     not implemented.
     '''
 
+    metric = None
+
     def __init__(self, paths, config):
         '''Initialize the Harvester.
 
@@ -69,12 +136,43 @@ class Harvester(object):
         '''
         self.paths = paths
         self.config = config
+        self.skipped = []
         self._results = []
+        self._journal = None
+        self._journal_keys = None
+        self._seen = None
+        self._cache = None
+        self._index = None
+        self._worker_packs = set()
+        self._screen = Screen.from_config(config)
+
+    def __getstate__(self):
+        '''Return the state to pickle when the harvester is sent to the
+        worker processes. The journal stays in the calling process.
+        '''
+        state = self.__dict__.copy()
+        state['_journal'] = None
+        state['_results'] = []
+        return state
 
     def _iter_filenames(self):
-        '''A wrapper around :func:`~radon.cli.tools.iter_filenames`.'''
-        return iter_filenames(
-            self.paths, self.config.exclude, self.config.ignore
+        '''A wrapper around :func:`~radon.cli.tools.iter_filenames`. If the
+        ``gitignore`` config value is True, the files ignored by Git are
+        skipped while exploring the directories. If the ``files_from`` config
+        value is set, the files listed in that file (see
+        :func:`~radon.cli.tools.iter_listed_files`) follow.
+        '''
+        filenames = iter_filenames(
+            self.paths,
+            self.config.exclude,
+            self.config.ignore,
+            getattr(self.config, 'gitignore', False),
+        )
+        files_from = getattr(self.config, 'files_from', None)
+        if not files_from:
+            return filenames
+        return itertools.chain(
+            filenames, iter_listed_files(files_from, self.config.exclude)
         )
 
     def gobble(self, fobj):
@@ -90,42 +188,457 @@ class Harvester(object):
         '''Start the analysis. For every file, this method calls the
         :meth:`gobble` method. Results are yielded as tuple:
         ``(filename, analysis_results)``.
+
+        The Python modules inside archives (see
+        :func:`~radon.cli.tools.iter_archive`) are read directly from the
+        archive, and are reported as ``{archive path}!{member name}``.
+
+        If the ``jobs`` config value is greater than 1, the files are analyzed
+        by that many worker processes (0 means one per processor), as
+        explained in :mod:`radon.cli.schedule`. The workers are also used when
+        a ``timeout`` (in seconds) or a ``memory_limit`` (in MiB) is set for
+        every file: the files that exceed them are listed in :attr:`skipped`,
+        and a summary is written to the standard error at the end of the run.
+
+        If the ``journal`` config value is set, the results of every file are
+        recorded in that journal (see :mod:`radon.cli.journal`). If ``resume``
+        is True as well, the files already recorded in the journal with the
+        same content are not analyzed again: their results are read back.
+
+        If the ``dedup`` config value is True, the files with the same content
+        are analyzed only once: their results are reused for all the other
+        paths (see :meth:`_analyze_unique`).
+
+        If the ``cache_dir`` config value is set, the results are stored in a
+        :class:`~radon.cache.PackedResultCache` in that directory (compressed
+        if ``cache_compress`` is True, and limited to ``cache_max_size`` MiB
+        if it is not 0), and the files whose content did not change are not
+        analyzed again. A
+        :class:`~radon.cache.StatIndex` of the files avoids reading those
+        whose inode, size and modification time did not change; the files
+        whose content was hashed more than ``cache_verify`` seconds ago are
+        read and hashed again anyway.
+
+        If the ``generated`` config value is set, the modules that look
+        generated or minified are not analyzed (see :mod:`radon.cli.screen`)
+        and their results are left out. In the ``report`` mode, they are
+        listed in :attr:`skipped` as well.
+        '''
+        if getattr(self.config, 'dedup', False):
+            self._seen = {}
+        self._open_cache()
+        try:
+            path = getattr(self.config, 'journal', None)
+            if not path:
+                for result in self._run():
+                    yield result
+                return
+            resume = getattr(self.config, 'resume', False)
+            with Journal(path, self.metric, resume) as journal:
+                self._journal = journal
+                self._journal_keys = journal.keys()
+                try:
+                    for result in self._run():
+                        yield result
+                finally:
+                    self._journal = None
+                    self._journal_keys = None
+        finally:
+            self._seen = None
+            self._close_cache()
+
+    def _open_cache(self):
+        '''Open the result cache and the stat index, if they are enabled.'''
+        directory = getattr(self.config, 'cache_dir', None)
+        if not directory:
+            return
+        self._cache = PackedResultCache(
+            directory,
+            getattr(self.config, 'cache_compress', False),
+            getattr(self.config, 'cache_max_size', 0) * 1024 * 1024,
+        )
+        self._index = StatIndex(
+            os.path.join(directory, INDEX_NAME),
+            getattr(self.config, 'cache_verify', 0),
+        )
+        self._worker_packs = set()
+
+    def _close_cache(self):
+        '''Save the stat index and close the cache, sealing the packs
+        written by the worker processes, which have exited.
+        '''
+        index, self._index = self._index, None
+        cache, self._cache = self._cache, None
+        if index is None:
+            return
+        try:
+            index.save()
+            for path in self._worker_packs:
+                cache.seal(path)
+            cache.close()
+        except (IOError, OSError):
+            # A read-only cache must not break the analysis
+            pass
+
+    def _worker_state(self):
+        '''Return what a worker process must send back to the calling process
+        after every batch: the entries of the stat index updated since the
+        last call, and the path of the pack of the cache written by the
+        worker, if any, whose index is written first.
+        '''
+        if self._cache is None:
+            return {}, None
+        try:
+            self._cache.flush()
+        except (IOError, OSError):
+            pass
+        return self._index.take_updates(), self._cache.path
+
+    def _merge_worker_state(self, state):
+        '''Merge the state returned by :meth:`_worker_state` in a worker
+        process.'''
+        updates, pack = state
+        if self._index is not None:
+            self._index.merge(updates)
+        if pack is not None:
+            self._worker_packs.add(pack)
+
+    def _run(self):
+        '''Analyze the files as explained in :meth:`run`, leaving out the
+        modules that look generated, and write the summary of the skipped
+        files at the end.
         '''
+        self.skipped = []
+        for name, result in self._analyze_all():
+            if self._screen is not None and is_generated(result):
+                if self.config.generated == REPORT:
+                    self.skipped.append((name, result['error']))
+                continue
+            yield name, result
+        self.log_skipped()
+
+    def _analyze_all(self):
+        '''Analyze the files, sequentially or with the worker processes, as
+        explained in :meth:`run`.
+        '''
+        jobs = getattr(self.config, 'jobs', 1)
+        timeout = getattr(self.config, 'timeout', 0)
+        memory_limit = getattr(self.config, 'memory_limit', 0)
+        if jobs != 1 or timeout or memory_limit:
+            for result in run_parallel(
+                self, jobs or os.cpu_count(), timeout, memory_limit
+            ):
+                yield result
+            return
+        prefetch = getattr(self.config, 'prefetch', 0)
+        if prefetch:
+            for result in run_pipeline(self, prefetch):
+                yield result
+            return
         for name in self._iter_filenames():
+            for result in self._analyze_file(name):
+                yield result
+
+    def _analyze_file(self, name, fobj=None):
+        '''Return an iterable of the results of the file (or the archive) at
+        the path *name*, recording them in the journal if there is one.
+        *fobj* is the content of the file, if it was already read.
+        '''
+        if not self._keyed():
+            if fobj is None:
+                return self._analyze_path(name)
+            return self._analyze(name, fobj)
+        key, results = self._analyze_entry(name, fobj)
+        return self._record(name, key, results)
+
+    def _keyed(self):
+        '''Return True if the files must be identified by their content key,
+        i.e. if a journal, the deduplication or the cache is in use.
+        '''
+        return (
+            self._journal_keys is not None
+            or self._seen is not None
+            or self._cache is not None
+        )
+
+    def content_key(self, data):
+        '''Return the key of a file whose content is *data* (text or bytes).
+        It depends on the content, on the options of the analysis and on the
+        version of Radon.
+        '''
+        return self._digest_key(content_hash(data))
+
+    def _digest_key(self, digest):
+        '''Return the key of a file whose content hash is *digest*.'''
+        return content_hash(digest, self.metric, *self._key_options())
+
+    def _content_key(self, name, fobj=None):
+        '''Return a tuple ``(key, fobj)``, *key* being the content key of the
+        file *name* and *fobj* its content, read if it was not given.
+
+        When the cache is in use and the file was not already read, it is
+        looked up in the stat index first: if it did not change, it is not
+        read and *fobj* is `None`.
+        '''
+        st = None
+        if self._index is not None and fobj is None:
+            st = os.stat(name)
+            digest = self._index.lookup(name, st)
+            if digest is not None:
+                return self._digest_key(digest), None
+        if fobj is None:
+            fobj = read_file(name)
+        if isinstance(fobj, SourceFile):
+            data = fobj.data
+        else:
+            data = fobj.getvalue()
+        digest = content_hash(data)
+        if st is not None:
+            self._index.update(name, st, digest)
+        return self._digest_key(digest), fobj
+
+    def _key_options(self):
+        '''Return the config values that change the results of a file.'''
+        return (
+            getattr(self.config, 'include_ipynb', False),
+            getattr(self.config, 'ipynb_cells', False),
+        )
+
+    def _analyze_entry(self, name, fobj=None):
+        '''Analyze the file (or the archive) at the path *name* and return a
+        tuple ``(key, results)``, *results* being the list of the results
+        yielded by :meth:`run`.
+
+        When a journal, the deduplication or the cache is in use, *key* is the
+        key of the file in the journal (see :meth:`_journal_key`); otherwise,
+        as for archives and the standard input, it is `None`. If the run is
+        resumed and the file did not change, *results* is `None`: the results
+        are then read back from the journal by :meth:`_record`. *fobj* is the
+        content of the file, if it was already read. A file that cannot be
+        read gets an error result, with a `None` key.
+        '''
+        if not self._keyed() or name == '-' or _is_archive(name):
+            if fobj is None:
+                return None, list(self._analyze_path(name))
+            return None, list(self._analyze(name, fobj))
+        try:
+            key, fobj = self._content_key(name, fobj)
+            journal_key = self._journal_key(key)
+            keys = self._journal_keys
+            if keys is not None and keys.get(name) == journal_key:
+                return journal_key, None
+            return journal_key, self._analyze_unique(name, fobj, key)
+        except (IOError, OSError) as e:
+            return None, [(name, {'error': str(e)})]
+
+    def _journal_key(self, key):
+        '''Return the key of the file whose content key is *key* in the
+        journal. Unlike the content key, it depends on the rules of the
+        pre-screen of the generated modules, since the journal holds the
+        outcome of the screen together with the results.
+        '''
+        if self._screen is None:
+            return key
+        return content_hash(key, GENERATED_ERROR, *self._screen.key())
+
+    def _analyze_unique(self, name, fobj, key):
+        '''Return the list of the results of the file *name*, whose content
+        key is *key*. When the deduplication is in use and a file with the
+        same content was already analyzed during the run, *fobj* is not
+        analyzed again: the results of that file are returned instead, under
+        the new name. The same goes for the files found in the cache. *fobj*
+        is read if it is `None` and the file must be analyzed.
+
+        If the pre-screen of the generated modules is in use, the file is
+        screened first (see :meth:`_screen_entry`), and it is not analyzed
+        if it looks generated.
+        '''
+        # Notebooks are analyzed differently from modules
+        is_ipynb = name.endswith('.ipynb')
+        seen_key = (key, is_ipynb)
+        if self._seen is not None and seen_key in self._seen:
+            first, results = self._seen[seen_key]
+            # The names of the results start with the name of the file,
+            # followed by the cell number for notebooks
+            return [
+                (name + path[len(first):], result) for path, result in results
+            ]
+        reason = None
+        if self._screen is not None and not is_ipynb:
+            reason, fobj = self._screen_entry(name, fobj, key)
+        if reason:
+            results = [(name, {'error': generated_error(reason)})]
+        else:
+            results = self._cached(name, key)
+        if results is None:
+            if fobj is None:
+                fobj = read_file(name)
+            results = list(self._analyze(name, fobj, screen=False))
+            self._store(name, key, results)
+        if self._seen is not None:
+            self._seen[seen_key] = (name, results)
+        return results
+
+    def _screen_entry(self, name, fobj, key):
+        '''Return a tuple ``(reason, fobj)``, *reason* being the outcome of
+        the pre-screen of the file *name*, whose content key is *key*, as
+        returned by :meth:`~radon.cli.screen.Screen.check_file` (an empty
+        string if the file does not look generated), and *fobj* its content,
+        read if it was not given and the file had to be screened.
+
+        The outcome is stored in the cache apart from the results, under a
+        key that depends on the rules of the screen, so that changing the
+        rules, or turning the screen on and off, keeps the cached results.
+        It is stored as an error record, whose message is the reason.
+        '''
+        verdict_key = content_hash(key, GENERATED_ERROR, *self._screen.key())
+        if self._cache is not None:
+            entry = self._cache.get(verdict_key)
+            if entry is not None and self.metric in entry:
+                return entry[self.metric]['error'], fobj
+        if fobj is None:
+            fobj = read_file(name)
+        reason = self._screen.check_file(fobj) or ''
+        if self._cache is not None:
+            try:
+                self._cache[verdict_key] = {self.metric: {'error': reason}}
+            except (IOError, OSError):
+                pass
+        return reason, fobj
+
+    def _cached(self, name, key):
+        '''Return the results of the file *name* stored in the cache under
+        *key*, or `None` if they are not there. Notebooks are not cached.
+        '''
+        if self._cache is None or name.endswith('.ipynb'):
+            return None
+        entry = self._cache.get(key)
+        if entry is None or self.metric not in entry:
+            return None
+        return [(name, self._from_record(entry[self.metric]))]
+
+    def _store(self, name, key, results):
+        '''Store the *results* of the file *name* in the cache under *key*.
+        The files that went over their time or memory budget are not stored,
+        since the budget may be different on the next run.
+        '''
+        if self._cache is None or name.endswith('.ipynb'):
+            return
+        if _over_budget(results):
+            return
+        (_, result), = results
+        try:
+            self._cache[key] = {self.metric: result}
+        except (IOError, OSError):
+            # A read-only or full cache must not break the analysis
+            pass
+
+    def _record(self, name, key, results):
+        '''Return the results of the file *name*, as returned by
+        :meth:`_analyze_entry`, after recording them in the journal or
+        reading them back from it. As in :meth:`_store`, the files that went
+        over their time or memory budget are not recorded, so that a resumed
+        run analyzes them again.
+        '''
+        if key is None or self._journal is None:
+            return results
+        if results is None:
+            return [
+                (path, self._from_record(result))
+                for path, result in self._journal.get(name, key)
+            ]
+        if not _over_budget(results):
+            self._journal.append(name, key, results)
+        return results
+
+    def _from_record(self, result):
+        '''Convert a result read from the binary format of
+        :mod:`radon.serialize` into the one returned by :meth:`gobble`.
+        '''
+        return result
+
+    def log_skipped(self, stream=None):
+        '''Write the list of the skipped files to *stream*, which defaults
+        to the standard error. Nothing is written if no file was skipped.
+        '''
+        if not self.skipped:
+            return
+        stream = sys.stderr if stream is None else stream
+        stream.write('{0} files skipped:\n'.format(len(self.skipped)))
+        for name, error in self.skipped:
+            stream.write('    {0} ({1})\n'.format(name, error))
+
+    def _analyze_path(self, name):
+        '''Analyze the file (or the archive) at the path *name*, yielding the
+        results as :meth:`run` does. A file that cannot be opened, like a
+        missing file listed with ``files_from``, gets an error result.
+        '''
+        if _is_archive(name):
+            for result in self._analyze_archive(name):
+                yield result
+            return
+        try:
             with _open(name) as fobj:
-                try:
-                    if name.endswith('.ipynb'):
-                        if SUPPORTS_IPYNB and self.config.include_ipynb:
-                            nb = nbformat.read(
-                                fobj, as_version=nbformat.NO_CONVERT
-                            )
-                            cells = [
-                                cell.source
-                                for cell in nb.cells
-                                if cell.cell_type == 'code'
-                            ]
-                            # Whole document
-                            doc = "\n".join(cells)
+                results = list(self._analyze(name, fobj))
+        except (IOError, OSError) as e:
+            results = [(name, {'error': str(e)})]
+        for result in results:
+            yield result
+
+    def _analyze_archive(self, path):
+        '''Analyze all the Python modules inside an archive. The modules that
+        cannot be decoded or analyzed are reported on their own, while an
+        archive that cannot be read is reported under its path.
+        '''
+        exclude = self.config.exclude
+        exclude = exclude.split(',') if exclude else []
+        try:
+            for name, fobj in iter_archive(path, exclude):
+                for result in self._analyze(name, fobj):
+                    yield result
+        except Exception as e:
+            yield (path, {'error': str(e)})
+
+    def _analyze(self, name, fobj, screen=True):
+        '''Analyze a single file object, yielding the results as tuples
+        ``(name, analysis_results)``. Notebooks may yield more than one result.
+        The module is screened before it is analyzed if the pre-screen of the
+        generated modules is in use, unless *screen* is False.
+        '''
+        try:
+            if name.endswith('.ipynb'):
+                if SUPPORTS_IPYNB and self.config.include_ipynb:
+                    nb = nbformat.read(fobj, as_version=nbformat.NO_CONVERT)
+                    cells = [
+                        cell.source
+                        for cell in nb.cells
+                        if cell.cell_type == 'code'
+                    ]
+                    # Whole document
+                    doc = "\n".join(cells)
+                    yield (name, self.gobble(StringIO(strip_ipython(doc))))
+
+                    if self.config.ipynb_cells:
+                        # Individual cells
+                        cellid = 0
+                        for source in cells:
                             yield (
-                                name,
-                                self.gobble(StringIO(strip_ipython(doc))),
+                                "{0}:[{1}]".format(name, cellid),
+                                self.gobble(StringIO(strip_ipython(source))),
                             )
-
-                            if self.config.ipynb_cells:
-                                # Individual cells
-                                cellid = 0
-                                for source in cells:
-                                    yield (
-                                        "{0}:[{1}]".format(name, cellid),
-                                        self.gobble(
-                                            StringIO(strip_ipython(source))
-                                        ),
-                                    )
-                                    cellid += 1
-                    else:
-                        yield (name, self.gobble(fobj))
-                except Exception as e:
-                    yield (name, {'error': str(e)})
+                            cellid += 1
+            else:
+                reason = None
+                if self._screen is not None and screen:
+                    reason = self._screen.check_file(fobj)
+                if reason is not None:
+                    yield (name, {'error': generated_error(reason)})
+                else:
+                    yield (name, self.gobble(fobj))
+        except MemoryError:
+            yield (name, {'error': MEMORY_ERROR})
+        except Exception as e:
+            yield (name, {'error': str(e)})
 
     @property
     def results(self):
@@ -147,22 +660,84 @@ class Harvester(object):
             return self._results
         return caching_iterator(self.run(), self._results)
 
+    def _iter_results(self):
+        '''Iterate over the results like :attr:`results` does, but without
+        caching them, so that formatters which stream their output use a
+        constant amount of memory.
+        '''
+        if self._results:
+            return iter(self._results)
+        return self.run()
+
     def as_json(self):
         '''Format the results as JSON.'''
         return json.dumps(dict(self.results))
 
+    def iter_json(self):
+        '''Yield the results formatted as JSON in chunks. By default, the
+        whole output of :meth:`as_json` is a single chunk.
+        '''
+        yield self.as_json()
+
     def as_xml(self):
         '''Format the results as XML.'''
         raise NotImplementedError
 
+    def iter_xml(self):
+        '''Yield the results formatted as XML in chunks. By default, the
+        whole output of :meth:`as_xml` is a single chunk.
+        '''
+        yield self.as_xml()
+
     def as_md(self):
         '''Format the results as Markdown.'''
         raise NotImplementedError
 
+    def iter_md(self):
+        '''Yield the results formatted as Markdown in chunks. By default, the
+        whole output of :meth:`as_md` is a single chunk.
+        '''
+        yield self.as_md()
+
     def as_codeclimate_issues(self):
         '''Format the results as Code Climate issues.'''
         raise NotImplementedError
 
+    def iter_codeclimate_issues(self):
+        '''Yield the results formatted as Code Climate issues in lists. By
+        default, all the issues of :meth:`as_codeclimate_issues` are yielded
+        as a single list.
+        '''
+        yield self.as_codeclimate_issues()
+
+    def to_sqlite(self, database, label=None):
+        '''Store the results in the SQLite database at *database*, as a new
+        run with an optional *label*. Return the id of the run.
+
+        See :mod:`radon.cli.store` for the schema of the database.
+        '''
+        if self.metric is None:
+            raise NotImplementedError
+        with SQLiteStore(database) as store:
+            run_id = store.start_run(self.metric, label)
+            for name, data in self.results:
+                if 'error' in data:
+                    store.add_error(run_id, name, data['error'])
+                else:
+                    store.add(run_id, self.metric, name, data)
+        return run_id
+
+    def to_binary(self, fobj):
+        '''Write the results to the binary file object *fobj*, in the format
+        described in :mod:`radon.serialize`. They can be read back with
+        :func:`radon.serialize.iter_results`.
+        '''
+        if self.metric is None:
+            raise NotImplementedError
+        writer = ResultWriter(fobj)
+        for name, data in self._iter_results():
+            writer.write(self.metric, name, data)
+
     def to_terminal(self):
         '''Yields tuples representing lines to be printed to a terminal.
 
@@ -175,19 +750,35 @@ class Harvester(object):
 class CCHarvester(Harvester):
     '''A class that analyzes Python modules' Cyclomatic Complexity.'''
 
+    metric = 'cc'
+
+    def _key_options(self):
+        '''Return the config values that change the results of a file.'''
+        order = getattr(self.config.order, '__name__', self.config.order)
+        return super()._key_options() + (
+            self.config.no_assert,
+            self.config.show_closures,
+            order,
+        )
+
     def gobble(self, fobj):
         '''Analyze the content of the file object.'''
-        r = cc_visit(fobj.read(), no_assert=self.config.no_assert)
+        r = cc_visit(_read_source(fobj), no_assert=self.config.no_assert)
         if self.config.show_closures:
             r = add_inner_blocks(r)
         return sorted_results(r, order=self.config.order)
 
     def _to_dicts(self):
         '''Format the results as a dictionary of dictionaries.'''
-        result = {}
-        for key, data in self.results:
+        return dict(self._iter_dicts(self.results))
+
+    def _iter_dicts(self, results):
+        '''Format every item of *results* as a tuple ``(filename, values)``,
+        skipping the files without any block within the ranks.
+        '''
+        for key, data in results:
             if 'error' in data:
-                result[key] = data
+                yield key, data
                 continue
             values = [
                 v
@@ -195,12 +786,36 @@ class CCHarvester(Harvester):
                 if self.config.min <= v['rank'] <= self.config.max
             ]
             if values:
-                result[key] = values
-        return result
+                yield key, values
 
     def as_json(self):
         '''Format the results as JSON.'''
-        return json.dumps(self._to_dicts())
+        return ''.join(self.iter_json())
+
+    def iter_json(self):
+        '''Yield the results formatted as JSON, one chunk for every file, as
+        soon as they are available. The blocks are encoded directly with
+        :func:`~radon.cli.tools.cc_to_json`.
+        '''
+        return iter_json(self._iter_json_members(self._iter_results()))
+
+    def _iter_json_members(self, results):
+        '''Encode every item of *results* as a tuple ``(filename, text)``,
+        skipping the files without any block within the ranks, as
+        :meth:`_iter_dicts` does.
+        '''
+        for key, data in results:
+            if 'error' in data:
+                yield key, json.dumps(data)
+                continue
+            values = [
+                cc_to_json(block)
+                for block in data
+                if self.config.min <= cc_rank(block.complexity)
+                <= self.config.max
+            ]
+            if values:
+                yield key, '[' + ', '.join(values) + ']'
 
     def as_xml(self):
         '''Format the results as XML. This is meant to be compatible with
@@ -208,14 +823,43 @@ class CCHarvester(Harvester):
         '''
         return dict_to_xml(self._to_dicts())
 
+    def iter_xml(self):
+        '''Yield the results formatted as XML, one chunk for every file, as
+        soon as they are available.
+        '''
+        return iter_xml(self._iter_dicts(self._iter_results()))
+
     def as_md(self):
         '''Format the results as Markdown.'''
         return dict_to_md(self._to_dicts())
 
+    def iter_md(self):
+        '''Yield the results formatted as a Markdown table, one chunk of rows
+        for every file, as soon as they are available.
+        '''
+        return iter_md(
+            CC_MD_COLUMNS,
+            (
+                cc_to_md_rows(path, blocks)
+                for path, blocks in self._iter_dicts(self._iter_results())
+                if not isinstance(blocks, dict)
+            ),
+        )
+
     def as_codeclimate_issues(self):
         '''Format the result as Code Climate issues.'''
         return dict_to_codeclimate_issues(self._to_dicts(), self.config.min)
 
+    def iter_codeclimate_issues(self):
+        '''Yield the Code Climate issues of every file in a list, as soon as
+        its results are available.
+        '''
+        content = get_content()
+        for path, info in self._iter_dicts(self._iter_results()):
+            yield file_to_codeclimate_issues(
+                path, info, self.config.min, content
+            )
+
     def to_terminal(self):
         '''Yield lines to be printed in a terminal.'''
         average_cc = 0.0
@@ -255,6 +899,8 @@ class CCHarvester(Harvester):
 class RawHarvester(Harvester):
     '''A class that analyzes Python modules' raw metrics.'''
 
+    metric = 'raw'
+
     headers = [
         'LOC',
         'LLOC',
@@ -269,10 +915,31 @@ class RawHarvester(Harvester):
         '''Analyze the content of the file object.'''
         return raw_to_dict(analyze(fobj.read()))
 
+    def _from_record(self, result):
+        '''Convert a raw result read back from the binary format.'''
+        return result if isinstance(result, dict) else raw_to_dict(result)
+
     def as_xml(self):
         '''Placeholder method. Currently not implemented.'''
         raise NotImplementedError('RawHarvester: cannot export results as XML')
 
+    def as_md(self):
+        '''Format the results as Markdown.'''
+        return ''.join(self.iter_md())
+
+    def iter_md(self):
+        '''Yield the results formatted as a Markdown table, one row for every
+        file, as soon as they are available.
+        '''
+        return iter_md(
+            RAW_MD_COLUMNS,
+            (
+                raw_to_md_rows(path, mod)
+                for path, mod in self._iter_results()
+                if 'error' not in mod
+            ),
+        )
+
     def to_terminal(self):
         '''Yield lines to be printed to a terminal.'''
         sum_metrics = collections.defaultdict(int)
@@ -335,12 +1002,24 @@ class RawHarvester(Harvester):
 class MIHarvester(Harvester):
     '''A class that analyzes Python modules' Maintainability Index.'''
 
+    metric = 'mi'
+
     def gobble(self, fobj):
         '''Analyze the content of the file object.'''
         mi = mi_visit(fobj.read(), self.config.multi)
         rank = mi_rank(mi)
         return {'mi': mi, 'rank': rank}
 
+    def _key_options(self):
+        '''Return the config values that change the results of a file.'''
+        return super()._key_options() + (self.config.multi,)
+
+    def _from_record(self, result):
+        '''Convert an MI result read back from the binary format.'''
+        if isinstance(result, dict):
+            return result
+        return {'mi': result, 'rank': mi_rank(result)}
+
     @property
     def filtered_results(self):
         '''Filter results with respect with their rank.'''
@@ -364,6 +1043,26 @@ class MIHarvester(Harvester):
         '''Placeholder method. Currently not implemented.'''
         raise NotImplementedError('Cannot export results as XML')
 
+    def as_md(self):
+        '''Format the results as Markdown.'''
+        return ''.join(self.iter_md())
+
+    def iter_md(self):
+        '''Yield the results formatted as a Markdown table, one row for every
+        file, as soon as they are available. If the results are sorted, they
+        are all collected first.
+        '''
+        results = (
+            (path, mi)
+            for path, mi in self._iter_results()
+            if 'error' not in mi
+            and self.config.min <= mi['rank'] <= self.config.max
+        )
+        return iter_md(
+            MI_MD_COLUMNS,
+            (mi_to_md_rows(path, mi) for path, mi in self._sort(results)),
+        )
+
     def to_terminal(self):
         '''Yield lines to be printed to a terminal.'''
         for name, mi in self._sort(self.filtered_results):
@@ -381,19 +1080,64 @@ class MIHarvester(Harvester):
 class HCHarvester(Harvester):
     """Computes the Halstead Complexity of Python modules."""
 
+    metric = 'hal'
+
     def __init__(self, paths, config):
         super().__init__(paths, config)
         self.by_function = config.by_function
 
     def gobble(self, fobj):
         """Analyze the content of the file object."""
-        code = fobj.read()
+        code = _read_source(fobj)
         return h_visit(code)
 
+    def _from_record(self, result):
+        """Convert a Halstead result read back from the binary format. The
+        reports are computed again from their counts, since the binary format
+        stores the derived values as doubles, while a fresh report can hold
+        integers, like a volume of 0."""
+        if isinstance(result, dict):
+            return result
+        return Halstead(
+            halstead_report(*result.total[:4]),
+            [
+                (name, halstead_report(*report[:4]))
+                for name, report in result.functions
+            ],
+        )
+
     def as_json(self):
         """Format the results as JSON."""
-        result_dict = self._to_dicts()
-        return json.dumps(result_dict)
+        return ''.join(self.iter_json())
+
+    def iter_json(self):
+        """Yield the results formatted as JSON, one chunk for every file, as
+        soon as they are available."""
+        return iter_json(
+            (
+                name,
+                json.dumps(res)
+                if isinstance(res, dict)
+                else hal_to_json(res),
+            )
+            for name, res in self._iter_results()
+        )
+
+    def as_md(self):
+        """Format the results as Markdown."""
+        return ''.join(self.iter_md())
+
+    def iter_md(self):
+        """Yield the results formatted as a Markdown table, one chunk of rows
+        for every file, as soon as they are available."""
+        return iter_md(
+            HAL_MD_COLUMNS,
+            (
+                hal_to_md_rows(path, res, self.by_function)
+                for path, res in self._iter_results()
+                if not isinstance(res, dict)
+            ),
+        )
 
     def to_terminal(self):
         """Yield lines to be printed to the terminal."""
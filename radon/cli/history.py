@@ -0,0 +1,157 @@
+'''This module implements the analysis of the history of a Git repository.
+
+Instead of checking out every commit, the files are read straight from the
+object database: the trees are listed with ``git ls-tree`` and the blobs are
+read in bulk from a single ``git cat-file --batch`` process. Every distinct
+blob is analyzed only once, so the cost of the analysis depends on the number
+of distinct file versions rather than on the number of commits.
+'''
+
+import fnmatch
+import io
+import posixpath
+import subprocess
+
+from radon.cli.tools import decode_source
+
+
+class GitError(Exception):
+    '''Raised when a Git command fails.'''
+
+
+def _git(repo, *args):
+    '''Run a Git command inside *repo* and return its output as bytes.'''
+    process = subprocess.Popen(
+        ('git', '-C', repo) + args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    out, err = process.communicate()
+    if process.returncode != 0:
+        raise GitError(err.decode('utf-8', 'replace').strip())
+    return out
+
+
+def iter_commits(repo, rev_range):
+    '''Yield the hashes of the commits in *rev_range*, oldest first.'''
+    out = _git(repo, 'rev-list', '--reverse', rev_range, '--')
+    for line in out.decode('ascii').splitlines():
+        yield line
+
+
+def iter_tree(repo, commit):
+    '''Yield ``(path, blob_hash)`` tuples for every regular file in the tree
+    of *commit*. Symbolic links and submodules are skipped.
+    '''
+    out = _git(repo, 'ls-tree', '-r', '-z', '--full-tree', commit)
+    for entry in out.split(b'\0'):
+        if not entry:
+            continue
+        info, path = entry.split(b'\t', 1)
+        mode, kind, sha = info.split()
+        if kind != b'blob' or mode not in (b'100644', b'100755'):
+            continue
+        yield path.decode('utf-8', 'surrogateescape'), sha.decode('ascii')
+
+
+class BlobReader(object):
+    '''Read blobs from the object database through a single, long-running
+    ``git cat-file --batch`` process.
+    '''
+
+    def __init__(self, repo):
+        self.process = subprocess.Popen(
+            ('git', '-C', repo, 'cat-file', '--batch'),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def read(self, sha):
+        '''Return the contents of the blob *sha* as bytes.'''
+        self.process.stdin.write(sha.encode('ascii') + b'\n')
+        self.process.stdin.flush()
+        header = self.process.stdout.readline().split()
+        if len(header) != 3:
+            raise GitError('cannot read object {0}'.format(sha))
+        size = int(header[2])
+        data = self.process.stdout.read(size)
+        # Every object is followed by a newline
+        self.process.stdout.read(1)
+        return data
+
+    def close(self):
+        '''Terminate the ``git cat-file`` process.'''
+        self.process.stdin.close()
+        self.process.stdout.close()
+        self.process.wait()
+
+
+class HistoryMiner(object):
+    '''Analyze the Python files of every commit in a revision range.
+
+    *harvester* is the :class:`~radon.cli.harvest.Harvester` instance whose
+    :meth:`~radon.cli.harvest.Harvester.gobble` method is used to analyze the
+    files. *exclude* and *ignore* have the same meaning as in
+    :func:`~radon.cli.tools.iter_filenames`.
+    '''
+
+    def __init__(self, repo, rev_range, harvester, exclude=None, ignore=None):
+        self.repo = repo
+        self.rev_range = rev_range
+        self.harvester = harvester
+        self.exclude = exclude.split(',') if exclude else []
+        self.ignore = (
+            '.*,{0}'.format(ignore).split(',') if ignore else ['.*']
+        )
+        self.blob_results = {}
+
+    def _is_included(self, path):
+        '''Check whether *path* should be analyzed.'''
+        if not path.endswith('.py'):
+            return False
+        dirnames = posixpath.dirname(path).split('/')
+        if any(
+            fnmatch.fnmatch(d, p) for d in dirnames if d for p in self.ignore
+        ):
+            return False
+        if posixpath.basename(path).startswith('.'):
+            return False
+        return not any(fnmatch.fnmatch(path, p) for p in self.exclude)
+
+    def _analyze(self, reader, sha):
+        '''Return the results for the blob *sha*, analyzing it only if it has
+        not been seen before.
+        '''
+        try:
+            return self.blob_results[sha]
+        except KeyError:
+            pass
+        try:
+            source = decode_source(reader.read(sha))
+            result = self.harvester.gobble(io.StringIO(source))
+        except GitError:
+            raise
+        except Exception as e:
+            result = {'error': str(e)}
+        self.blob_results[sha] = result
+        return result
+
+    def run(self):
+        '''Yield ``(commit, results)`` tuples, where *results* is a list of
+        ``(path, analysis_results)`` tuples in the same format as
+        :meth:`~radon.cli.harvest.Harvester.run`.
+        '''
+        with BlobReader(self.repo) as reader:
+            for commit in iter_commits(self.repo, self.rev_range):
+                results = [
+                    (path, self._analyze(reader, sha))
+                    for path, sha in iter_tree(self.repo, commit)
+                    if self._is_included(path)
+                ]
+                yield commit, results
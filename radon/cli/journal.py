@@ -0,0 +1,167 @@
+'''This module implements the journal used to resume interrupted runs.
+
+When a journal is enabled, the results of every file are appended to it as
+soon as the file is analyzed, together with the content key of the file (see
+:meth:`~radon.cli.harvest.Harvester.content_key`). If the run is interrupted,
+the next one can resume from the journal: the files whose key did not change
+are not analyzed again, and their results are read back from the journal.
+
+The journal starts with the 4 bytes ``RDNJ`` and is followed by the entries,
+one for every file. An entry starts with the unsigned 32-bit size of its body
+and the CRC-32 of the body, both little-endian. The body is made of the path
+of the file and its content key as strings (see :mod:`radon.serialize`), an
+unsigned 32-bit count of results and the results, as records of
+:mod:`radon.serialize`.
+
+Every entry is written with a single call and the journal is synced to the
+disk regularly, so that after a crash at most its tail is lost. An entry that
+is incomplete or corrupted ends the journal: it is discarded, together with
+everything after it, when the journal is resumed.
+'''
+
+import os
+import struct
+import zlib
+
+from radon.serialize import (
+    COUNT,
+    RECORD,
+    FormatError,
+    _pack_str,
+    _Unpacker,
+    dump_record,
+    load_record,
+)
+
+MAGIC = b'RDNJ'
+
+ENTRY = struct.Struct('<II')
+
+# The journal is synced to the disk every this many entries
+SYNC_EVERY = 64
+
+
+def _load_entry(body):
+    '''Decode the *body* of an entry and return a tuple ``(path, key,
+    results)``, *results* being a list of ``(name, result)`` tuples.
+    '''
+    unpacker = _Unpacker(body)
+    path = unpacker.string()
+    key = unpacker.string()
+    results = []
+    for _ in range(unpacker.count()):
+        kind, size = unpacker.unpack(RECORD)
+        end = unpacker.offset + size
+        if end > len(body):
+            raise FormatError('truncated record')
+        _, name, result = load_record(kind, body[unpacker.offset:end])
+        unpacker.offset = end
+        results.append((name, result))
+    return path, key, results
+
+
+def read_journal(data):
+    '''Decode the bytes of a journal and return a tuple ``(entries, size)``.
+    *entries* is a dictionary mapping every path to a tuple ``(key,
+    results)``, while *size* is the size of the valid part of the journal:
+    everything after it is an incomplete or corrupted entry.
+    '''
+    data = memoryview(data)
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise FormatError('not a Radon journal')
+    entries = {}
+    offset = len(MAGIC)
+    while offset + ENTRY.size <= len(data):
+        size, crc = ENTRY.unpack_from(data, offset)
+        start = offset + ENTRY.size
+        body = data[start:start + size]
+        if len(body) < size or zlib.crc32(body) & 0xffffffff != crc:
+            break
+        try:
+            path, key, results = _load_entry(body)
+        except FormatError:
+            break
+        entries[path] = (key, results)
+        offset = start + size
+    return entries, offset
+
+
+class Journal(object):
+    '''An append-only journal of the results of *metric* stored at *path*.
+
+    If *resume* is True and the journal exists, its entries are loaded and
+    the new ones are appended after them. Otherwise the journal is started
+    anew.
+    '''
+
+    def __init__(self, path, metric, resume=False, sync_every=SYNC_EVERY):
+        self.path = path
+        self.metric = metric
+        self.sync_every = sync_every
+        self.entries = {}
+        self._unsynced = 0
+        self._fobj = None
+        if resume and os.path.exists(path):
+            with open(path, 'rb') as fobj:
+                data = fobj.read()
+            try:
+                self.entries, size = read_journal(data)
+            except FormatError:
+                size = 0
+            if size:
+                self._fobj = open(path, 'r+b', buffering=0)
+                self._fobj.truncate(size)
+                self._fobj.seek(size)
+        if self._fobj is None:
+            self._fobj = open(path, 'wb', buffering=0)
+            self._fobj.write(MAGIC)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def keys(self):
+        '''Return a dictionary mapping every path in the journal to its
+        content key.'''
+        return dict((path, entry[0]) for path, entry in self.entries.items())
+
+    def get(self, path, key):
+        '''Return the results recorded for *path* if its content key is
+        *key*, or `None` otherwise.'''
+        entry = self.entries.get(path)
+        if entry is None or entry[0] != key:
+            return None
+        return entry[1]
+
+    def append(self, path, key, results):
+        '''Append the *results* of *path*, a list of ``(name, result)``
+        tuples, with the content *key* of the file.'''
+        parts = []
+        _pack_str(parts, path)
+        _pack_str(parts, key)
+        parts.append(COUNT.pack(len(results)))
+        for name, result in results:
+            parts.append(dump_record(self.metric, name, result))
+        body = b''.join(parts)
+        crc = zlib.crc32(body) & 0xffffffff
+        data = memoryview(ENTRY.pack(len(body), crc) + body)
+        while data:
+            data = data[self._fobj.write(data):]
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every:
+            self.sync()
+
+    def sync(self):
+        '''Make sure that all the entries are written to the disk.'''
+        os.fsync(self._fobj.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        '''Sync and close the journal.'''
+        if self._fobj is not None:
+            if self._unsynced:
+                self.sync()
+            self._fobj.close()
+            self._fobj = None
@@ -0,0 +1,119 @@
+'''This module holds the buffered writer used to print the results of the
+harvesters to a terminal or to a file.
+
+Instead of writing every line on its own, the lines yielded by
+:meth:`~radon.cli.harvest.Harvester.to_terminal` are rendered into large
+chunks, which are then written with a single call. When the output goes to a
+regular file and the platform does not translate the newlines, the chunks are
+encoded as the file would encode them and written straight to its file
+descriptor.
+'''
+
+import os
+import sys
+
+from radon.cli.colors import BRIGHT, RED, RESET
+
+# The default size of the chunks, in characters
+BUFFER_SIZE = 1 << 16
+
+
+def output_fd(stream):
+    '''Return the file descriptor of *stream* if the chunks can be written
+    directly to it, i.e. if it is a file other than the standard output and
+    not a terminal, and if the newlines written to it are not translated.
+    Otherwise return `None`.
+    '''
+    if stream is sys.stdout or stream is sys.__stdout__:
+        return None
+    if os.linesep != '\n':
+        # The text stream would translate the newlines
+        return None
+    try:
+        fd = stream.fileno()
+    except Exception:
+        return None
+    if not isinstance(fd, int) or os.isatty(fd):
+        return None
+    return fd
+
+
+class TerminalWriter(object):
+    '''Render the tuples yielded by
+    :meth:`~radon.cli.harvest.Harvester.to_terminal` into *stream*.
+
+    The lines are collected in a buffer, which is written out every
+    *buffer_size* characters and when the writer is closed. If *fd* is given,
+    the buffer is encoded with the encoding and the error handler of *stream*
+    and written directly to that file descriptor.
+    '''
+
+    def __init__(self, stream=None, fd=None, buffer_size=BUFFER_SIZE):
+        self.stream = sys.stdout if stream is None else stream
+        self.fd = fd
+        self.buffer_size = buffer_size
+        self.encoding = getattr(self.stream, 'encoding', None) or 'utf-8'
+        self.errors = getattr(self.stream, 'errors', None) or 'strict'
+        self.error_prefix = ' ' * 4 + '{0}{1}ERROR{2}: '.format(
+            BRIGHT, RED, RESET
+        )
+        self._indents = []
+        self._buffer = []
+        self._size = 0
+        if fd is not None:
+            # Whatever was written before must come first
+            self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def indent(self, level):
+        '''Return the indentation string for *level*.'''
+        try:
+            return self._indents[level]
+        except IndexError:
+            for i in range(len(self._indents), level + 1):
+                self._indents.append(' ' * 4 * i)
+            return self._indents[level]
+
+    def write(self, text):
+        '''Add *text* to the buffer, writing the buffer out if it is full.'''
+        self._buffer.append(text)
+        self._size += len(text)
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        '''Write out the content of the buffer.'''
+        if not self._buffer:
+            return
+        chunk = ''.join(self._buffer)
+        self._buffer = []
+        self._size = 0
+        if self.fd is None:
+            self.stream.write(chunk)
+            return
+        data = memoryview(chunk.encode(self.encoding, self.errors))
+        while data:
+            data = data[os.write(self.fd, data):]
+
+    def write_lines(self, lines):
+        '''Render every ``(msg, args, kwargs)`` tuple in *lines*, as
+        :func:`~radon.cli.log_result` does.
+        '''
+        write = self.write
+        for msg, args, kwargs in lines:
+            indent = self.indent(kwargs.get('indent', 0))
+            if kwargs.get('error', False):
+                write(indent + msg + '\n')
+                write(self.error_prefix + args[0] + '\n')
+                continue
+            if not isinstance(msg, (list, tuple)):
+                msg = [msg]
+            if args:
+                msg = [line.format(*args) for line in msg]
+            if msg:
+                write(indent + ('\n' + indent).join(msg) + '\n')
@@ -0,0 +1,126 @@
+'''This module implements the pipelined analysis of the files by
+:meth:`~radon.cli.harvest.Harvester.run`.
+
+On slow file systems, like network mounts, a sequential run spends as much
+time waiting for the files to be read as analyzing them. In a pipelined run
+the work is split into three stages, joined by bounded queues so that no
+stage can run too far ahead of the next one:
+
+1. a pool of threads reads the files ahead, in the order in which they are
+   discovered;
+2. a thread analyzes the files as soon as they are read;
+3. the caller, usually the code formatting the output, consumes the results
+   as soon as they are ready.
+
+The results are yielded in the same order as in a sequential run.
+'''
+
+import collections
+import concurrent.futures
+import threading
+
+try:
+    import queue
+except ImportError:  # pragma: no cover
+    import Queue as queue
+
+from radon.cli.tools import _is_archive, read_file
+
+# The maximum number of results waiting to be consumed
+QUEUE_SIZE = 256
+# The maximum number of files read ahead by every thread
+READ_AHEAD = 4
+
+# The item put in the queue when the analysis is over
+_DONE = object()
+
+
+class _Failure(object):
+    '''Wrap the exception raised by the analysis thread.'''
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _read(name):
+    '''Read the file *name*, unless it is analyzed in a different way. A file
+    that cannot be read is left to the analysis, which reports the error.
+    '''
+    if name == '-' or _is_archive(name):
+        return None
+    try:
+        return read_file(name)
+    except (IOError, OSError):
+        return None
+
+
+def prefetch(names, threads, depth=None):
+    '''Yield a tuple ``(name, fobj)`` for every name in the iterable *names*,
+    in the same order. The files are read ahead by *threads* threads, at most
+    *depth* at a time (default to :data:`READ_AHEAD` per thread). *fobj* is
+    `None` for the standard input and the archives, which are not read ahead.
+    '''
+    depth = depth or READ_AHEAD * threads
+    names = iter(names)
+    pending = collections.deque()
+    executor = concurrent.futures.ThreadPoolExecutor(threads)
+    try:
+        while True:
+            while len(pending) < depth:
+                name = next(names, None)
+                if name is None:
+                    break
+                pending.append((name, executor.submit(_read, name)))
+            if not pending:
+                return
+            name, future = pending.popleft()
+            yield name, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown()
+
+
+def run_pipeline(harvester, threads):
+    '''Analyze the files of *harvester*, reading them ahead with *threads*
+    threads, and yield the results as
+    :meth:`~radon.cli.harvest.Harvester.run` does.
+    '''
+    results = queue.Queue(QUEUE_SIZE)
+    stop = threading.Event()
+
+    def analyze():
+        '''Analyze the files read ahead and queue the results.'''
+        try:
+            files = prefetch(harvester._iter_filenames(), threads)
+            try:
+                for name, fobj in files:
+                    for result in harvester._analyze_file(name, fobj):
+                        results.put(result)
+                        if stop.is_set():
+                            return
+            finally:
+                files.close()
+        except BaseException as e:
+            results.put(_Failure(e))
+        finally:
+            results.put(_DONE)
+
+    thread = threading.Thread(target=analyze)
+    thread.daemon = True
+    thread.start()
+    item = None
+    try:
+        while True:
+            item = results.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        # Unblock the analysis thread, if it is still running
+        stop.set()
+        while item is not _DONE:
+            item = results.get()
+        thread.join()
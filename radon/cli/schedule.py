@@ -0,0 +1,232 @@
+'''This module implements the parallel analysis of the files by
+:meth:`~radon.cli.harvest.Harvester.run`.
+
+The files are analyzed by a pool of worker processes. A handful of large
+modules can take much longer than all the others, so the files are scheduled
+with the longest-processing-time-first rule: their size is read while they
+are discovered and the largest ones are dispatched first, instead of ending
+up at the tail of the run. The small files are grouped into batches, to cut
+the cost of sending the tasks to the workers and the results back. The
+results are reassembled and yielded in the order in which the files were
+discovered, as in a sequential run. They are sent back in the binary format
+of :mod:`radon.serialize`, which is much cheaper to transfer than the pickled
+result objects.
+
+The workers can also enforce a time and a memory budget on every file, so
+that a single pathological file cannot stall the whole run: a file that takes
+too long is abandoned with a ``{'error': 'timeout'}`` result, while one that
+needs too much memory gets ``{'error': 'out of memory'}``. The time budget
+relies on ``SIGALRM`` and the memory budget on ``RLIMIT_AS``, so they are
+only enforced on Unix.
+'''
+
+import concurrent.futures
+import io
+import os
+import signal
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+from radon.serialize import dump_record, read_record
+
+# The errors of the files that went over budget
+TIMEOUT_ERROR = 'timeout'
+MEMORY_ERROR = 'out of memory'
+
+# The files smaller than this size (in bytes) are grouped into batches of at
+# most this total size...
+BATCH_SIZE = 1 << 16
+# ...and of at most this number of files
+BATCH_FILES = 64
+
+# The harvester of the worker process and its time budget, set by the pool
+# initializer
+_harvester = None
+_timeout = 0
+
+
+class AnalysisTimeout(Exception):
+    '''Raised inside a worker when a file exceeds its time budget. Its
+    message is the error reported for the file.'''
+
+    def __init__(self):
+        super(AnalysisTimeout, self).__init__(TIMEOUT_ERROR)
+
+
+def _alarm(signum, frame):
+    '''Handle ``SIGALRM`` by interrupting the analysis.'''
+    raise AnalysisTimeout()
+
+
+def _init_worker(harvester, timeout=0, memory_limit=0):
+    '''Store the harvester sent to the worker process and set up the time
+    budget of every file (in seconds) and the memory limit of the process (in
+    MiB).
+    '''
+    global _harvester, _timeout
+    _harvester = harvester
+    if timeout and hasattr(signal, 'setitimer'):
+        _timeout = timeout
+        signal.signal(signal.SIGALRM, _alarm)
+    if memory_limit and resource is not None:
+        limit = memory_limit * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _analyze_file(name):
+    '''Analyze the file *name* inside a worker, within the budgets, and
+    return the tuple returned by
+    :meth:`~radon.cli.harvest.Harvester._analyze_entry`.
+    '''
+    if _timeout:
+        signal.setitimer(signal.ITIMER_REAL, _timeout)
+    try:
+        return _harvester._analyze_entry(name)
+    except AnalysisTimeout:
+        return None, [(name, {'error': TIMEOUT_ERROR})]
+    except MemoryError:
+        return None, [(name, {'error': MEMORY_ERROR})]
+    finally:
+        if _timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _dump_results(metric, results):
+    '''Encode the ``(name, result)`` tuples in *results* as the records of
+    :mod:`radon.serialize`. `None`, for the results to be read back from the
+    journal, is kept as it is.'''
+    if results is None:
+        return None
+    return b''.join(
+        dump_record(metric, name, result) for name, result in results
+    )
+
+
+def _load_results(harvester, data):
+    '''Decode the records written by :func:`_dump_results` into the results
+    returned by the ``gobble`` method of *harvester*.'''
+    if data is None:
+        return None
+    fobj = io.BytesIO(data)
+    results = []
+    while True:
+        record = read_record(fobj)
+        if record is None:
+            return results
+        _, name, result = record
+        results.append((name, harvester._from_record(result)))
+
+
+def _analyze_batch(batch):
+    '''Analyze every ``(index, name)`` pair of *batch* inside a worker and
+    return a tuple ``(done, state)``. *done* is a list of ``(index, (key,
+    data))`` pairs, *key* being the one returned by :func:`_analyze_file` and
+    *data* the results encoded by :func:`_dump_results`, while *state* is
+    returned by :meth:`~radon.cli.harvest.Harvester._worker_state`.
+    '''
+    done = []
+    for index, name in batch:
+        key, results = _analyze_file(name)
+        done.append((index, (key, _dump_results(_harvester.metric, results))))
+    return done, _harvester._worker_state()
+
+
+def file_size(name):
+    '''Return the size of the file *name*, or 0 if it cannot be read.'''
+    try:
+        return os.path.getsize(name)
+    except OSError:
+        return 0
+
+
+def schedule(files, batch_size=BATCH_SIZE, batch_files=BATCH_FILES):
+    '''Group the ``(index, name, size)`` tuples in *files* into batches of
+    ``(index, name)`` pairs, and return them in the order in which they
+    should be dispatched, the largest files first.
+
+    Every file of at least *batch_size* bytes is a batch on its own, while the
+    smaller files are grouped into batches of at most *batch_size* bytes and
+    *batch_files* files.
+    '''
+    batches = []
+    batch = []
+    size_left = batch_size
+    for index, name, size in sorted(files, key=lambda f: (-f[2], f[0])):
+        if size >= batch_size:
+            batches.append([(index, name)])
+            continue
+        if batch and (size > size_left or len(batch) >= batch_files):
+            batches.append(batch)
+            batch = []
+            size_left = batch_size
+        batch.append((index, name))
+        size_left -= size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def run_parallel(harvester, jobs, timeout=0, memory_limit=0):
+    '''Analyze the files of *harvester* with *jobs* worker processes and
+    yield the results as :meth:`~radon.cli.harvest.Harvester.run` does, in
+    the same order. *timeout* is the time budget of every file in seconds and
+    *memory_limit* the memory budget of every worker in MiB; 0 disables them.
+    The files that go over budget are added to the ``skipped`` list of the
+    harvester, together with their error.
+
+    The standard input cannot be shared with the workers, so it is analyzed
+    in the calling process, without budgets.
+    '''
+    files = []
+    local = []
+    names = {}
+    for index, name in enumerate(harvester._iter_filenames()):
+        names[index] = name
+        if name == '-':
+            local.append(index)
+        else:
+            files.append((index, name, file_size(name)))
+    done = {}
+    next_index = 0
+    total = len(names)
+    batches = schedule(files, BATCH_SIZE, BATCH_FILES)
+    if len(batches) < 2 and not (timeout or memory_limit):
+        local.extend(index for batch in batches for index, _ in batch)
+        futures = []
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            jobs,
+            initializer=_init_worker,
+            initargs=(harvester, timeout, memory_limit),
+        )
+        futures = [executor.submit(_analyze_batch, batch) for batch in batches]
+    try:
+        for index in local:
+            done[index] = harvester._analyze_entry(names[index])
+        completed = concurrent.futures.as_completed(futures)
+        while next_index < total:
+            while next_index in done:
+                key, results = done.pop(next_index)
+                path = names.pop(next_index)
+                for name, result in harvester._record(path, key, results):
+                    error = isinstance(result, dict) and result.get('error')
+                    if error in (TIMEOUT_ERROR, MEMORY_ERROR):
+                        harvester.skipped.append((name, error))
+                    yield name, result
+                next_index += 1
+            if next_index < total:
+                results, state = next(completed).result()
+                for index, (key, data) in results:
+                    done[index] = key, _load_results(harvester, data)
+                harvester._merge_worker_state(state)
+    finally:
+        if futures:
+            for future in futures:
+                future.cancel()
+            executor.shutdown()
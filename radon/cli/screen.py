@@ -0,0 +1,142 @@
+'''This module implements the pre-screen of the generated and minified
+modules, which runs before :meth:`~radon.cli.harvest.Harvester.gobble`.
+
+Protocol buffer stubs, the modules written by code generators and large
+tables of data can take a big share of the run, while nobody reads their
+metrics. They are recognized cheaply, without parsing them, from the first
+bytes of the file and from its size, with these rules:
+
+* one of the *markers*, like ``DO NOT EDIT`` or ``Generated by``, appears in
+  a comment among the first lines (the case is ignored);
+* the file is larger than *max_size* bytes;
+* the mean length of the lines at the start of the file is larger than
+  *line_length*, as in minified code and in serialized data.
+
+A module that looks generated is not analyzed: its result is an error
+starting with :data:`GENERATED_ERROR`, followed by the reason. The harvester
+leaves these results out, and in the ``report`` mode it lists the files in
+its summary of the skipped files.
+'''
+
+import io
+import os
+
+# The modes of the pre-screen
+SKIP = 'skip'
+REPORT = 'report'
+MODES = (SKIP, REPORT)
+
+# The prefix of the error of the modules that look generated
+GENERATED_ERROR = 'generated code'
+
+# The number of bytes read from the start of the file...
+PREFIX_SIZE = 4096
+# ...and the number of lines searched for the markers
+HEADER_LINES = 10
+
+MARKERS = (
+    'DO NOT EDIT',
+    'Generated by',
+    '@generated',
+    'automatically generated',
+    'auto-generated',
+    'autogenerated',
+)
+LINE_LENGTH = 200
+
+
+class Screen(object):
+    '''The rules recognizing the generated modules: the comma-separated list
+    of *markers* (the default ones if it is `None`), the maximum size in
+    bytes and the maximum mean line length. A rule is disabled when its value
+    is empty or 0.
+    '''
+
+    def __init__(self, markers=None, max_size=0, line_length=LINE_LENGTH):
+        if markers is None:
+            markers = MARKERS
+        elif not isinstance(markers, (list, tuple)):
+            markers = [m.strip() for m in markers.split(',') if m.strip()]
+        self.markers = [(marker, marker.lower()) for marker in markers]
+        self.max_size = max_size
+        self.line_length = line_length
+
+    @classmethod
+    def from_config(cls, config):
+        '''Return the screen set by the ``generated_*`` values of *config*,
+        or `None` if the ``generated`` mode is not set.'''
+        if not getattr(config, 'generated', None):
+            return None
+        return cls(
+            getattr(config, 'generated_markers', None),
+            getattr(config, 'generated_size', 0) * 1024,
+            getattr(config, 'generated_line_length', LINE_LENGTH),
+        )
+
+    def key(self):
+        '''Return the rules as a tuple, to be part of the content keys.'''
+        return (
+            ','.join(marker for marker, _ in self.markers),
+            self.max_size,
+            self.line_length,
+        )
+
+    def check(self, prefix, size):
+        '''Return the reason why a module looks generated, or `None` if it
+        does not. *prefix* holds the first bytes (or characters) of the
+        module and *size* its total size.
+        '''
+        if self.max_size and size > self.max_size:
+            return 'larger than {0} bytes'.format(self.max_size)
+        if isinstance(prefix, bytes):
+            # The markers are ASCII and the lengths are counted in bytes
+            prefix = prefix.decode('latin-1')
+        lines = prefix.splitlines()
+        if self.markers:
+            header = [
+                line.lower()
+                for line in lines[:HEADER_LINES]
+                if line.lstrip().startswith('#')
+            ]
+            for marker, lowered in self.markers:
+                if any(lowered in line for line in header):
+                    return 'marker {0!r}'.format(marker)
+        if self.line_length and lines:
+            mean = sum(len(line) for line in lines) / float(len(lines))
+            if mean > self.line_length:
+                return 'mean line length of {0:.0f}'.format(mean)
+        return None
+
+    def check_file(self, fobj):
+        '''Check the file object *fobj* as :meth:`check` does, reading at most
+        :data:`PREFIX_SIZE` characters. The files that cannot be rewound,
+        like the standard input, are not checked.
+        '''
+        data = getattr(fobj, 'data', None)
+        if data is None and hasattr(fobj, 'getvalue'):
+            data = fobj.getvalue()
+        if data is not None:
+            return self.check(data[:PREFIX_SIZE], len(data))
+        try:
+            if not fobj.seekable():
+                return None
+            size = os.fstat(fobj.fileno()).st_size
+            prefix = fobj.read(PREFIX_SIZE)
+            fobj.seek(0)
+        except (AttributeError, io.UnsupportedOperation):
+            return None
+        return self.check(prefix, size)
+
+
+def generated_error(reason):
+    '''Return the error of a module that looks generated for *reason*.'''
+    return '{0}: {1}'.format(GENERATED_ERROR, reason)
+
+
+def is_generated(result):
+    '''Return True if *result* is the one of a module that looks generated.
+    '''
+    if not isinstance(result, dict):
+        return False
+    error = result.get('error')
+    return isinstance(error, str) and error.startswith(GENERATED_ERROR + ':')
@@ -0,0 +1,227 @@
+'''This module holds the SQLite result store, which allows to keep the results
+of many runs in a single database and to query them later.
+
+Every run is recorded in the ``runs`` table, and every analyzed block or
+module is stored as one row in the table corresponding to its metric:
+
+    * ``cc``: one row per block (function, method or class);
+    * ``raw``: one row per module;
+    * ``mi``: one row per module;
+    * ``hal``: one row per module (with an empty *name*) and one row per
+      top-level function;
+    * ``errors``: one row per module that could not be analyzed.
+
+All the metric tables are indexed by ``(run_id, path, name)`` and by
+``(path, name)``, so that trend queries spanning several runs are index
+lookups.
+'''
+
+import sqlite3
+import time
+
+from radon.complexity import cc_rank
+from radon.visitors import Function
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    metric TEXT NOT NULL,
+    label TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_metric_created ON runs (metric, created);
+
+CREATE TABLE IF NOT EXISTS cc (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    lineno INTEGER NOT NULL,
+    endline INTEGER,
+    col_offset INTEGER NOT NULL,
+    complexity INTEGER NOT NULL,
+    rank TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cc_run_path_name ON cc (run_id, path, name);
+CREATE INDEX IF NOT EXISTS cc_path_name ON cc (path, name);
+
+CREATE TABLE IF NOT EXISTS raw (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    path TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    loc INTEGER NOT NULL,
+    lloc INTEGER NOT NULL,
+    sloc INTEGER NOT NULL,
+    comments INTEGER NOT NULL,
+    multi INTEGER NOT NULL,
+    blank INTEGER NOT NULL,
+    single_comments INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS raw_run_path_name ON raw (run_id, path, name);
+CREATE INDEX IF NOT EXISTS raw_path_name ON raw (path, name);
+
+CREATE TABLE IF NOT EXISTS mi (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    path TEXT NOT NULL,
+    name TEXT NOT NULL DEFAULT '',
+    mi REAL NOT NULL,
+    rank TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mi_run_path_name ON mi (run_id, path, name);
+CREATE INDEX IF NOT EXISTS mi_path_name ON mi (path, name);
+
+CREATE TABLE IF NOT EXISTS hal (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    h1 INTEGER NOT NULL,
+    h2 INTEGER NOT NULL,
+    N1 INTEGER NOT NULL,
+    N2 INTEGER NOT NULL,
+    vocabulary INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    calculated_length REAL NOT NULL,
+    volume REAL NOT NULL,
+    difficulty REAL NOT NULL,
+    effort REAL NOT NULL,
+    time REAL NOT NULL,
+    bugs REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hal_run_path_name ON hal (run_id, path, name);
+CREATE INDEX IF NOT EXISTS hal_path_name ON hal (path, name);
+
+CREATE TABLE IF NOT EXISTS errors (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    path TEXT NOT NULL,
+    error TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS errors_run_path ON errors (run_id, path);
+'''
+
+RAW_FIELDS = (
+    'loc',
+    'lloc',
+    'sloc',
+    'comments',
+    'multi',
+    'blank',
+    'single_comments',
+)
+
+
+def cc_rows(path, blocks):
+    '''Yield the rows of the ``cc`` table for the blocks of a module.'''
+    for block in blocks:
+        if isinstance(block, Function):
+            type_ = 'method' if block.is_method else 'function'
+        else:
+            type_ = 'class'
+        yield (
+            path,
+            block.fullname,
+            type_,
+            block.lineno,
+            block.endline,
+            block.col_offset,
+            block.complexity,
+            cc_rank(block.complexity),
+        )
+
+
+def raw_rows(path, module):
+    '''Yield the row of the ``raw`` table for a module.'''
+    yield (path, '') + tuple(module[field] for field in RAW_FIELDS)
+
+
+def mi_rows(path, result):
+    '''Yield the row of the ``mi`` table for a module.'''
+    yield (path, '', result['mi'], result['rank'])
+
+
+def hal_rows(path, halstead):
+    '''Yield the rows of the ``hal`` table for a module: the first one holds
+    the metrics for the whole module, the others are for its top-level
+    functions.
+    '''
+    yield (path, '') + tuple(halstead.total)
+    for name, report in halstead.functions:
+        yield (path, name) + tuple(report)
+
+
+class SQLiteStore(object):
+    '''A result store backed by a SQLite database.
+
+    Rows are not inserted one at a time: they are buffered and written in
+    batches of *batch_size* rows with ``executemany``, and a whole run is
+    committed in a single transaction.
+    '''
+
+    tables = {
+        'cc': cc_rows,
+        'raw': raw_rows,
+        'mi': mi_rows,
+        'hal': hal_rows,
+    }
+
+    def __init__(self, database, batch_size=1000):
+        '''Open (and if needed create) the database at *database*.'''
+        self.connection = sqlite3.connect(database)
+        self.connection.executescript(SCHEMA)
+        self.batch_size = batch_size
+        self._pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.connection.rollback()
+        self.close()
+
+    def start_run(self, metric, label=None):
+        '''Record a new run for the given metric and return its id.'''
+        cursor = self.connection.execute(
+            'INSERT INTO runs (created, metric, label) VALUES (?, ?, ?)',
+            (time.time(), metric, label),
+        )
+        return cursor.lastrowid
+
+    def add(self, run_id, metric, path, result):
+        '''Add the result of the analysis of a single module. *metric* is one
+        of ``cc``, ``raw``, ``mi`` and ``hal``.
+        '''
+        for row in self.tables[metric](path, result):
+            self._queue(metric, (run_id,) + row)
+
+    def add_error(self, run_id, path, error):
+        '''Record that the analysis of *path* failed with *error*.'''
+        self._queue('errors', (run_id, path, error))
+
+    def _queue(self, table, row):
+        '''Buffer a row, writing the whole batch when it is full.'''
+        batch = self._pending.setdefault(table, [])
+        batch.append(row)
+        if len(batch) >= self.batch_size:
+            self._flush(table)
+
+    def _flush(self, table):
+        '''Write all the buffered rows of a table.'''
+        batch = self._pending.pop(table, None)
+        if not batch:
+            return
+        placeholders = ', '.join('?' * len(batch[0]))
+        self.connection.executemany(
+            'INSERT INTO {0} VALUES ({1})'.format(table, placeholders), batch
+        )
+
+    def commit(self):
+        '''Write all the buffered rows and commit the transaction.'''
+        for table in list(self._pending):
+            self._flush(table)
+        self.connection.commit()
+
+    def close(self):
+        '''Close the underlying connection.'''
+        self.connection.close()
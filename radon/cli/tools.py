@@ -4,20 +4,28 @@ Attributes:
     environment variable RADONFILESENCODING
 '''
 
+import codecs
 import fnmatch
 import hashlib
+import io
 import json
 import locale
+import math
 import os
 import platform
 import re
 import sys
-import xml.etree.cElementTree as et
+import tarfile
+import zipfile
 from contextlib import contextmanager
+from json.encoder import encode_basestring_ascii as json_str
+from xml.sax.saxutils import escape as xml_escape
 
 from radon.cli.colors import (BRIGHT, LETTERS_COLORS, RANKS_COLORS, RESET,
                               TEMPLATE)
+from radon.cli.gitignore import GitIgnoreFilter
 from radon.complexity import cc_rank
+from radon.metrics import HalsteadReport
 from radon.visitors import Function
 
 try:
@@ -209,7 +217,17 @@ else:
                 raise
 
     else:
-        _open_function = open
+        # Files are read in bulk as bytes, and decoded only when needed
+        _encoding_forced = 'RADONFILESENCODING' in os.environ
+
+        def _open_function(filename, encoding=None):
+            '''Read the file as a :class:`SourceFile`. The encoding is
+            detected from its content, unless it is forced through the
+            environment.
+            '''
+            return SourceFile.from_path(
+                filename, encoding if _encoding_forced else None
+            )
 
     @contextmanager
     def _open(path):
@@ -223,6 +241,19 @@ else:
                 yield f
 
 
+def read_file(path):
+    '''Read the whole file at *path* and return a file object holding its
+    content, as the one returned by :func:`_open`, without keeping the file
+    open.
+    '''
+    with _open(path) as fobj:
+        if isinstance(fobj, SourceFile):
+            return fobj
+        content = io.StringIO(fobj.read())
+    content.name = path
+    return content
+
+
 def _is_python_file(filename):
     '''Check if a file is a Python source file.'''
     if (
@@ -241,13 +272,158 @@ def _is_python_file(filename):
     return False
 
 
-def iter_filenames(paths, exclude=None, ignore=None):
+ARCHIVE_EXTENSIONS = ('.whl', '.zip', '.tar.gz', '.tgz')
+ARCHIVE_SEPARATOR = '!'
+
+
+def _is_archive(filename):
+    '''Check if a file is an archive that can contain Python modules (a wheel,
+    a zip file or a gzipped tarball).
+    '''
+    return filename.endswith(ARCHIVE_EXTENSIONS)
+
+
+COOKIE_RE = re.compile(br'^[ \t\f]*#.*?coding[:=][ \t]*([-\w.]+)')
+BLANK_RE = re.compile(br'^[ \t\f]*(?:[#\r\n]|$)')
+
+
+def detect_source_encoding(data):
+    '''Return the encoding of the bytes of a Python module, looking for the
+    PEP 263 encoding cookie in the first two lines and for the UTF-8 BOM,
+    like :func:`tokenize.detect_encoding` does but without splitting the
+    buffer into lines. A :exc:`SyntaxError` is raised if the encoding is
+    unknown or if it conflicts with the BOM.
+    '''
+    bom = data.startswith(codecs.BOM_UTF8)
+    start = len(codecs.BOM_UTF8) if bom else 0
+    for _ in range(2):
+        end = data.find(b'\n', start)
+        line = data[start:] if end < 0 else data[start:end + 1]
+        match = COOKIE_RE.match(line)
+        if match:
+            name = match.group(1).decode('ascii')
+            try:
+                encoding = codecs.lookup(name).name
+            except LookupError:
+                raise SyntaxError('unknown encoding: ' + name)
+            if not bom:
+                return encoding
+            if encoding != 'utf-8':
+                raise SyntaxError('encoding problem: utf-8')
+            break
+        if end < 0 or not BLANK_RE.match(line):
+            break
+        start = end + 1
+    return 'utf-8-sig' if bom else 'utf-8'
+
+
+def decode_source(data):
+    '''Decode the bytes of a Python module, honoring the PEP 263 encoding
+    cookie and the UTF-8 BOM.
+    '''
+    return data.decode(detect_source_encoding(data))
+
+
+class SourceFile(object):
+    '''The content of a Python module, read from the disk in bulk as bytes.
+
+    It can be used in place of a text file object: :meth:`read` returns the
+    decoded text, with universal newlines. The harvesters which only need
+    the AST call :meth:`read_source` instead, which returns the bytes as
+    they are, so that :func:`ast.parse` detects the encoding itself and the
+    text is never decoded twice. If *encoding* is given, it is used instead
+    of the one detected from the content.
+    '''
+
+    def __init__(self, name, data, encoding=None):
+        self.name = name
+        self.data = data
+        self.encoding = encoding
+        self._text = None
+
+    @classmethod
+    def from_path(cls, path, encoding=None):
+        '''Read the whole file at *path* with a single unbuffered read.'''
+        with open(path, 'rb', buffering=0) as fobj:
+            return cls(path, fobj.readall(), encoding)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        '''Release the decoded text. The bytes are kept.'''
+        self._text = None
+
+    def read(self):
+        '''Return the decoded content of the file.'''
+        if self._text is None:
+            encoding = self.encoding or detect_source_encoding(self.data)
+            text = self.data.decode(encoding)
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            self._text = text
+        return self._text
+
+    def read_source(self):
+        '''Return the content of the file in the form best suited to
+        :func:`ast.parse`: the bytes, unless the encoding was forced.
+        '''
+        if self.encoding is not None:
+            return self.read()
+        return self.data
+
+
+def iter_archive(path, exclude=None):
+    '''Yield ``(name, fobj)`` tuples for every Python module inside the
+    archive at *path*, without extracting it to the disk. The name of a module
+    is ``{archive path}!{member name}``, while *fobj* is a
+    :class:`SourceFile` holding its content. The content is only decoded when
+    it is read, so that a module that cannot be decoded fails on its own,
+    without stopping the iteration. *exclude* is a list of glob patterns
+    matched against the names.
+
+    Tarballs are read sequentially, so that a compressed archive is
+    decompressed only once.
+    '''
+    exclude = exclude or []
+
+    def included(member):
+        '''Check if the member is a Python module and it is not excluded.'''
+        if not member.endswith('.py'):
+            return None
+        name = '{0}{1}{2}'.format(path, ARCHIVE_SEPARATOR, member)
+        if any(fnmatch.fnmatch(name, p) for p in exclude):
+            return None
+        return name
+
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                name = included(info.filename)
+                if name is not None:
+                    yield name, SourceFile(name, archive.read(info))
+        return
+    with tarfile.open(path, 'r|*') as archive:
+        for member in archive:
+            name = included(member.name)
+            if name is not None and member.isfile():
+                data = archive.extractfile(member).read()
+                yield name, SourceFile(name, data)
+
+
+def iter_filenames(paths, exclude=None, ignore=None, gitignore=False):
     '''A generator that yields all sub-paths of the ones specified in
     `paths`. Optional `exclude` filters can be passed as a comma-separated
     string of regexes, while `ignore` filters are a comma-separated list of
     directory names to ignore. Ignore patterns are can be plain names or glob
-    patterns. If paths contains only a single hyphen, stdin is implied,
-    returned as is.
+    patterns. If `gitignore` is True, the files and directories ignored by
+    Git are skipped as well (see :mod:`radon.cli.gitignore`). If paths
+    contains only a single hyphen, stdin is implied, returned as is. Archives
+    (see :func:`iter_archive`) are yielded as they are when they are given
+    explicitly.
     '''
     if set(paths) == set(('-',)):
         yield '-'
@@ -257,7 +433,7 @@ def iter_filenames(paths, exclude=None, ignore=None):
     for path in paths:
         if (
             os.path.isfile(path)
-            and _is_python_file(path)
+            and (_is_python_file(path) or _is_archive(path))
             and (
                 not exclude
                 or not any(fnmatch.fnmatch(path, p) for p in exclude)
@@ -265,16 +441,20 @@ def iter_filenames(paths, exclude=None, ignore=None):
         ):
             yield path
             continue
-        for filename in explore_directories(path, exclude, ignore):
+        for filename in explore_directories(path, exclude, ignore, gitignore):
             yield filename
 
 
-def explore_directories(start, exclude, ignore):
-    '''Explore files and directories under `start`. `explore` and `ignore`
-    arguments are the same as in :func:`iter_filenames`.
+def explore_directories(start, exclude, ignore, gitignore=False):
+    '''Explore files and directories under `start`. `explore`, `ignore` and
+    `gitignore` arguments are the same as in :func:`iter_filenames`. The
+    directories ignored by Git are pruned before they are explored.
     '''
+    gitignore_filter = GitIgnoreFilter(start) if gitignore else None
     for root, dirs, files in os.walk(start):
         dirs[:] = list(filter_out(dirs, ignore))
+        if gitignore_filter is not None:
+            dirs[:], files = gitignore_filter.filter(root, dirs, files)
         fullpaths = (os.path.normpath(os.path.join(root, p)) for p in files)
         for filename in filter_out(fullpaths, exclude):
             if not os.path.basename(filename).startswith(
@@ -283,6 +463,54 @@ def explore_directories(start, exclude, ignore):
                 yield filename
 
 
+def iter_file_list(fobj, chunk_size=1 << 16):
+    '''Yield the paths listed in the binary file object *fobj*, as soon as
+    they are read. The paths are separated by NUL characters or by newlines,
+    whichever comes first in the list; empty paths are skipped.
+    '''
+    read = getattr(fobj, 'read1', None) or fobj.read
+    sep = None
+    buf = b''
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        buf += chunk
+        if sep is None:
+            nul, newline = buf.find(b'\0'), buf.find(b'\n')
+            if nul == newline == -1:
+                continue
+            sep = b'\n' if nul == -1 or -1 < newline < nul else b'\0'
+        items = buf.split(sep)
+        buf = items.pop()
+        for item in items:
+            if sep == b'\n':
+                item = item.rstrip(b'\r')
+            if item:
+                yield os.fsdecode(item)
+    if sep != b'\0':
+        buf = buf.rstrip(b'\r')
+    if buf:
+        yield os.fsdecode(buf)
+
+
+def iter_listed_files(path, exclude=None):
+    '''Yield the files listed in the file *path*, or in the standard input if
+    it is ``-`` (see :func:`iter_file_list`), as they are read. They are not
+    explored nor checked, but `exclude` filters are applied as in
+    :func:`iter_filenames`.
+    '''
+    exclude = exclude.split(',') if exclude else []
+    if path == '-':
+        stdin = getattr(sys.stdin, 'buffer', sys.stdin)
+        for filename in filter_out(iter_file_list(stdin), exclude):
+            yield filename
+        return
+    with open(path, 'rb') as fobj:
+        for filename in filter_out(iter_file_list(fobj), exclude):
+            yield filename
+
+
 def filter_out(strings, patterns):
     '''Filter out any string that matches any of the specified patterns.'''
     for s in strings:
@@ -290,6 +518,12 @@ def filter_out(strings, patterns):
             yield s
 
 
+# The attributes of the blocks exported by cc_to_dict, in this order
+CC_ATTRS = tuple(
+    a for a in Function._fields if a not in ('is_method', 'closures')
+)
+
+
 def cc_to_dict(obj):
     '''Convert an object holding CC results into a dictionary. This is meant
     for JSON dumping.'''
@@ -304,8 +538,7 @@ def cc_to_dict(obj):
         'type': get_type(obj),
         'rank': cc_rank(obj.complexity),
     }
-    attrs = set(Function._fields) - set(('is_method', 'closures'))
-    for a in attrs:
+    for a in CC_ATTRS:
         v = getattr(obj, a, None)
         if v is not None:
             result[a] = v
@@ -326,55 +559,263 @@ def raw_to_dict(obj):
     return result
 
 
-def dict_to_xml(results):
-    '''Convert a dictionary holding CC analysis result into a string containing
-    xml.'''
-    ccm = et.Element('ccm')
-    for filename, blocks in results.items():
-        for block in blocks:
-            metric = et.SubElement(ccm, 'metric')
-            et.SubElement(metric, 'complexity').text = str(block['complexity'])
+def _json_number(value):
+    '''Encode a number as JSON, like :func:`json.dumps` does.'''
+    if isinstance(value, float) and math.isfinite(value):
+        return float.__repr__(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int.__repr__(value)
+    return json.dumps(value)
+
+
+def cc_to_json(block):
+    '''Encode a CC block directly as JSON. The text is exactly the one
+    returned by ``json.dumps(cc_to_dict(block))``, but the intermediate
+    dictionary is never built.
+    '''
+    if isinstance(block, Function):
+        kind = '"method"' if block.is_method else '"function"'
+        children = 'closures'
+    else:
+        kind = '"class"'
+        children = 'methods'
+    parts = [
+        '{"type": ',
+        kind,
+        ', "rank": "',
+        cc_rank(block.complexity),
+        '", "name": ',
+        json_str(block.name),
+        ', "lineno": ',
+        _json_number(block.lineno),
+        ', "col_offset": ',
+        _json_number(block.col_offset),
+        ', "endline": ',
+        _json_number(block.endline),
+    ]
+    classname = getattr(block, 'classname', None)
+    if classname is not None:
+        parts.append(', "classname": ')
+        parts.append(json_str(classname))
+    parts.append(', "complexity": ')
+    parts.append(_json_number(block.complexity))
+    parts.append(', "{0}": ['.format(children))
+    parts.append(', '.join(map(cc_to_json, getattr(block, children))))
+    parts.append(']}')
+    return ''.join(parts)
+
+
+# The keys of the fields of a HalsteadReport, encoded as JSON
+_HAL_KEYS = tuple(
+    json_str(field) + ': ' for field in HalsteadReport._fields
+)
+
+
+def hal_report_to_json(report):
+    '''Encode a :class:`~radon.metrics.HalsteadReport` directly as JSON,
+    exactly as ``json.dumps(report._asdict())``.'''
+    return '{' + ', '.join(
+        key + _json_number(value) for key, value in zip(_HAL_KEYS, report)
+    ) + '}'
+
+
+def hal_to_json(result):
+    '''Encode a :class:`~radon.metrics.Halstead` result directly as JSON, in
+    the same format exported by :class:`~radon.cli.harvest.HCHarvester`.'''
+    functions = ', '.join(
+        json_str(name) + ': ' + hal_report_to_json(report)
+        for name, report in result.functions
+    )
+    return '{{"total": {0}, "functions": {{{1}}}}}'.format(
+        hal_report_to_json(result.total), functions
+    )
 
-            unit = et.SubElement(metric, 'unit')
+
+def iter_json(members):
+    '''Yield a JSON object in chunks, one for every ``(key, text)`` pair in
+    *members*, *text* being the value already encoded as JSON. The text is
+    the same that :func:`json.dumps` would return for the object.
+    '''
+    separator = '{'
+    for key, text in members:
+        yield separator + json_str(key) + ': ' + text
+        separator = ', '
+    yield '{}' if separator == '{' else '}'
+
+
+XML_METRIC = (
+    '<metric><complexity>{complexity}</complexity><unit>{unit}</unit>'
+    '<classification>{classification}</classification><file>{file}</file>'
+    '<startLineNumber>{start}</startLineNumber>'
+    '<endLineNumber>{end}</endLineNumber></metric>'
+)
+
+
+def _xml_text(value):
+    '''Escape *value* as the text of an XML element, the way ElementTree
+    does when it serializes to ASCII.'''
+    text = xml_escape(str(value))
+    return text.encode('ascii', 'xmlcharrefreplace').decode('ascii')
+
+
+def iter_xml(results):
+    '''Convert an iterable of ``(filename, blocks)`` tuples holding CC
+    analysis results into XML, yielding a chunk of text for every file.
+
+    The elements are written as soon as the results of a file are available,
+    so the memory used does not depend on the number of files. The output is
+    identical to the one of :func:`dict_to_xml`.
+    '''
+    empty = True
+    for filename, blocks in results:
+        if isinstance(blocks, dict):
+            # Errors are not part of the schema
+            continue
+        chunk = []
+        for block in blocks:
             name = block['name']
             if 'classname' in block:
                 name = '{0}.{1}'.format(block['classname'], block['name'])
-            unit.text = name
-
-            et.SubElement(metric, 'classification').text = block['rank']
-            et.SubElement(metric, 'file').text = filename
-            et.SubElement(metric, 'startLineNumber').text = str(
-                block['lineno']
+            chunk.append(
+                XML_METRIC.format(
+                    complexity=_xml_text(block['complexity']),
+                    unit=_xml_text(name),
+                    classification=_xml_text(block['rank']),
+                    file=_xml_text(filename),
+                    start=_xml_text(block['lineno']),
+                    end=_xml_text(block['endline']),
+                )
             )
-            et.SubElement(metric, 'endLineNumber').text = str(block['endline'])
-    return et.tostring(ccm).decode('utf-8')
+        if not chunk:
+            continue
+        if empty:
+            chunk.insert(0, '<ccm>')
+            empty = False
+        yield ''.join(chunk)
+    yield '<ccm />' if empty else '</ccm>'
 
 
-def dict_to_md(results):
-    md_string = '''
-| Filename | Name | Type | Start:End Line | Complexity | Classification |
-| -------- | ---- | ---- | -------------- | ---------- | -------------- |
-'''
+def dict_to_xml(results):
+    '''Convert a dictionary holding CC analysis result into a string containing
+    xml.'''
+    return ''.join(iter_xml(results.items()))
+
+
+CC_MD_COLUMNS = (
+    'Filename',
+    'Name',
+    'Type',
+    'Start:End Line',
+    'Complexity',
+    'Classification',
+)
+RAW_MD_COLUMNS = (
+    'Filename',
+    'LOC',
+    'LLOC',
+    'SLOC',
+    'Comments',
+    'Single comments',
+    'Multi',
+    'Blank',
+)
+MI_MD_COLUMNS = ('Filename', 'MI', 'Rank')
+HAL_MD_COLUMNS = (
+    'Filename',
+    'Name',
+    'h1',
+    'h2',
+    'N1',
+    'N2',
+    'Vocabulary',
+    'Length',
+    'Calculated length',
+    'Volume',
+    'Difficulty',
+    'Effort',
+    'Time',
+    'Bugs',
+)
+
+
+def _md_row(cells):
+    '''Format a row of a Markdown table.'''
+    return '| ' + ' | '.join(str(cell) for cell in cells) + ' |\n'
+
+
+def iter_md(columns, rows):
+    '''Yield a Markdown table with the given *columns* in chunks: the
+    header comes first, followed by one chunk for every item of *rows*, which
+    is an iterable of lists of rows (one list for every file). Every row is a
+    sequence of cells.
+    '''
+    yield '\n' + _md_row(columns) + _md_row('-' * len(c) for c in columns)
+    for file_rows in rows:
+        chunk = ''.join(_md_row(row) for row in file_rows)
+        if chunk:
+            yield chunk
+
+
+def cc_to_md_rows(filename, blocks):
+    '''Return the Markdown rows of the CC *blocks* (as dictionaries) of
+    *filename*.'''
     type_letter_map = {'class': 'C',
                        'method': 'M',
                        'function': 'F'}
-    for filename, blocks in results.items():
-        for block in blocks:
-            raw_classname = block.get("classname")
-            raw_name = block.get("name")
-            name = "{}.{}".format(
-                raw_classname,
-                raw_name) if raw_classname else block["name"]
-            type = type_letter_map[block["type"]]
-            md_string += "| {} | {} | {} | {}:{} | {} | {} |\n".format(
-                filename,
-                name,
-                type,
-                block["lineno"],
-                block["endline"],
-                block["complexity"],
-                block["rank"])
-    return md_string
+    rows = []
+    for block in blocks:
+        raw_classname = block.get("classname")
+        raw_name = block.get("name")
+        name = "{}.{}".format(
+            raw_classname,
+            raw_name) if raw_classname else block["name"]
+        rows.append((
+            filename,
+            name,
+            type_letter_map[block["type"]],
+            "{}:{}".format(block["lineno"], block["endline"]),
+            block["complexity"],
+            block["rank"]))
+    return rows
+
+
+def raw_to_md_rows(filename, result):
+    '''Return the Markdown rows of the raw metrics (as a dictionary) of
+    *filename*.'''
+    keys = [c.lower().replace(' ', '_') for c in RAW_MD_COLUMNS[1:]]
+    return [[filename] + [result[key] for key in keys]]
+
+
+def mi_to_md_rows(filename, result):
+    '''Return the Markdown rows of the MI result (as a dictionary) of
+    *filename*.'''
+    return [(filename, '{0:.2f}'.format(result['mi']), result['rank'])]
+
+
+def hal_to_md_rows(filename, result, by_function=False):
+    '''Return the Markdown rows of the :class:`~radon.metrics.Halstead`
+    *result* of *filename*: one for the whole file, or one for every function
+    if *by_function* is True.'''
+    if by_function:
+        reports = result.functions
+    else:
+        reports = [('', result.total)]
+    return [(filename, name) + tuple(report) for name, report in reports]
+
+
+def dict_to_md(results):
+    '''Convert a dictionary holding CC analysis results into a Markdown
+    table.'''
+    return ''.join(
+        iter_md(
+            CC_MD_COLUMNS,
+            (
+                cc_to_md_rows(filename, blocks)
+                for filename, blocks in results.items()
+                if not isinstance(blocks, dict)
+            ),
+        )
+    )
 
 
 def dict_to_codeclimate_issues(results, threshold='B'):
@@ -382,67 +823,80 @@ def dict_to_codeclimate_issues(results, threshold='B'):
      issue json.'''
     codeclimate_issues = []
     content = get_content()
+    for path in results:
+        codeclimate_issues.extend(
+            file_to_codeclimate_issues(path, results[path], threshold, content)
+        )
+    return codeclimate_issues
+
+
+def file_to_codeclimate_issues(path, info, threshold='B', content=None):
+    '''Convert the CC analysis results of a single file into a list of Code
+    Climate issue json. *content* is the explanation returned by
+    :func:`get_content`: pass it when converting many files to compute it only
+    once.'''
+    codeclimate_issues = []
+    if content is None:
+        content = get_content()
     error_content = 'We encountered an error attempting to analyze this line.'
 
-    for path in results:
-        info = results[path]
-        if type(info) is dict and info.get('error'):
-            description = 'Error: {0}'.format(info.get('error', error_content))
-            beginline = re.search(r'\d+', description)
-            error_category = 'Bug Risk'
-
-            if beginline:
-                beginline = int(beginline.group())
-            else:
-                beginline = 1
-
-            endline = beginline
-            remediation_points = 1000000
-            fingerprint = get_fingerprint(path, ['error'])
-            codeclimate_issues.append(
-                format_cc_issue(
-                    path,
-                    description,
-                    error_content,
-                    error_category,
-                    beginline,
-                    endline,
-                    remediation_points,
-                    fingerprint,
-                )
-            )
+    if type(info) is dict and info.get('error'):
+        description = 'Error: {0}'.format(info.get('error', error_content))
+        beginline = re.search(r'\d+', description)
+        error_category = 'Bug Risk'
+
+        if beginline:
+            beginline = int(beginline.group())
         else:
-            for offender in info:
-                beginline = offender['lineno']
-                endline = offender['endline']
-                complexity = offender['complexity']
-                category = 'Complexity'
-                description = (
-                    'Cyclomatic complexity is too high in {0} {1}. '
-                    '({2})'.format(
-                        offender['type'], offender['name'], complexity
-                    )
-                )
-                remediation_points = get_remediation_points(
-                    complexity, threshold
-                )
-                fingerprint = get_fingerprint(
-                    path, [offender['type'], offender['name']]
+            beginline = 1
+
+        endline = beginline
+        remediation_points = 1000000
+        fingerprint = get_fingerprint(path, ['error'])
+        codeclimate_issues.append(
+            format_cc_issue(
+                path,
+                description,
+                error_content,
+                error_category,
+                beginline,
+                endline,
+                remediation_points,
+                fingerprint,
+            )
+        )
+    else:
+        for offender in info:
+            beginline = offender['lineno']
+            endline = offender['endline']
+            complexity = offender['complexity']
+            category = 'Complexity'
+            description = (
+                'Cyclomatic complexity is too high in {0} {1}. '
+                '({2})'.format(
+                    offender['type'], offender['name'], complexity
                 )
+            )
+            remediation_points = get_remediation_points(
+                complexity, threshold
+            )
+            fingerprint = get_fingerprint(
+                path, [offender['type'], offender['name']]
+            )
 
-                if remediation_points > 0:
-                    codeclimate_issues.append(
-                        format_cc_issue(
-                            path,
-                            description,
-                            content,
-                            category,
-                            beginline,
-                            endline,
-                            remediation_points,
-                            fingerprint,
-                        )
+            if remediation_points > 0:
+                codeclimate_issues.append(
+                    format_cc_issue(
+                        path,
+                        description,
+                        content,
+                        category,
+                        beginline,
+                        endline,
+                        remediation_points,
+                        fingerprint,
                     )
+                )
     return codeclimate_issues
 
 
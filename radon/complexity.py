@@ -6,10 +6,22 @@ import math
 
 from radon.visitors import GET_COMPLEXITY, ComplexityVisitor, code2ast
 
-# sorted_block ordering functions
-SCORE = lambda block: -GET_COMPLEXITY(block)
-LINES = lambda block: block.lineno
-ALPHA = lambda block: block.name
+
+# sorted_block ordering functions. They are not lambdas so that they can be
+# pickled along with the configuration of a Harvester.
+def SCORE(block):
+    '''Order blocks by complexity, in descending order.'''
+    return -GET_COMPLEXITY(block)
+
+
+def LINES(block):
+    '''Order blocks by line number.'''
+    return block.lineno
+
+
+def ALPHA(block):
+    '''Order blocks by name.'''
+    return block.name
 
 
 def cc_rank(cc):
@@ -1,21 +1,58 @@
+import ast
+
+from radon.cache import ResultCache, content_hash
 from radon.complexity import add_inner_blocks
+from radon.metrics import h_visit_ast, mi_comments, mi_compute
+from radon.raw import analyze
 from radon.visitors import ComplexityVisitor
 
 
+def _function_nodes(node):
+    '''Yield the function definitions analyzed separately by the
+    :class:`~radon.visitors.HalsteadVisitor`, in the same order. Nested
+    functions are not included.
+    '''
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            yield child
+        else:
+            for function in _function_nodes(child):
+                yield function
+
+
 class Flake8Checker(object):
-    '''Entry point for the Flake8 tool.'''
+    '''Entry point for the Flake8 tool.
+
+    Every metric is computed from the AST tree and the lines which Flake8
+    already has, so that the file is never read or parsed again.
+    '''
 
     name = 'radon'
     version = __import__('radon').__version__
     _code = 'R701'
     _error_tmpl = 'R701 %r is too complex (%d)'
+    _mi_tmpl = 'R702 maintainability index is too low (%.2f)'
+    _effort_tmpl = 'R703 %r has too high Halstead effort (%.2f)'
+    _sloc_tmpl = 'R704 too many source lines of code (%d)'
+    _lloc_tmpl = 'R705 too many logical lines of code (%d)'
     no_assert = False
     show_closures = False
     max_cc = -1
+    min_mi = -1
+    max_effort = -1
+    max_sloc = -1
+    max_lloc = -1
+    cache_dir = None
+    _cache = None
 
-    def __init__(self, tree, filename):
-        '''Accept the AST tree and a filename (unused).'''
+    def __init__(self, tree, filename, lines=None):
+        '''Accept the AST tree, a filename (unused) and the lines of the
+        file. Without the lines the MI and raw checks are skipped.
+        '''
         self.tree = tree
+        self.lines = lines
+        self._raw = None
+        self._halstead = None
 
     @classmethod
     def add_options(cls, option_manager):  # pragma: no cover
@@ -44,6 +81,45 @@ class Flake8Checker(object):
             help='Add closures/inner classes to the output',
             parse_from_config=True,
         )
+        option_manager.add_option(
+            '--radon-cache-dir',
+            default=None,
+            action='store',
+            help='Directory where Radon caches the complexity of the files',
+            parse_from_config=True,
+        )
+        option_manager.add_option(
+            '--radon-min-mi',
+            default=-1,
+            action='store',
+            type=float,
+            help='Radon Maintainability Index threshold',
+            parse_from_config=True,
+        )
+        option_manager.add_option(
+            '--radon-max-effort',
+            default=-1,
+            action='store',
+            type=float,
+            help='Radon Halstead effort threshold for functions',
+            parse_from_config=True,
+        )
+        option_manager.add_option(
+            '--radon-max-sloc',
+            default=-1,
+            action='store',
+            type=int,
+            help='Radon source lines of code threshold',
+            parse_from_config=True,
+        )
+        option_manager.add_option(
+            '--radon-max-lloc',
+            default=-1,
+            action='store',
+            type=int,
+            help='Radon logical lines of code threshold',
+            parse_from_config=True,
+        )
 
     @classmethod
     def parse_options(cls, options):  # pragma: no cover
@@ -51,18 +127,79 @@ class Flake8Checker(object):
         cls.max_cc = options.radon_max_cc
         cls.no_assert = options.no_assert
         cls.show_closures = options.show_closures
+        cls.cache_dir = options.radon_cache_dir
+        cls.min_mi = options.radon_min_mi
+        cls.max_effort = options.radon_max_effort
+        cls.max_sloc = options.radon_max_sloc
+        cls.max_lloc = options.radon_max_lloc
+
+    @classmethod
+    def cache(cls):
+        '''Return the cache of the complexity blocks, or `None` if it is
+        disabled. Every process opens its own handle on the same directory.
+        '''
+        if cls.cache_dir is None:
+            return None
+        if cls._cache is None or cls._cache.directory != cls.cache_dir:
+            cls._cache = ResultCache(cls.cache_dir)
+        return cls._cache
+
+    def complexity_blocks(self):
+        '''Return the blocks of the file, looking them up in the cache first
+        when the lines of the file are available.
+        '''
+        cache = self.cache()
+        if cache is None or self.lines is None:
+            return ComplexityVisitor.from_ast(
+                self.tree, no_assert=self.no_assert
+            ).blocks
+        key = content_hash(''.join(self.lines), 'cc', self.no_assert)
+        results = cache.get(key)
+        if results is not None:
+            return results['cc']
+        blocks = ComplexityVisitor.from_ast(
+            self.tree, no_assert=self.no_assert
+        ).blocks
+        try:
+            cache[key] = {'cc': blocks}
+        except (IOError, OSError):
+            # A read-only or full cache must not break the linting
+            pass
+        return blocks
+
+    @property
+    def raw(self):
+        '''The raw metrics of the file, computed only once.'''
+        if self._raw is None:
+            self._raw = analyze(''.join(self.lines))
+        return self._raw
+
+    @property
+    def halstead(self):
+        '''The Halstead metrics of the file, computed only once.'''
+        if self._halstead is None:
+            self._halstead = h_visit_ast(self.tree)
+        return self._halstead
 
     def run(self):
+        '''Run the enabled checks over the AST tree and the lines.'''
+        for check in (
+            self.check_cc,
+            self.check_mi,
+            self.check_effort,
+            self.check_raw,
+        ):
+            for error in check():
+                yield error
+
+    def check_cc(self):
         '''Run the ComplexityVisitor over the AST tree.'''
         if self.max_cc < 0:
             if not self.no_assert:
                 return
             self.max_cc = 10
-        visitor = ComplexityVisitor.from_ast(
-            self.tree, no_assert=self.no_assert
-        )
 
-        blocks = visitor.blocks
+        blocks = self.complexity_blocks()
         if self.show_closures:
             blocks = add_inner_blocks(blocks)
 
@@ -70,3 +207,35 @@ class Flake8Checker(object):
             if block.complexity > self.max_cc:
                 text = self._error_tmpl % (block.name, block.complexity)
                 yield block.lineno, block.col_offset, text, type(self)
+
+    def check_mi(self):
+        '''Compute the Maintainability Index of the whole file.'''
+        if self.min_mi < 0 or self.lines is None:
+            return
+        mi = mi_compute(
+            self.halstead.total.volume,
+            ComplexityVisitor.from_ast(self.tree).total_complexity,
+            self.raw.lloc,
+            mi_comments(self.raw),
+        )
+        if mi < self.min_mi:
+            yield 1, 0, self._mi_tmpl % mi, type(self)
+
+    def check_effort(self):
+        '''Check the Halstead effort of every function.'''
+        if self.max_effort < 0:
+            return
+        functions = zip(_function_nodes(self.tree), self.halstead.functions)
+        for node, (name, report) in functions:
+            if report.effort > self.max_effort:
+                text = self._effort_tmpl % (name, report.effort)
+                yield node.lineno, node.col_offset, text, type(self)
+
+    def check_raw(self):
+        '''Check the raw metrics of the whole file.'''
+        if self.lines is None:
+            return
+        if 0 <= self.max_sloc < self.raw.sloc:
+            yield 1, 0, self._sloc_tmpl % self.raw.sloc, type(self)
+        if 0 <= self.max_lloc < self.raw.lloc:
+            yield 1, 0, self._lloc_tmpl % self.raw.lloc, type(self)
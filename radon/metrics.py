@@ -68,8 +68,18 @@ def h_visit_ast(ast_node):
 
 def halstead_visitor_report(visitor):
     """Return a HalsteadReport from a HalsteadVisitor instance."""
-    h1, h2 = visitor.distinct_operators, visitor.distinct_operands
-    N1, N2 = visitor.operators, visitor.operands
+    return halstead_report(
+        visitor.distinct_operators,
+        visitor.distinct_operands,
+        visitor.operators,
+        visitor.operands,
+    )
+
+
+def halstead_report(h1, h2, N1, N2):
+    """Return a HalsteadReport from the number of distinct operators *h1* and
+    operands *h2*, and from the total number of operators *N1* and operands
+    *N2*."""
     h = h1 + h2
     N = N1 + N2
     if h1 and h2:
@@ -132,16 +142,23 @@ def mi_parameters(code, count_multi=True):
     '''
     ast_node = ast.parse(code)
     raw = analyze(code)
-    comments_lines = raw.comments + (raw.multi if count_multi else 0)
-    comments = comments_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
     return (
         h_visit_ast(ast_node).total.volume,
         ComplexityVisitor.from_ast(ast_node).total_complexity,
         raw.lloc,
-        comments,
+        mi_comments(raw, count_multi),
     )
 
 
+def mi_comments(raw, count_multi=True):
+    '''Return the percent of comment lines from the raw metrics *raw*, as
+    returned by :func:`~radon.raw.analyze`. If *count_multi* is True,
+    multiline strings are counted as comment lines as well.
+    '''
+    comments_lines = raw.comments + (raw.multi if count_multi else 0)
+    return comments_lines / float(raw.sloc) * 100 if raw.sloc != 0 else 0
+
+
 def mi_visit(code, multi):
     '''Visit the code and compute the Maintainability Index (MI) from it.'''
     return mi_compute(*mi_parameters(code, multi))
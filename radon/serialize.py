@@ -0,0 +1,346 @@
+'''This module implements a compact binary format for analysis results.
+
+It is much faster to write and to read than JSON, and it preserves the result
+objects: reading back a CC result gives :class:`~radon.visitors.Function` and
+:class:`~radon.visitors.Class` blocks, not dictionaries. It is used to store
+the entries of :class:`~radon.cache.ResultCache` and to move results between
+processes in :mod:`radon.batch`, and it can be used to exchange results
+between machines::
+
+    >>> from radon.serialize import ResultWriter, iter_results
+    >>> with open('results.bin', 'wb') as fobj:
+    ...     writer = ResultWriter(fobj)
+    ...     writer.write('cc', 'module.py', cc_visit(source))
+    >>> with open('results.bin', 'rb') as fobj:
+    ...     for metric, path, result in iter_results(fobj):
+    ...         print(metric, path, result)
+
+The layout of the data is the following. All the integers are little-endian.
+A *string* is an unsigned 32-bit length followed by that many bytes of UTF-8.
+A stream starts with the 4 bytes ``RDN1`` and is followed by any number of
+records. Every record starts with a header made of a 1-byte kind and the
+unsigned 32-bit size of the rest of the record, and the rest starts with the
+path as a string. The kinds are:
+
+* ``E``, an error: the 1-byte kind of the metric that failed and the error
+  message as a string;
+* ``C``, Cyclomatic Complexity: an unsigned 32-bit count of blocks, followed
+  by the blocks;
+* ``R``, raw metrics: the seven fields of :class:`~radon.raw.Module` as
+  unsigned 32-bit integers;
+* ``M``, Maintainability Index: a double;
+* ``H``, Halstead metrics: the report of the whole module, an unsigned 32-bit
+  count of functions and, for every function, its name as a string and its
+  report.
+
+A block starts with the 1-byte kind ``F`` (function) or ``C`` (class), the
+line number, the column offset, the end line and the complexity as signed
+32-bit integers (for classes, the complexity is the *real* complexity) and
+1 byte of flags: bit 0 is set for methods and bit 1 if a class name follows.
+Then come the name and, if present, the class name as strings. A function
+ends with an unsigned 32-bit count of closures followed by the closures; a
+class ends with the count of methods, the methods, the count of inner
+classes and the inner classes.
+
+A Halstead report is made of ``h1``, ``h2``, ``N1``, ``N2``, the vocabulary
+and the length as unsigned 32-bit integers, followed by the calculated
+length, the volume, the difficulty, the effort, the time and the bugs as
+doubles.
+'''
+
+import struct
+
+from radon.metrics import Halstead, HalsteadReport
+from radon.raw import Module
+from radon.visitors import Class, Function
+
+MAGIC = b'RDN1'
+
+KINDS = {'cc': b'C', 'raw': b'R', 'mi': b'M', 'hal': b'H'}
+METRICS = dict((kind, metric) for metric, kind in KINDS.items())
+ERROR = b'E'
+
+RECORD = struct.Struct('<cI')
+KIND = struct.Struct('c')
+BLOCK = struct.Struct('<ciiiiB')
+COUNT = struct.Struct('<I')
+RAW = struct.Struct('<7I')
+MI = struct.Struct('<d')
+REPORT = struct.Struct('<6I6d')
+
+IS_METHOD = 1
+HAS_CLASSNAME = 2
+
+
+class FormatError(ValueError):
+    '''Raised when the data is not in the expected format, or when it is
+    truncated.'''
+
+
+def _pack_str(parts, value):
+    data = value.encode('utf-8', 'surrogatepass')
+    parts.append(COUNT.pack(len(data)))
+    parts.append(data)
+
+
+def _pack_block(parts, block):
+    flags = 0
+    if isinstance(block, Function):
+        kind, complexity = b'F', block.complexity
+        if block.is_method:
+            flags |= IS_METHOD
+        if block.classname is not None:
+            flags |= HAS_CLASSNAME
+    else:
+        kind, complexity = b'C', block.real_complexity
+    parts.append(
+        BLOCK.pack(
+            kind,
+            block.lineno,
+            block.col_offset,
+            block.endline,
+            complexity,
+            flags,
+        )
+    )
+    _pack_str(parts, block.name)
+    if flags & HAS_CLASSNAME:
+        _pack_str(parts, block.classname)
+    if kind == b'F':
+        _pack_blocks(parts, block.closures)
+    else:
+        _pack_blocks(parts, block.methods)
+        _pack_blocks(parts, block.inner_classes)
+
+
+def _pack_blocks(parts, blocks):
+    parts.append(COUNT.pack(len(blocks)))
+    for block in blocks:
+        _pack_block(parts, block)
+
+
+def _pack_report(parts, report):
+    parts.append(REPORT.pack(*report))
+
+
+def _pack_result(parts, kind, result):
+    if kind == b'C':
+        _pack_blocks(parts, result)
+    elif kind == b'R':
+        if isinstance(result, dict):
+            result = Module(**result)
+        parts.append(RAW.pack(*result))
+    elif kind == b'M':
+        if isinstance(result, dict):
+            result = result['mi']
+        parts.append(MI.pack(result))
+    else:
+        _pack_report(parts, result.total)
+        parts.append(COUNT.pack(len(result.functions)))
+        for name, report in result.functions:
+            _pack_str(parts, name)
+            _pack_report(parts, report)
+
+
+def dump_record(metric, path, result):
+    '''Return the record holding the *result* of the analysis of *path* for
+    *metric* (one of ``cc``, ``raw``, ``mi`` and ``hal``), as bytes.
+
+    *result* is an object as returned by the analysis functions, or a
+    dictionary as built by the harvesters. If it is a dictionary with an
+    ``error`` key, an error record is returned instead.
+    '''
+    try:
+        kind = KINDS[metric]
+    except KeyError:
+        raise ValueError('unknown metric: {0}'.format(metric))
+    parts = []
+    _pack_str(parts, path)
+    if isinstance(result, dict) and 'error' in result:
+        record_kind = ERROR
+        parts.append(kind)
+        _pack_str(parts, result['error'])
+    else:
+        record_kind = kind
+        _pack_result(parts, kind, result)
+    body = b''.join(parts)
+    return RECORD.pack(record_kind, len(body)) + body
+
+
+class _Unpacker(object):
+    '''Read the values from a buffer holding the body of a record.'''
+
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def unpack(self, fmt):
+        try:
+            values = fmt.unpack_from(self.data, self.offset)
+        except struct.error:
+            raise FormatError('truncated record')
+        self.offset += fmt.size
+        return values
+
+    def count(self):
+        return self.unpack(COUNT)[0]
+
+    def string(self):
+        size = self.count()
+        end = self.offset + size
+        if end > len(self.data):
+            raise FormatError('truncated record')
+        value = bytes(self.data[self.offset:end])
+        self.offset = end
+        return value.decode('utf-8', 'surrogatepass')
+
+    def block(self):
+        kind, lineno, col_offset, endline, complexity, flags = self.unpack(
+            BLOCK
+        )
+        name = self.string()
+        classname = self.string() if flags & HAS_CLASSNAME else None
+        if kind == b'F':
+            return Function(
+                name,
+                lineno,
+                col_offset,
+                endline,
+                bool(flags & IS_METHOD),
+                classname,
+                self.blocks(),
+                complexity,
+            )
+        if kind != b'C':
+            raise FormatError('unknown block kind: {0!r}'.format(kind))
+        methods = self.blocks()
+        inner_classes = self.blocks()
+        return Class(
+            name,
+            lineno,
+            col_offset,
+            endline,
+            methods,
+            inner_classes,
+            complexity,
+        )
+
+    def blocks(self):
+        return [self.block() for _ in range(self.count())]
+
+    def report(self):
+        return HalsteadReport(*self.unpack(REPORT))
+
+    def result(self, kind):
+        if kind == b'C':
+            return self.blocks()
+        if kind == b'R':
+            return Module(*self.unpack(RAW))
+        if kind == b'M':
+            return self.unpack(MI)[0]
+        total = self.report()
+        functions = [
+            (self.string(), self.report()) for _ in range(self.count())
+        ]
+        return Halstead(total, functions)
+
+
+def load_record(kind, body):
+    '''Decode the *body* of a record of the given *kind* and return a tuple
+    ``(metric, path, result)``. Errors are returned as ``{'error': message}``
+    dictionaries.
+    '''
+    unpacker = _Unpacker(body)
+    path = unpacker.string()
+    if kind == ERROR:
+        kind = unpacker.unpack(KIND)[0]
+        error = True
+    else:
+        error = False
+    if kind not in METRICS:
+        raise FormatError('unknown record kind: {0!r}'.format(kind))
+    if error:
+        result = {'error': unpacker.string()}
+    else:
+        result = unpacker.result(kind)
+    return METRICS[kind], path, result
+
+
+def read_record(fobj):
+    '''Read the next record from the binary file object *fobj* and return it
+    as :func:`load_record` does. Return `None` at the end of the file and
+    raise :exc:`FormatError` if the record is truncated.
+    '''
+    header = fobj.read(RECORD.size)
+    if not header:
+        return None
+    if len(header) < RECORD.size:
+        raise FormatError('truncated record')
+    kind, size = RECORD.unpack(header)
+    body = fobj.read(size)
+    if len(body) < size:
+        raise FormatError('truncated record')
+    return load_record(kind, body)
+
+
+class ResultWriter(object):
+    '''Write results to the binary file object *fobj*. The magic bytes are
+    written when the writer is created, unless *header* is False.
+    '''
+
+    def __init__(self, fobj, header=True):
+        self.fobj = fobj
+        if header:
+            fobj.write(MAGIC)
+
+    def write(self, metric, path, result):
+        '''Write the *result* of the analysis of *path* for *metric*.'''
+        self.fobj.write(dump_record(metric, path, result))
+
+
+def read_header(fobj):
+    '''Read and check the magic bytes at the start of *fobj*.'''
+    if fobj.read(len(MAGIC)) != MAGIC:
+        raise FormatError('not a Radon binary stream')
+
+
+def iter_results(fobj):
+    '''Yield ``(metric, path, result)`` tuples from the binary file object
+    *fobj*, as written by :class:`ResultWriter`.
+    '''
+    read_header(fobj)
+    while True:
+        record = read_record(fobj)
+        if record is None:
+            return
+        yield record
+
+
+def dumps(results, path=''):
+    '''Encode a dictionary mapping every metric to its results, like the
+    ones returned by :func:`radon.batch.analyze_source`, into bytes.
+    '''
+    return MAGIC + b''.join(
+        dump_record(metric, path, result) for metric, result in results.items()
+    )
+
+
+def loads(data):
+    '''Decode the bytes returned by :func:`dumps`.'''
+    data = memoryview(data)
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise FormatError('not a Radon binary stream')
+    offset = len(MAGIC)
+    results = {}
+    while offset < len(data):
+        try:
+            kind, size = RECORD.unpack_from(data, offset)
+        except struct.error:
+            raise FormatError('truncated record')
+        offset += RECORD.size
+        if offset + size > len(data):
+            raise FormatError('truncated record')
+        metric, _, result = load_record(kind, data[offset:offset + size])
+        results[metric] = result
+        offset += size
+    return results
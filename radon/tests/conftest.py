@@ -3,12 +3,41 @@ import textwrap
 
 import pytest
 
+import radon.complexity as cc_mod
+from radon.cli import Config
+
 
 @pytest.fixture
 def log_mock(mocker):
     return mocker.patch('radon.cli.log_result')
 
 
+@pytest.fixture
+def make_config():
+    '''Return a function building a :class:`~radon.cli.Config` that holds
+    the values needed by all the harvesters, updated with its keyword
+    arguments.'''
+
+    def make(**kwargs):
+        values = dict(
+            exclude=None,
+            ignore=None,
+            include_ipynb=False,
+            ipynb_cells=False,
+            order=cc_mod.SCORE,
+            no_assert=False,
+            show_closures=False,
+            min='A',
+            max='F',
+            multi=True,
+            summary=False,
+        )
+        values.update(kwargs)
+        return Config(**values)
+
+    return make
+
+
 class RadonConfig(object):
     def __init__(self):
         self._fname = os.path.join(os.path.dirname(__file__), 'radon.cfg')
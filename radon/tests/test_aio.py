@@ -0,0 +1,109 @@
+import asyncio
+import concurrent.futures
+import os
+
+import pytest
+
+import radon.aio as aio
+from radon.cli.harvest import CCHarvester, MIHarvester
+from radon.cli import Config
+from radon.tests.test_cli_harvest import BASE_CONFIG, CC_CONFIG, MI_CONFIG
+
+SOURCE = 'def f(x):\n    return x if x else 0\n'
+DIRNAME = os.path.dirname(__file__)
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def analyzer():
+    executor = concurrent.futures.ThreadPoolExecutor(2)
+    yield aio.AsyncAnalyzer(executor, concurrency=2)
+    executor.shutdown()
+
+
+async def collect(agen):
+    return [item async for item in agen]
+
+
+def test_metrics(analyzer):
+    blocks = run(analyzer.cc(SOURCE))
+    assert blocks[0].complexity == 2
+    assert run(analyzer.raw(SOURCE)).loc == 2
+    assert run(analyzer.mi(SOURCE)) > 0
+    assert run(analyzer.hal(SOURCE)).total.h1 == 0
+
+
+def test_errors_are_raised(analyzer):
+    with pytest.raises(SyntaxError):
+        run(analyzer.cc('def (:'))
+
+
+def test_concurrency_limit(analyzer):
+    running = []
+
+    def slow(i):
+        running.append(i)
+        assert len(running) <= 2
+        concurrent.futures.wait([], timeout=0.01)
+        running.remove(i)
+        return i
+
+    async def main():
+        return await asyncio.gather(*[analyzer.run(slow, i) for i in range(6)])
+
+    assert run(main()) == list(range(6))
+
+
+def test_harvest(analyzer):
+    paths = [os.path.join(DIRNAME, 'data')]
+    results = run(collect(analyzer.harvest(paths, CC_CONFIG)))
+    expected = list(CCHarvester(paths, CC_CONFIG).run())
+    assert sorted(results) == sorted(expected)
+    assert len(results) == 3
+
+
+def test_harvest_generated(analyzer, tmpdir, make_config):
+    tmpdir.join('a_pb2.py').write('# Generated by protoc.  DO NOT EDIT!\n')
+    tmpdir.join('b.py').write(SOURCE)
+    config = make_config(generated='report')
+    results = run(collect(analyzer.harvest([str(tmpdir)], config)))
+    assert [name for name, _ in results] == [str(tmpdir.join('b.py'))]
+
+
+def test_harvest_cancel(analyzer):
+    paths = [os.path.join(DIRNAME, 'data')]
+    config = Config(**BASE_CONFIG.config_values)
+    config.config_values.update(MI_CONFIG.config_values)
+
+    async def main():
+        agen = analyzer.harvest(paths, config, MIHarvester)
+        first = await agen.__anext__()
+        await agen.aclose()
+        await asyncio.sleep(0)
+        current = asyncio.current_task()
+        others = [t for t in asyncio.all_tasks() if t is not current]
+        return first, others
+
+    (name, result), others = run(main())
+    assert name.startswith(paths[0])
+    assert 'mi' in result
+    assert all(task.done() for task in others)
+
+
+def test_default_analyzer_processes():
+    try:
+        assert run(aio.cc(SOURCE))[0].name == 'f'
+        # The default analyzer can be used from another event loop
+        assert run(aio.raw(SOURCE)).lloc == 2
+        paths = [os.path.join(DIRNAME, 'data', 'no_encoding.py')]
+        results = run(collect(aio.harvest(paths, CC_CONFIG)))
+        assert [name for name, _ in results] == paths
+    finally:
+        aio.default_analyzer().close()
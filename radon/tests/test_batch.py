@@ -0,0 +1,78 @@
+import pytest
+
+from radon.batch import BatchAnalyzer, analyze_many, analyze_source
+from radon.metrics import Halstead
+from radon.raw import Module
+
+SOURCES = [
+    ('a', 'def f(x):\n    return x if x else 0\n'),
+    ('b', 'def g(x):\n    assert x\n    return x\n'),
+    ('c', 'def (:\n'),
+]
+
+
+def test_analyze_source():
+    results = analyze_source(SOURCES[0][1])
+    assert sorted(results) == ['cc', 'hal', 'mi', 'raw']
+    assert results['cc'][0].complexity == 2
+    assert isinstance(results['raw'], Module)
+    assert isinstance(results['mi'], float)
+    assert isinstance(results['hal'], Halstead)
+
+
+def test_analyze_source_options():
+    assert analyze_source(SOURCES[1][1], ('cc',))['cc'][0].complexity == 2
+    results = analyze_source(SOURCES[1][1], ('cc',), no_assert=True)
+    assert list(results) == ['cc']
+    assert results['cc'][0].complexity == 1
+
+
+def test_analyze_source_error():
+    results = analyze_source(SOURCES[2][1], ('cc', 'mi'))
+    assert 'error' in results['cc']
+    assert 'error' in results['mi']
+
+
+def test_unknown_metric():
+    with pytest.raises(ValueError):
+        BatchAnalyzer(metrics=('cc', 'nope'))
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_analyze_many(workers):
+    results = dict(analyze_many(SOURCES, metrics=('cc',), workers=workers))
+    assert sorted(results) == ['a', 'b', 'c']
+    assert results['a']['cc'][0].name == 'f'
+    assert results['b']['cc'][0].name == 'g'
+    assert 'error' in results['c']['cc']
+
+
+@pytest.mark.parametrize('workers', [0, 2])
+def test_analyze_many_cache(workers, mocker):
+    cache = {}
+    with BatchAnalyzer(('raw',), workers=workers, cache=cache) as batch:
+        first = dict(batch.analyze_many(SOURCES))
+        assert len(cache) == 3
+        spy = mocker.patch('radon.batch.analyze_source')
+        batch._executor = mocker.Mock()
+        second = dict(batch.analyze_many(SOURCES + [('d', SOURCES[0][1])]))
+        assert not spy.called
+        assert not batch._executor.submit.called
+    assert second['d'] == second['a'] == first['a']
+
+
+def test_cache_key():
+    batch = BatchAnalyzer(('cc',), workers=0)
+    key = batch.cache_key(u'a = 1')
+    assert key == batch.cache_key(b'a = 1')
+    assert key != batch.cache_key(u'a = 2')
+    assert key != BatchAnalyzer(('cc',), no_assert=True).cache_key(u'a = 1')
+
+
+def test_pool_is_reused():
+    with BatchAnalyzer(('cc',), workers=1) as batch:
+        list(batch.analyze_many(SOURCES[:1]))
+        executor = batch.executor
+        list(batch.analyze_many(SOURCES[1:]))
+        assert batch.executor is executor
+    assert batch._executor is None
@@ -0,0 +1,279 @@
+import os
+import time
+
+import pytest
+
+import radon.cache as cache_mod
+from radon.cache import (
+    LOCK_NAME,
+    RACY_WINDOW,
+    PackedResultCache,
+    ResultCache,
+    StatIndex,
+    content_hash,
+    dump_index,
+    read_index,
+)
+from radon.complexity import cc_visit
+
+
+@pytest.fixture
+def cache(tmpdir):
+    return ResultCache(str(tmpdir.join('cache')))
+
+
+def test_content_hash():
+    key = content_hash(u'a = 1', 'cc', False)
+    assert key == content_hash(b'a = 1', 'cc', False)
+    assert key != content_hash(u'a = 2', 'cc', False)
+    assert key != content_hash(u'a = 1', 'cc', True)
+    assert len(key) == 40
+
+
+def test_get_set(cache):
+    key = content_hash(u'def f(): pass')
+    assert cache.get(key) is None
+    assert cache.get(key, 42) == 42
+    assert key not in cache
+    with pytest.raises(KeyError):
+        cache[key]
+
+    results = {'cc': cc_visit(u'def f(): pass'), 'mi': {'error': 'e'}}
+    cache[key] = results
+    assert key in cache
+    assert cache[key] == results
+    assert ResultCache(cache.directory).get(key) == results
+
+    cache[key] = {'cc': []}
+    assert cache[key] == {'cc': []}
+    # No temporary files are left behind
+    assert os.listdir(os.path.dirname(cache.path(key))) == [key[2:]]
+
+
+def test_corrupted_entry(cache):
+    key = content_hash(u'a = 1')
+    cache[key] = {'mi': 1.0}
+    with open(cache.path(key), 'wb') as fobj:
+        fobj.write(b'garbage')
+    assert cache.get(key) is None
+
+
+def test_failed_write(cache):
+    key = content_hash(u'a = 1')
+    with pytest.raises(ValueError):
+        cache[key] = {'unknown': 1}
+    assert os.listdir(os.path.dirname(cache.path(key))) == []
+    assert key not in cache
+
+
+@pytest.fixture
+def old_file(tmpdir):
+    path = tmpdir.join('a.py')
+    path.write('a = 1\n')
+    past = time.time() - 60
+    os.utime(str(path), (past, past))
+    return str(path)
+
+
+def test_stat_index(tmpdir, old_file):
+    path = str(tmpdir.join('index'))
+    index = StatIndex(path)
+    st = os.stat(old_file)
+    assert index.lookup(old_file, st) is None
+    index.update(old_file, st, 'digest')
+    assert index.lookup(old_file, st) == 'digest'
+    index.save()
+    assert StatIndex(path).lookup(old_file, st) == 'digest'
+
+    # Any change of the fingerprint invalidates the entry
+    with open(old_file, 'a') as fobj:
+        fobj.write('b = 2\n')
+    assert StatIndex(path).lookup(old_file, os.stat(old_file)) is None
+
+
+def test_stat_index_racy(tmpdir):
+    path = tmpdir.join('a.py')
+    path.write('a = 1\n')
+    st = os.stat(str(path))
+    index = StatIndex(str(tmpdir.join('index')))
+    index.update(str(path), st, 'digest')
+    assert index.lookup(str(path), st) is None
+
+    mtime, verified = index.entries[str(path)][2:4]
+    assert verified * 1e9 < mtime + RACY_WINDOW * 1e9
+
+
+def test_stat_index_verify_after(tmpdir, old_file, mocker):
+    index = StatIndex(str(tmpdir.join('index')), verify_after=3600)
+    st = os.stat(old_file)
+    index.update(old_file, st, 'digest')
+    assert index.lookup(old_file, st) == 'digest'
+    now = time.time()
+    mocker.patch('time.time', return_value=now + 7200)
+    assert index.lookup(old_file, st) is None
+
+
+def test_stat_index_merge(tmpdir, old_file):
+    path = str(tmpdir.join('index'))
+    st = os.stat(old_file)
+    first, second = StatIndex(path), StatIndex(path)
+    first.update(old_file, st, 'first')
+    second.update('b.py', st, 'second')
+    first.save()
+    second.save()
+    index = StatIndex(path)
+    assert index.lookup(old_file, st) == 'first'
+    assert index.lookup('b.py', st) == 'second'
+
+    worker = StatIndex(path)
+    worker.update(old_file, st, 'worker')
+    index.merge(worker.take_updates())
+    assert worker.updates == {}
+    assert index.lookup(old_file, st) == 'worker'
+
+
+def test_stat_index_corrupted(tmpdir):
+    entries = {'a.py': (1, 2, 3, 4.0, 'digest')}
+    assert read_index(dump_index(entries)) == entries
+    path = tmpdir.join('index')
+    path.write_binary(dump_index(entries)[:-3])
+    assert StatIndex(str(path)).entries == {}
+    path.write_binary(b'garbage')
+    assert StatIndex(str(path)).entries == {}
+
+
+def pack_names(directory):
+    return sorted(
+        name for name in os.listdir(directory) if name.startswith('pack-')
+    )
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_packed_get_set(tmpdir, compress):
+    directory = str(tmpdir.join('cache'))
+    cache = PackedResultCache(directory, compress=compress)
+    key = content_hash(u'def f(): pass')
+    assert cache.get(key) is None
+    assert key not in cache
+    with pytest.raises(KeyError):
+        cache[key]
+
+    results = {'cc': cc_visit(u'def f(): pass'), 'mi': {'error': 'e'}}
+    cache[key] = results
+    assert key in cache
+    assert cache[key] == results
+    # The other processes find the entries before the index is written
+    assert PackedResultCache(directory).get(key) == results
+    cache.close()
+    assert PackedResultCache(directory).get(key) == results
+
+    # A single pack and its index
+    names = pack_names(directory)
+    assert len(names) == 2
+    assert names[0].endswith('.idx') and names[1].endswith('.pack')
+    assert cache.get('not a key') is None
+    assert 'not a key' not in cache
+
+
+def test_packed_many_entries(tmpdir):
+    directory = str(tmpdir)
+    keys = [content_hash(str(i)) for i in range(200)]
+    with PackedResultCache(directory) as cache:
+        for i, key in enumerate(keys):
+            cache[key] = {'mi': float(i)}
+    cache = PackedResultCache(directory)
+    assert cache.packs[0].tail == {}
+    for i, key in enumerate(keys):
+        assert cache[key] == {'mi': float(i)}
+    assert content_hash('missing') not in cache
+
+
+def test_packed_torn_tail(tmpdir):
+    directory = str(tmpdir)
+    cache = PackedResultCache(directory)
+    first, second = content_hash(u'a'), content_hash(u'b')
+    cache[first] = {'mi': 1.0}
+    cache[second] = {'mi': 2.0}
+    path = os.path.join(directory, pack_names(directory)[0])
+    with open(path, 'r+b') as fobj:
+        fobj.truncate(os.path.getsize(path) - 3)
+    cache = PackedResultCache(directory)
+    assert cache.get(first) == {'mi': 1.0}
+    assert cache.get(second) is None
+
+
+def test_packed_compact(tmpdir, mocker):
+    mocker.patch.object(cache_mod, 'MAX_PACKS', 3)
+    directory = str(tmpdir)
+    keys = [content_hash(str(i)) for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        with PackedResultCache(directory) as cache:
+            cache[key] = {'mi': float(i)}
+            cache[keys[0]] = {'mi': 42.0}
+    reader = PackedResultCache(directory)
+    assert len(reader.packs) == 3
+
+    # One more pack triggers the compaction
+    with PackedResultCache(directory) as cache:
+        cache[keys[3]] = {'mi': 3.0}
+    assert len(pack_names(directory)) == 2
+    cache = PackedResultCache(directory)
+    assert cache[keys[0]] == {'mi': 42.0}
+    for i, key in enumerate(keys[1:], 1):
+        assert cache[key] == {'mi': float(i)}
+    # The packs opened before the compaction can still be read
+    assert reader[keys[2]] == {'mi': 2.0}
+
+    # Another process is compacting
+    tmpdir.join(LOCK_NAME).write('')
+    assert not cache.compact()
+    os.remove(str(tmpdir.join(LOCK_NAME)))
+    assert cache.compact()
+
+
+def test_packed_eviction(tmpdir):
+    directory = str(tmpdir)
+    keys = [content_hash(str(i)) for i in range(10)]
+    for i, key in enumerate(keys):
+        with PackedResultCache(directory) as cache:
+            cache[key] = {'cc': cc_visit('def f(x):\n    return x\n' * 5)}
+    size = sum(
+        os.path.getsize(os.path.join(directory, name))
+        for name in pack_names(directory)
+        if name.endswith('.pack')
+    )
+    cache = PackedResultCache(directory, max_size=size // 2)
+    assert cache.compact()
+    cache = PackedResultCache(directory)
+    assert len(cache.packs) == 1
+    assert keys[0] not in cache
+    assert keys[-1] in cache
+    assert cache.packs[0].size <= size // 2
+
+
+def test_packed_pickle(tmpdir):
+    import pickle
+
+    cache = PackedResultCache(str(tmpdir), compress=True)
+    cache[content_hash(u'a')] = {'mi': 1.0}
+    copy = pickle.loads(pickle.dumps(cache))
+    assert copy.compress
+    assert copy._fd is None
+    assert copy[content_hash(u'a')] == {'mi': 1.0}
+    cache.close()
+
+
+def test_packed_seal(tmpdir):
+    directory = str(tmpdir)
+    writer = PackedResultCache(directory)
+    assert writer.path is None
+    writer[content_hash(u'a')] = {'mi': 1.0}
+    writer.flush()
+    assert not PackedResultCache(directory).packs[0].sealed
+
+    cache = PackedResultCache(directory)
+    cache.seal(writer.path)
+    pack, = cache.packs
+    assert pack.sealed
+    assert pack.tail == {}
+    assert cache[content_hash(u'a')] == {'mi': 1.0}
@@ -1,3 +1,4 @@
+import io
 import os
 import sys
 from configparser import ConfigParser
@@ -107,6 +108,23 @@ def test_cc(mocker, log_mock):
             show_closures=False,
             include_ipynb=False,
             ipynb_cells=False,
+            jobs=1,
+            timeout=0.0,
+            memory_limit=0,
+            journal=None,
+            resume=False,
+            prefetch=0,
+            dedup=False,
+            cache_dir=None,
+            cache_verify=0.0,
+            cache_compress=False,
+            cache_max_size=0,
+            files_from=None,
+            gitignore=False,
+            generated=None,
+            generated_markers=None,
+            generated_size=0,
+            generated_line_length=200,
         ),
     )
     log_mock.assert_called_once_with(
@@ -115,7 +133,12 @@ def test_cc(mocker, log_mock):
         json=True,
         stream=sys.stdout,
         xml=False,
-        md=False
+        md=False,
+        binary=False,
+        sqlite=None,
+        baseline=None,
+        baseline_threshold=0.0,
+        new_threshold=None,
     )
 
 
@@ -133,10 +156,35 @@ def test_raw(mocker, log_mock):
             summary=True,
             include_ipynb=False,
             ipynb_cells=False,
+            jobs=1,
+            timeout=0.0,
+            memory_limit=0,
+            journal=None,
+            resume=False,
+            prefetch=0,
+            dedup=False,
+            cache_dir=None,
+            cache_verify=0.0,
+            cache_compress=False,
+            cache_max_size=0,
+            files_from=None,
+            gitignore=False,
+            generated=None,
+            generated_markers=None,
+            generated_size=0,
+            generated_line_length=200,
         ),
     )
     log_mock.assert_called_once_with(
-        mocker.sentinel.harvester, stream=sys.stdout, json=True
+        mocker.sentinel.harvester,
+        stream=sys.stdout,
+        json=True,
+        md=False,
+        binary=False,
+        sqlite=None,
+        baseline=None,
+        baseline_threshold=0.0,
+        new_threshold=None,
     )
 
 
@@ -158,13 +206,67 @@ def test_mi(mocker, log_mock):
             sort=False,
             include_ipynb=False,
             ipynb_cells=False,
+            jobs=1,
+            timeout=0.0,
+            memory_limit=0,
+            journal=None,
+            resume=False,
+            prefetch=0,
+            dedup=False,
+            cache_dir=None,
+            cache_verify=0.0,
+            cache_compress=False,
+            cache_max_size=0,
+            files_from=None,
+            gitignore=False,
+            generated=None,
+            generated_markers=None,
+            generated_size=0,
+            generated_line_length=200,
         ),
     )
     log_mock.assert_called_once_with(
-        mocker.sentinel.harvester, stream=sys.stdout, json=False
+        mocker.sentinel.harvester,
+        stream=sys.stdout,
+        json=False,
+        md=False,
+        binary=False,
+        sqlite=None,
+        baseline=None,
+        baseline_threshold=0.0,
+        new_threshold=None,
     )
 
 
+def test_check_paths(mocker, log_mock, tmpdir):
+    harv_mock = mocker.patch('radon.cli.CCHarvester')
+    with pytest.raises(SystemExit):
+        cli.cc([])
+    with pytest.raises(SystemExit):
+        cli.cc(['-'], files_from='-')
+    assert harv_mock.call_count == 0
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli.cc([], files_from=str(tmpdir.join('missing.txt')))
+    assert 'cannot read the list of the files' in str(excinfo.value.code)
+    assert harv_mock.call_count == 0
+
+    files = str(tmpdir.join('files.txt'))
+    tmpdir.join('files.txt').write('a.py\n')
+    cli.cc([], files_from=files)
+    assert harv_mock.call_args[0][1].files_from == files
+
+
+def test_check_generated(mocker, log_mock):
+    harv_mock = mocker.patch('radon.cli.CCHarvester')
+    with pytest.raises(SystemExit):
+        cli.cc(['.'], generated='hide')
+    assert harv_mock.call_count == 0
+
+    cli.cc(['.'], generated='report')
+    assert harv_mock.call_args[0][1].generated == 'report'
+
+
 def test_encoding(mocker, log_mock):
     mi_cfg = cli.Config(**BASE_CONFIG.config_values)
     mi_cfg.config_values.update(MI_CONFIG.config_values)
@@ -243,8 +345,8 @@ def test_log_result(mocker, stdout_mock):
 
     h = mocker.Mock(spec=Harvester)
     h.as_json.return_value = mocker.sentinel.json
-    h.as_xml.return_value = mocker.sentinel.xml
-    h.as_md.return_value = mocker.sentinel.md
+    h.iter_xml.return_value = mocker.sentinel.xml
+    h.iter_md.return_value = mocker.sentinel.md
     h.to_terminal.side_effect = fake_to_terminal
 
     cli.log_result(h, json=True)
@@ -253,14 +355,22 @@ def test_log_result(mocker, stdout_mock):
     h.as_json.reset_mock()
     cli.log_result(h, json=True, xml=True, md=True)
     h.as_json.assert_called_once_with()
-    assert h.as_xml.call_count == 0
-    assert h.as_md.call_count == 0
+    assert h.iter_xml.call_count == 0
+    assert h.iter_md.call_count == 0
 
     cli.log_result(h, xml=True)
-    h.as_xml.assert_called_once_with()
+    h.iter_xml.assert_called_once_with()
 
     cli.log_result(h, md=True)
-    h.as_md.assert_called_once_with()
+    h.iter_md.assert_called_once_with()
+
+    cli.log_result(h, sqlite='radon.db')
+    h.to_sqlite.assert_called_once_with('radon.db')
+
+    # The binary results go to the buffer under the text stream
+    stream = io.TextIOWrapper(io.BytesIO())
+    cli.log_result(h, binary=True, stream=stream)
+    h.to_binary.assert_called_once_with(stream.buffer)
 
     cli.log_result(h)
     h.to_terminal.assert_called_once_with()
@@ -271,12 +381,43 @@ def test_log_result(mocker, stdout_mock):
             mocker.call(
                 mocker.sentinel.json, json=True, noformat=True, xml=True, md=True
             ),
-            mocker.call(mocker.sentinel.xml, noformat=True, xml=True),
-            mocker.call(mocker.sentinel.md, noformat=True, md=True),
-            mocker.call('a', error=True),
+            mocker.call('', noformat=True, xml=True),
+            mocker.call('', noformat=True, md=True),
         ]
     )
-    le_mock.assert_called_once_with('mystr', indent=1)
+    assert le_mock.call_count == 0
     ll_mock.assert_has_calls(
-        [mocker.call(['b']), mocker.call(('p1', 'p2'), indent=1)]
+        [
+            mocker.call(
+                mocker.sentinel.xml, delimiter='', noformat=True, xml=True
+            ),
+            mocker.call(
+                mocker.sentinel.md, delimiter='', noformat=True, md=True
+            ),
+        ]
+    )
+    # The terminal lines are written all at once
+    stdout_mock.assert_called_once_with(
+        'a\n    {0}{1}ERROR{2}: mystr\nb\n    p1\n    p2\n'.format(
+            cli.BRIGHT, cli.RED, cli.RESET
+        )
+    )
+
+
+def test_log_result_codeclimate(mocker):
+    stream = mocker.Mock()
+    h = mocker.Mock(spec=Harvester)
+    h.iter_codeclimate_issues.return_value = iter([['a', 'b'], [], ['c']])
+
+    cli.log_result(h, codeclimate=True, stream=stream)
+
+    stream.assert_has_calls(
+        [
+            mocker.call.write('a\0'),
+            mocker.call.write('b\0'),
+            mocker.call.flush(),
+            mocker.call.flush(),
+            mocker.call.write('c\0'),
+            mocker.call.flush(),
+        ]
     )
@@ -0,0 +1,239 @@
+import io
+import json
+
+import pytest
+
+import radon.cli as cli
+from radon.cli.baseline import (
+    Baseline,
+    Regression,
+    format_regression,
+    is_failure,
+)
+from radon.cli.colors import RED, RESET
+from radon.cli import Config
+from radon.cli.harvest import CCHarvester, HCHarvester
+from radon.complexity import cc_visit
+from radon.metrics import h_visit
+from radon.tests.test_cli_harvest import BASE_CONFIG, CC_CONFIG
+
+OLD = '''
+def f(a):
+    if a:
+        return 1
+    return 2
+
+class A:
+    def m(self):
+        pass
+'''
+NEW = '''
+def f(a):
+    if a and a > 1:
+        return 1
+    return 2 if a else 3
+
+class A:
+    def m(self):
+        pass
+
+def g(x):
+    return x or 1
+'''
+
+
+def harvester(cls, results, config=CC_CONFIG):
+    h = cls([], config)
+    h._results = results
+    return h
+
+
+def load(cls, metric, results):
+    fobj = io.StringIO(harvester(cls, results).as_json())
+    return Baseline.load(metric, fobj)
+
+
+def test_unknown_metric():
+    with pytest.raises(ValueError):
+        Baseline('foo')
+
+
+def test_cc():
+    baseline = load(
+        CCHarvester, 'cc', [('a.py', cc_visit(OLD)), ('b.py', {'error': 'e'})]
+    )
+    assert baseline.index == {
+        ('a.py', 'f'): 2,
+        ('a.py', 'A'): 2,
+        ('a.py', 'A.m'): 1,
+    }
+    assert baseline.errors == set(['b.py'])
+    regressions = list(
+        baseline.compare(
+            [
+                ('a.py', cc_visit(NEW)),
+                ('b.py', {'error': 'e'}),
+                ('c.py', {'error': 'invalid syntax'}),
+            ]
+        )
+    )
+    assert regressions == [
+        Regression('a.py', 'f', 2, 4, 2),
+        Regression('a.py', 'g', None, 2, None),
+        Regression('c.py', None, None, None, None, 'invalid syntax'),
+    ]
+
+
+def test_mi():
+    baseline = Baseline('mi', {('a.py', ''): 70.0, ('b.py', ''): 50.0})
+    results = [
+        ('a.py', {'mi': 60.0, 'rank': 'A'}),
+        ('b.py', {'mi': 55.0, 'rank': 'A'}),
+    ]
+    assert list(baseline.compare(results)) == [
+        Regression('a.py', '', 70.0, 60.0, 10.0)
+    ]
+
+
+def test_hal():
+    config = Config(by_function=False, **BASE_CONFIG.config_values)
+    h = harvester(HCHarvester, [('a.py', h_visit(OLD))], config)
+    baseline = Baseline.load('hal', io.StringIO(h.as_json()))
+    names = [r.name for r in baseline.compare([('a.py', h_visit(NEW))])]
+    assert names == ['', 'f', 'g']
+
+
+def test_duplicates_keep_worst():
+    baseline = Baseline('cc')
+    baseline.add('a.py', [('f', 3), ('f', 5), ('f', 4)])
+    assert baseline.index == {('a.py', 'f'): 5}
+
+
+def test_to_terminal():
+    baseline = Baseline('cc')
+    regressions = [
+        Regression('a.py', 'f', 2, 4, 2),
+        Regression('a.py', 'g', None, 1, None),
+        Regression('b.py', 'h', 1, 2, 1),
+    ]
+    assert list(baseline.to_terminal(regressions, 1)) == [
+        ('a.py', (), {}),
+        (RED + 'f: complexity 2 -> 4 (+2)' + RESET, (), {'indent': 1}),
+        ('g: complexity 1 (new)', (), {'indent': 1}),
+        ('b.py', (), {}),
+        ('h: complexity 1 -> 2 (+1)', (), {'indent': 1}),
+        ('\n{0} regressions above the thresholds', (1,), {}),
+    ]
+    assert format_regression(
+        Regression('a.py', '', 70.0, 60.5, 9.5), 'mi'
+    ) == 'mi 70.00 -> 60.50 (+9.50)'
+    assert format_regression(
+        Regression('a.py', None, None, None, None, 'invalid syntax'), 'mi'
+    ) == 'error: invalid syntax'
+
+
+def test_log_result_baseline(tmpdir):
+    path = str(tmpdir.join('baseline.json'))
+    with open(path, 'w') as fobj:
+        fobj.write(harvester(CCHarvester, [('a.py', cc_visit(OLD))]).as_json())
+
+    stream = io.StringIO()
+    h = harvester(CCHarvester, [('a.py', cc_visit(NEW))])
+    cli.log_result(
+        h, baseline=path, baseline_threshold=2, json=True, stream=stream
+    )
+    assert json.loads(stream.getvalue()) == [
+        {
+            'path': 'a.py',
+            'name': 'f',
+            'baseline': 2,
+            'value': 4,
+            'delta': 2,
+            'error': None,
+        },
+        {
+            'path': 'a.py',
+            'name': 'g',
+            'baseline': None,
+            'value': 2,
+            'delta': None,
+            'error': None,
+        },
+    ]
+
+    stream = io.StringIO()
+    with pytest.raises(SystemExit) as excinfo:
+        cli.log_result(h, baseline=path, stream=stream)
+    assert excinfo.value.code == 1
+    assert 'f: complexity 2 -> 4 (+2)' in stream.getvalue()
+
+
+@pytest.mark.parametrize(
+    'metric,value,new_threshold,failed',
+    [
+        ('cc', 12, None, False),
+        ('cc', 12, 10, True),
+        ('cc', 10, 10, False),
+        ('mi', 60.0, None, False),
+        ('mi', 60.0, 65, True),
+        ('mi', 70.0, 65, False),
+    ],
+)
+def test_is_failure_new(metric, value, new_threshold, failed):
+    # New blocks are judged on their own value
+    regression = Regression('a.py', 'g', None, value, None)
+    assert is_failure(regression, 0, new_threshold, metric) is failed
+
+
+def test_is_failure_worse():
+    # Worse blocks are judged on the difference, whatever new_threshold is
+    regression = Regression('a.py', 'f', 2, 4, 2)
+    assert is_failure(regression, 1, 100)
+    assert not is_failure(regression, 2, 1)
+
+
+def test_log_result_baseline_new(tmpdir):
+    path = str(tmpdir.join('baseline.json'))
+    with open(path, 'w') as fobj:
+        fobj.write(harvester(CCHarvester, []).as_json())
+
+    # With only new blocks, the run fails only with --new-threshold
+    h = harvester(CCHarvester, [('a.py', cc_visit(NEW))])
+    stream = io.StringIO()
+    cli.log_result(h, baseline=path, stream=stream)
+    assert 'f: complexity 4 (new)' in stream.getvalue()
+
+    stream = io.StringIO()
+    with pytest.raises(SystemExit) as excinfo:
+        cli.log_result(h, baseline=path, new_threshold=3, stream=stream)
+    assert excinfo.value.code == 1
+    assert RED + 'f: complexity 4 (new)' + RESET in stream.getvalue()
+    assert '1 regressions above the thresholds' in stream.getvalue()
+
+
+def test_log_result_baseline_error(tmpdir):
+    path = str(tmpdir.join('baseline.json'))
+    with open(path, 'w') as fobj:
+        fobj.write(harvester(CCHarvester, [('a.py', cc_visit(OLD))]).as_json())
+
+    # A file that cannot be analyzed any more fails, whatever the threshold
+    stream = io.StringIO()
+    h = harvester(CCHarvester, [('a.py', {'error': 'invalid syntax'})])
+    with pytest.raises(SystemExit) as excinfo:
+        cli.log_result(h, baseline=path, baseline_threshold=100, stream=stream)
+    assert excinfo.value.code == 1
+    assert 'error: invalid syntax' in stream.getvalue()
+    assert '1 regressions above the thresholds' in stream.getvalue()
+
+
+@pytest.mark.parametrize(
+    'content', [None, '', '[1, 2]', '{"a.py": {"mi": 60.0}}']
+)
+def test_log_result_invalid_baseline(tmpdir, content):
+    path = tmpdir.join('baseline.json')
+    if content is not None:
+        path.write(content)
+    h = harvester(CCHarvester, [('a.py', cc_visit(OLD))])
+    with pytest.raises(SystemExit) as excinfo:
+        cli.log_result(h, baseline=str(path), stream=io.StringIO())
+    assert 'cannot load the baseline' in str(excinfo.value.code)
@@ -0,0 +1,166 @@
+import os
+import re
+
+import pytest
+
+from radon.cli.gitignore import (
+    GitIgnore,
+    GitIgnoreFilter,
+    find_repository,
+    parse,
+    translate,
+)
+from radon.cli.tools import iter_filenames
+
+
+TRANSLATE_CASES = [
+    ('build', ['build', 'a/build', 'a/b/build'], ['builds', 'a/xbuild']),
+    ('/build', ['build'], ['a/build']),
+    ('doc/*.txt', ['doc/a.txt'], ['doc/x/a.txt', 'a/doc/a.txt']),
+    ('*.py[co]', ['x.pyc', 'a/x.pyo'], ['x.py', 'x.pyd']),
+    ('[!a]b', ['xb'], ['ab']),
+    ('f?o', ['foo'], ['f/o', 'fo']),
+    ('**/foo', ['foo', 'a/foo', 'a/b/foo'], ['xfoo']),
+    ('a/**/b', ['a/b', 'a/x/b', 'a/x/y/b'], ['b', 'a/xb']),
+    ('a/**', ['a/x', 'a/x/y'], ['a']),
+    ('a**b', ['ab', 'axxb'], ['a/b']),
+    ('[[]x', ['[x'], ['x']),
+    ('x[', ['x['], ['x']),
+    ('\\*', ['*'], ['x']),
+]
+
+
+@pytest.mark.parametrize('pattern,matched,unmatched', TRANSLATE_CASES)
+def test_translate(pattern, matched, unmatched):
+    regex = re.compile(translate(pattern), re.DOTALL)
+    for path in matched:
+        assert regex.match(path), path
+    for path in unmatched:
+        assert not regex.match(path), path
+
+
+def test_parse():
+    lines = [
+        '# comment\n',
+        '\n',
+        'a  \n',
+        'b\\ \r\n',
+        '!c/\n',
+        '\\!d\n',
+        '\\#e\n',
+        '/\n',
+    ]
+    rules = [(regex.pattern, negated, dir_only)
+             for regex, negated, dir_only in parse(lines)]
+    assert rules == [
+        (translate('a'), False, False),
+        (translate('b\\ '), False, False),
+        (translate('c'), True, True),
+        (translate('\\!d'), False, False),
+        (translate('\\#e'), False, False),
+    ]
+
+
+def test_gitignore_match(tmpdir):
+    base = str(tmpdir)
+    gitignore = GitIgnore(base, parse(['*.py\n', '!keep.py\n', 'out/\n']))
+    assert gitignore.match(os.path.join(base, 'a', 'm.py'), False)
+    assert gitignore.match(os.path.join(base, 'keep.py'), False) is False
+    assert gitignore.match(os.path.join(base, 'out'), True)
+    assert gitignore.match(os.path.join(base, 'out'), False) is None
+    assert gitignore.match(os.path.join(base, 'm.txt'), False) is None
+
+
+def test_gitignore_load(tmpdir):
+    assert GitIgnore.load(str(tmpdir)) is None
+    tmpdir.join('.gitignore').write('# only a comment\n')
+    assert GitIgnore.load(str(tmpdir)) is None
+    tmpdir.join('.gitignore').write('build/\n')
+    assert len(GitIgnore.load(str(tmpdir)).rules) == 1
+
+
+@pytest.fixture
+def repository(tmpdir):
+    '''A fake Git repository.
+
+    repo/
+        .git/info/exclude       local/
+        .gitignore              build/, *_pb2.py, /top.py
+        top.py
+        main.py
+        build/b.py
+        local/l.py
+        pkg/
+            .gitignore          !gen_pb2.py, vendor
+            gen_pb2.py
+            other_pb2.py
+            vendor/v.py
+            sub/top.py
+            sub/build.py
+    '''
+    repo = tmpdir.mkdir('repo')
+    repo.mkdir('.git').mkdir('info').join('exclude').write('local/\n')
+    repo.join('.gitignore').write('build/\n*_pb2.py\n/top.py\n')
+    for path in [
+        'top.py',
+        'main.py',
+        'build/b.py',
+        'local/l.py',
+        'pkg/gen_pb2.py',
+        'pkg/other_pb2.py',
+        'pkg/vendor/v.py',
+        'pkg/sub/top.py',
+        'pkg/sub/build.py',
+    ]:
+        repo.join(*path.split('/')).write('x = 1\n', ensure=True)
+    repo.join('pkg', '.gitignore').write('!gen_pb2.py\nvendor\n')
+    return repo
+
+
+def _relative(repo, filenames):
+    return sorted(
+        os.path.relpath(filename, str(repo)).replace(os.sep, '/')
+        for filename in filenames
+    )
+
+
+def test_iter_filenames_gitignore(repository):
+    filenames = iter_filenames([str(repository)], gitignore=True)
+    assert _relative(repository, filenames) == [
+        'main.py',
+        'pkg/gen_pb2.py',
+        'pkg/sub/build.py',
+        'pkg/sub/top.py',
+    ]
+    filenames = iter_filenames([str(repository)])
+    assert len(list(filenames)) == 9
+
+
+def test_iter_filenames_gitignore_subdirectory(repository):
+    # The patterns of the parent directories apply as well
+    filenames = iter_filenames([str(repository.join('pkg'))], gitignore=True)
+    assert _relative(repository, filenames) == [
+        'pkg/gen_pb2.py',
+        'pkg/sub/build.py',
+        'pkg/sub/top.py',
+    ]
+
+
+def test_gitignore_filter_prunes(repository, mocker):
+    load = mocker.spy(GitIgnore, 'load')
+    filt = GitIgnoreFilter(str(repository))
+    explored = []
+    for root, dirs, files in os.walk(str(repository)):
+        explored.append(root)
+        dirs[:] = [name for name in dirs if name != '.git']
+        dirs[:], files = filt.filter(root, dirs, files)
+    assert _relative(repository, explored) == ['.', 'pkg', 'pkg/sub']
+    # The .gitignore files of the ignored directories are never read
+    loaded = [call[0][0] for call in load.call_args_list]
+    assert str(repository.join('build')) not in loaded
+
+
+def test_find_repository(repository):
+    assert find_repository(str(repository.join('pkg', 'sub'))) == str(
+        repository
+    )
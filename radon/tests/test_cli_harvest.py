@@ -1,3 +1,7 @@
+import json
+import os
+import time
+
 try:
     import collections.abc as collections_abc
 except ImportError:
@@ -71,7 +75,9 @@ def test_base_iter_filenames(base_config, mocker):
     h = harvest.Harvester([], base_config)
     h._iter_filenames()
 
-    iter_mock.assert_called_with([], base_config.exclude, base_config.ignore)
+    iter_mock.assert_called_with(
+        [], base_config.exclude, base_config.ignore, False
+    )
 
 
 def test_base_gobble_not_implemented(base_config):
@@ -168,12 +174,47 @@ def test_cc_as_json_xml(cc_config, mocker):
 
     h = harvest.CCHarvester([], cc_config)
     h._to_dicts = to_dicts_mock
-    assert h.as_json() == '{"a": {"rank": "A"}}'
-
     h.as_xml()
     assert d2x_mock.called
     d2x_mock.assert_called_with(to_dicts_mock.return_value)
-    assert to_dicts_mock.call_count == 2
+    assert to_dicts_mock.call_count == 1
+
+
+@pytest.mark.parametrize('min', ['A', 'B'])
+def test_cc_as_json(cc_config, min):
+    cc_config.min = min
+    h = harvest.CCHarvester([os.path.dirname(__file__)], cc_config)
+    chunks = list(h.iter_json())
+    assert len(chunks) > 2
+    # The results are streamed, not cached
+    assert h._results == []
+    assert ''.join(chunks) == json.dumps(h._to_dicts())
+
+
+def test_hal_as_json(base_config):
+    base_config.config_values['by_function'] = False
+    h = harvest.HCHarvester([os.path.dirname(__file__)], base_config)
+    assert h.as_json() == json.dumps(h._to_dicts())
+
+
+
+def test_cc_iter_xml(cc_config):
+    h = harvest.CCHarvester([os.path.dirname(__file__)], cc_config)
+    chunks = list(h.iter_xml())
+    assert len(chunks) > 2
+    # The results are streamed, not cached
+    assert h._results == []
+    assert ''.join(chunks) == h.as_xml()
+    assert list(h.iter_xml()) == chunks
+
+
+def test_cc_iter_md(cc_config):
+    h = harvest.CCHarvester([os.path.dirname(__file__)], cc_config)
+    chunks = list(h.iter_md())
+    assert len(chunks) > 2
+    # The results are streamed, not cached
+    assert h._results == []
+    assert ''.join(chunks) == h.as_md()
 
 
 def test_cc_as_md(cc_config, mocker):
@@ -189,6 +230,23 @@ def test_cc_as_md(cc_config, mocker):
     assert to_dicts_mock.call_count == 1
 
 
+
+def test_cc_iter_codeclimate_issues(cc_config, mocker):
+    f2cc_mock = mocker.patch('radon.cli.harvest.file_to_codeclimate_issues')
+    f2cc_mock.side_effect = lambda path, info, threshold, content: [path]
+    mocker.patch('radon.cli.harvest.cc_to_dict', side_effect=lambda b: b)
+
+    h = harvest.CCHarvester([], cc_config)
+    h.run = mocker.Mock(
+        return_value=iter(
+            [('a', [{'rank': 'C'}]), ('b', [{'rank': 'A'}]), ('c', [])]
+        )
+    )
+    h.config.min = 'B'
+    assert list(h.iter_codeclimate_issues()) == [['a']]
+    assert f2cc_mock.call_args[0][:3] == ('a', [{'rank': 'C'}], 'B')
+    assert h._results == []
+
 def test_cc_to_terminal(cc_config, mocker):
     reset_mock = mocker.patch('radon.cli.harvest.RESET')
     ranks_mock = mocker.patch('radon.cli.harvest.RANKS_COLORS')
@@ -240,6 +298,30 @@ def test_raw_as_xml(raw_config):
     with pytest.raises(NotImplementedError):
         h.as_xml()
 
+def test_raw_as_md(raw_config):
+    h = harvest.RawHarvester([], raw_config)
+    h._results = [
+        ('a', {'error': 'mystr'}),
+        (
+            'b',
+            {
+                'loc': 24,
+                'lloc': 27,
+                'sloc': 15,
+                'comments': 3,
+                'multi': 3,
+                'single_comments': 3,
+                'blank': 9,
+            },
+        ),
+    ]
+    assert h.as_md() == (
+        '\n| Filename | LOC | LLOC | SLOC | Comments | Single comments | Multi '
+        '| Blank |\n| -------- | --- | ---- | ---- | -------- | '
+        '--------------- | ----- | ----- |\n| b | 24 | 27 | 15 | 3 | 3 | 3 '
+        '| 9 |\n'
+    )
+
 
 def test_raw_to_terminal(raw_config):
     h = harvest.RawHarvester([], raw_config)
@@ -364,6 +446,22 @@ def test_mi_as_json(mi_config, mocker):
     h.as_json()
     d_mock.assert_called_with(dict([h._results[0], h._results[-1]]))
 
+def test_mi_as_md(mi_config):
+    h = harvest.MIHarvester([], mi_config)
+    h.config.min = 'A'
+    h.config.max = 'B'
+    h.config.sort = True
+    h._results = [
+        ('a', {'error': 'mystr'}),
+        ('b', {'mi': 25, 'rank': 'A'}),
+        ('c', {'mi': 15, 'rank': 'B'}),
+        ('d', {'mi': 0, 'rank': 'C'}),
+    ]
+    assert h.as_md() == (
+        '\n| Filename | MI | Rank |\n| -------- | -- | ---- |\n'
+        '| c | 15.00 | B |\n| b | 25.00 | A |\n'
+    )
+
 
 def test_mi_as_xml(mi_config):
     h = harvest.MIHarvester([], mi_config)
@@ -390,3 +488,172 @@ def test_mi_to_terminal(mi_config, mocker):
         ('{0} - {1}{2}{3}{4}', ('c', '<|B|>', 'B', ' (15.00)', '__R__'), {}),
         ('{0} - {1}{2}{3}{4}', ('d', '<|C|>', 'C', ' (0.00)', '__R__'), {}),
     ]
+
+
+def test_base_run_archive(base_config, tmpdir):
+    import zipfile
+
+    path = str(tmpdir.join('archive.zip'))
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('a.py', 'a = 1\n')
+        archive.writestr('test_b.py', 'b = 2\n')
+    base_config.exclude = '*!test_*'
+    h = harvest.Harvester([path], base_config)
+    h.gobble = lambda fobj: fobj.read()
+    assert list(h.run()) == [(path + '!a.py', 'a = 1\n')]
+
+    with open(path, 'wb') as fobj:
+        fobj.write(b'corrupted')
+    (name, result), = h.run()
+    assert name == path
+    assert 'error' in result
+
+
+def test_cc_run_archive_member_errors(cc_config, tmpdir):
+    import zipfile
+
+    path = str(tmpdir.join('archive.zip'))
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('a.py', 'def a():\n    pass\n')
+        archive.writestr('bad.py', b'x = "\xff\xfe"\n')
+        archive.writestr('c.py', 'def c():\n    pass\n')
+    results = list(harvest.CCHarvester([path], cc_config).run())
+    assert [name for name, _ in results] == [
+        path + '!a.py',
+        path + '!bad.py',
+        path + '!c.py',
+    ]
+    assert 'error' in results[1][1]
+    assert [b.name for b in results[2][1]] == ['c']
+
+
+def test_base_run_dedup(base_config, tmpdir, mocker):
+    for name in ('a.py', 'b.py', 'c.py'):
+        tmpdir.join(name).write('a = 1\n')
+    tmpdir.join('d.py').write('d = 1\n')
+    base_config.dedup = True
+    h = harvest.Harvester([str(tmpdir)], base_config)
+    h.gobble = mocker.Mock(side_effect=lambda fobj: fobj.read())
+    results = sorted(h.run())
+    assert results == [
+        (str(tmpdir.join(name)), content)
+        for name, content in [
+            ('a.py', 'a = 1\n'),
+            ('b.py', 'a = 1\n'),
+            ('c.py', 'a = 1\n'),
+            ('d.py', 'd = 1\n'),
+        ]
+    ]
+    assert h.gobble.call_count == 2
+
+    # Nothing is kept from one run to the next
+    assert h._seen is None
+    assert sorted(h.run()) == results
+    assert h.gobble.call_count == 4
+
+
+def test_cc_run_dedup_journal(cc_config, tmpdir, mocker):
+    for name in ('a.py', 'b.py'):
+        tmpdir.join(name).write('def f(x):\n    return x\n')
+    cc_config.dedup = True
+    cc_config.journal = str(tmpdir.join('journal'))
+    gobble = mocker.spy(harvest.CCHarvester, 'gobble')
+    h = harvest.CCHarvester([str(tmpdir)], cc_config)
+    results = sorted(h.run())
+    assert [name for name, _ in results] == [
+        str(tmpdir.join('a.py')),
+        str(tmpdir.join('b.py')),
+    ]
+    assert results[0][1] == results[1][1]
+    assert gobble.call_count == 1
+
+    # Both copies are in the journal
+    cc_config.resume = True
+    h = harvest.CCHarvester([str(tmpdir)], cc_config)
+    assert sorted(h.run()) == results
+    assert gobble.call_count == 1
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_cc_run_cache(cc_config, tmpdir, mocker, jobs):
+    mocker.patch('radon.cli.schedule.BATCH_SIZE', 1)
+    src = tmpdir.mkdir('src')
+    for name in ('a.py', 'b.py'):
+        src.join(name).write('def {0}(x):\n    return x\n'.format(name[0]))
+    past = time.time() - 60
+    for path in src.listdir():
+        os.utime(str(path), (past, past))
+    cc_config.cache_dir = str(tmpdir.join('cache'))
+    cc_config.jobs = jobs
+    results = sorted(harvest.CCHarvester([str(src)], cc_config).run())
+    assert [b.name for _, blocks in results for b in blocks] == ['a', 'b']
+
+    # Nothing is read nor analyzed again
+    gobble = mocker.patch.object(
+        harvest.CCHarvester, 'gobble', side_effect=AssertionError
+    )
+    read_file = mocker.patch.object(
+        harvest, 'read_file', side_effect=AssertionError
+    )
+    h = harvest.CCHarvester([str(src)], cc_config)
+    assert sorted(h.run()) == results
+    assert h._index is None
+
+    # A changed file is read and analyzed again
+    mocker.stopall()
+    gobble = mocker.spy(harvest.CCHarvester, 'gobble')
+    src.join('b.py').write('def c(x):\n    return x\n')
+    os.utime(str(src.join('b.py')), (past, past + 1))
+    h = harvest.CCHarvester([str(src)], cc_config)
+    results = sorted(h.run())
+    assert [b.name for _, blocks in results for b in blocks] == ['a', 'c']
+    if jobs == 1:
+        assert gobble.call_count == 1
+
+
+def test_hal_from_record(base_config):
+    from radon.metrics import h_visit
+    from radon.serialize import dumps, loads
+
+    base_config.config_values['by_function'] = False
+    h = harvest.HCHarvester([], base_config)
+    for source in ('', 'x = 1\n', 'def f(a, b):\n    return a + b\n'):
+        result = h_visit(source)
+        record = loads(dumps({'hal': result}))['hal']
+        assert h._from_record(record) == result
+        assert list(map(type, h._from_record(record).total)) == list(
+            map(type, result.total)
+        )
+    assert h._from_record({'error': 'e'}) == {'error': 'e'}
+
+
+def test_base_iter_filenames_files_from(base_config, tmpdir):
+    tmpdir.join('a.py').write('a = 1\n')
+    listed = tmpdir.join('files')
+    listed.write('x.py\ntest_y.py\nz.py\n')
+    base_config.exclude = 'test_*'
+    base_config.files_from = str(listed)
+    h = harvest.Harvester([str(tmpdir.join('a.py'))], base_config)
+    assert list(h._iter_filenames()) == [
+        str(tmpdir.join('a.py')),
+        'x.py',
+        'z.py',
+    ]
+
+
+@pytest.mark.parametrize(
+    'options', [{}, {'jobs': 2}, {'prefetch': 2}, {'dedup': True}]
+)
+def test_cc_run_files_from_missing(cc_config, tmpdir, mocker, options):
+    mocker.patch('radon.cli.schedule.BATCH_SIZE', 1 << 20)
+    tmpdir.join('good.py').write('def f(x):\n    return x\n')
+    good, missing = str(tmpdir.join('good.py')), str(tmpdir.join('missing.py'))
+    listed = tmpdir.join('files')
+    listed.write('{0}\n{1}\n'.format(good, missing))
+    cc_config.files_from = str(listed)
+    for option, value in options.items():
+        setattr(cc_config, option, value)
+    results = list(harvest.CCHarvester([], cc_config).run())
+    assert [name for name, _ in results] == [good, missing]
+    assert [b.name for b in results[0][1]] == ['f']
+    assert 'No such file' in results[1][1]['error']
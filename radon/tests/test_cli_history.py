@@ -0,0 +1,83 @@
+import subprocess
+
+import pytest
+
+import radon.cli as cli
+from radon.cli.harvest import CCHarvester
+from radon.cli.history import GitError, HistoryMiner, iter_tree
+from radon.tests.test_cli_harvest import CC_CONFIG
+
+
+def git(repo, *args):
+    return subprocess.check_output(
+        ('git', '-C', repo, '-c', 'user.name=radon', '-c', 'user.email=r@d.n')
+        + args
+    )
+
+
+@pytest.fixture
+def repo(tmpdir):
+    try:
+        git(str(tmpdir), 'init', '-q')
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip('git is not available')
+    tmpdir.join('a.py').write('def f(x):\n    return x\n')
+    tmpdir.join('b.py').write('def g(x):\n    return x\n')
+    tmpdir.join('README').write('not python')
+    tmpdir.mkdir('.hidden').join('c.py').write('x = 1\n')
+    git(str(tmpdir), 'add', '.')
+    git(str(tmpdir), 'commit', '-q', '-m', 'first')
+    tmpdir.join('a.py').write('def f(x):\n    return x if x else 0\n')
+    git(str(tmpdir), 'commit', '-q', '-a', '-m', 'second')
+    return str(tmpdir)
+
+
+def test_iter_tree(repo):
+    assert sorted(path for path, _ in iter_tree(repo, 'HEAD')) == [
+        '.hidden/c.py',
+        'README',
+        'a.py',
+        'b.py',
+    ]
+
+
+def test_history_miner(repo, mocker):
+    h = CCHarvester([], CC_CONFIG)
+    gobble = mocker.spy(h, 'gobble')
+    miner = HistoryMiner(repo, 'HEAD', h)
+    history = list(miner.run())
+
+    assert len(history) == 2
+    (_, first), (_, second) = history
+    assert [path for path, _ in first] == ['a.py', 'b.py']
+    assert [path for path, _ in second] == ['a.py', 'b.py']
+    assert first[0][1][0].complexity == 1
+    assert second[0][1][0].complexity == 2
+    # b.py did not change, so its blob is analyzed only once
+    assert second[1][1] is first[1][1]
+    assert gobble.call_count == 3
+
+
+def test_history_miner_exclude(repo):
+    miner = HistoryMiner(repo, 'HEAD~1', CCHarvester([], CC_CONFIG), 'b*')
+    (_, results), = miner.run()
+    assert [path for path, _ in results] == ['a.py']
+
+
+def test_history_miner_bad_range(repo):
+    miner = HistoryMiner(repo, 'nonexistent', CCHarvester([], CC_CONFIG))
+    with pytest.raises(GitError):
+        list(miner.run())
+
+
+def test_history_command(repo, tmpdir):
+    output = tmpdir.join('output.json')
+    cli.history('HEAD', repo=repo, json=True, output_file=str(output))
+    lines = output.read().splitlines()
+    assert len(lines) == 2
+    assert '"a.py"' in lines[0]
+
+
+def test_history_command_unknown_metric(repo):
+    with pytest.raises(ValueError):
+        cli.history('HEAD', metric='nope', repo=repo)
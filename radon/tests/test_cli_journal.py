@@ -0,0 +1,142 @@
+import time
+
+import pytest
+
+import radon.cli.harvest as harvest
+import radon.cli.schedule as schedule
+from radon.cli.journal import MAGIC, Journal, read_journal
+from radon.complexity import cc_visit
+
+SOURCE = '''
+def f(x):
+    if x:
+        return 1
+    return 2
+'''
+
+
+@pytest.fixture
+def sources(tmpdir):
+    tmpdir.join('a.py').write(SOURCE)
+    tmpdir.join('b.py').write('def g(:\n')
+    return tmpdir
+
+
+def test_journal_append_and_resume(tmpdir):
+    path = str(tmpdir.join('journal'))
+    blocks = cc_visit(SOURCE)
+    with Journal(path, 'cc') as journal:
+        journal.append('a.py', 'k1', [('a.py', blocks)])
+        journal.append('b.py', 'k2', [('b.py', {'error': 'mystr'})])
+
+    with Journal(path, 'cc', resume=True) as journal:
+        assert journal.keys() == {'a.py': 'k1', 'b.py': 'k2'}
+        assert journal.get('a.py', 'k1') == [('a.py', blocks)]
+        assert journal.get('a.py', 'k2') is None
+        assert journal.get('c.py', 'k1') is None
+        journal.append('c.py', 'k3', [])
+
+    with Journal(path, 'cc', resume=True) as journal:
+        assert sorted(journal.keys()) == ['a.py', 'b.py', 'c.py']
+
+    # Without resume, the journal is started anew
+    with Journal(path, 'cc') as journal:
+        assert journal.keys() == {}
+    with open(path, 'rb') as fobj:
+        assert fobj.read() == MAGIC
+
+
+@pytest.mark.parametrize('damage', ['truncate', 'garbage', 'corrupt'])
+def test_journal_torn_tail(tmpdir, damage):
+    path = str(tmpdir.join('journal'))
+    with Journal(path, 'mi') as journal:
+        journal.append('a.py', 'k1', [('a.py', 12.5)])
+    with open(path, 'rb') as fobj:
+        good = fobj.read()
+    with Journal(path, 'mi', resume=True) as journal:
+        journal.append('b.py', 'k2', [('b.py', 42.0)])
+    with open(path, 'rb') as fobj:
+        data = fobj.read()
+    if damage == 'truncate':
+        data = data[:-3]
+    elif damage == 'garbage':
+        data = good + b'\x01\x02\x03'
+    else:
+        data = data[:-1] + b'\xff'
+    with open(path, 'wb') as fobj:
+        fobj.write(data)
+
+    entries, size = read_journal(data)
+    assert list(entries) == ['a.py']
+    assert size == len(good)
+
+    with Journal(path, 'mi', resume=True) as journal:
+        assert journal.keys() == {'a.py': 'k1'}
+        journal.append('c.py', 'k3', [('c.py', 1.0)])
+    with Journal(path, 'mi', resume=True) as journal:
+        assert journal.keys() == {'a.py': 'k1', 'c.py': 'k3'}
+
+
+@pytest.mark.parametrize(
+    'cls', [harvest.CCHarvester, harvest.RawHarvester, harvest.MIHarvester]
+)
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_run_resume(sources, mocker, cls, jobs, make_config):
+    mocker.patch.object(schedule, 'BATCH_SIZE', 1)
+    journal = str(sources.join('journal'))
+    paths = [str(sources.join('a.py')), str(sources.join('b.py'))]
+    expected = list(cls(paths, make_config()).run())
+
+    config = make_config(journal=journal, jobs=jobs)
+    assert list(cls(paths, config).run()) == expected
+
+    # Nothing is analyzed again
+    gobble = mocker.patch.object(cls, 'gobble', side_effect=AssertionError)
+    config = make_config(journal=journal, resume=True, jobs=jobs)
+    h = cls(paths, config)
+    assert list(h.run()) == expected
+    assert gobble.call_count == 0
+    assert h._journal is None
+
+
+def test_run_resume_changed(sources, mocker, make_config):
+    journal = str(sources.join('journal'))
+    paths = [str(sources.join('a.py')), str(sources.join('b.py'))]
+    config = make_config(journal=journal)
+    list(harvest.CCHarvester(paths, config).run())
+
+    sources.join('b.py').write('def g():\n    pass\n')
+    gobble = mocker.spy(harvest.CCHarvester, 'gobble')
+    config = make_config(journal=journal, resume=True)
+    results = dict(harvest.CCHarvester(paths, config).run())
+    assert gobble.call_count == 1
+    assert [b.name for b in results[paths[1]]] == ['g']
+
+    # The options of the analysis are part of the key
+    config = make_config(journal=journal, resume=True, no_assert=True)
+    list(harvest.CCHarvester(paths, config).run())
+    assert gobble.call_count == 3
+
+
+class SlowHarvester(harvest.CCHarvester):
+    '''Spend half a second on the slow files.'''
+
+    def gobble(self, fobj):
+        if 'slow' in fobj.name:
+            time.sleep(0.5)
+        return super(SlowHarvester, self).gobble(fobj)
+
+
+def test_run_resume_budget(tmpdir, make_config):
+    tmpdir.join('slow.py').write(SOURCE)
+    journal = str(tmpdir.join('journal'))
+    path = str(tmpdir.join('slow.py'))
+    config = make_config(journal=journal, timeout=0.1)
+    assert dict(SlowHarvester([path], config).run()) == {
+        path: {'error': 'timeout'}
+    }
+
+    # The file went over budget, so it is analyzed again with a larger one
+    config = make_config(journal=journal, resume=True, timeout=5)
+    results = dict(SlowHarvester([path], config).run())
+    assert [b.name for b in results[path]] == ['f']
@@ -0,0 +1,73 @@
+import io
+import sys
+
+from radon.cli.colors import BRIGHT, RED, RESET
+from radon.cli.output import TerminalWriter, output_fd
+
+LINES = [
+    ('a', ('mystr',), {'error': True}),
+    ('b{', (), {}),
+    (('p1', 'p2'), (), {'indent': 1}),
+    ('{0}: {1}', ('x', 2), {'indent': 2}),
+    ([], (), {}),
+]
+EXPECTED = (
+    'a\n    {0}{1}ERROR{2}: mystr\nb{{\n    p1\n    p2\n        x: 2\n'.format(
+        BRIGHT, RED, RESET
+    )
+)
+
+
+def test_write_lines():
+    stream = io.StringIO()
+    with TerminalWriter(stream) as writer:
+        writer.write_lines(LINES)
+        assert stream.getvalue() == ''
+    assert stream.getvalue() == EXPECTED
+
+
+def test_buffer_size(mocker):
+    stream = mocker.Mock()
+    with TerminalWriter(stream, buffer_size=10) as writer:
+        writer.write_lines([('a' * 4, (), {})] * 5)
+    assert stream.write.call_args_list == [
+        mocker.call('aaaa\naaaa\n'),
+        mocker.call('aaaa\naaaa\n'),
+        mocker.call('aaaa\n'),
+    ]
+
+
+def test_write_fd(tmpdir):
+    path = str(tmpdir.join('out.txt'))
+    with io.open(path, 'w', encoding='utf-8') as stream:
+        stream.write(u'\xe9\n')
+        fd = output_fd(stream)
+        assert fd == stream.fileno()
+        with TerminalWriter(stream, fd, buffer_size=1) as writer:
+            writer.write_lines(LINES)
+        stream.write(u'end\n')
+    with io.open(path, encoding='utf-8') as fobj:
+        assert fobj.read() == u'\xe9\n' + EXPECTED + u'end\n'
+
+
+def test_write_fd_errors(tmpdir):
+    path = str(tmpdir.join('out.txt'))
+    with io.open(path, 'w', encoding='ascii', errors='replace') as stream:
+        with TerminalWriter(stream, output_fd(stream)) as writer:
+            writer.write_lines([(u'caf\xe9', (), {})])
+    with io.open(path, encoding='ascii') as fobj:
+        assert fobj.read() == u'caf?\n'
+
+
+def test_output_fd(mocker):
+    assert output_fd(sys.stdout) is None
+    assert output_fd(io.StringIO()) is None
+    assert output_fd(mocker.Mock()) is None
+    isatty_mock = mocker.patch('radon.cli.output.os.isatty')
+    isatty_mock.return_value = True
+    assert output_fd(mocker.Mock(**{'fileno.return_value': 3})) is None
+    isatty_mock.return_value = False
+    assert output_fd(mocker.Mock(**{'fileno.return_value': 3})) == 3
+    # The text stream must translate the newlines
+    mocker.patch('radon.cli.output.os.linesep', '\r\n')
+    assert output_fd(mocker.Mock(**{'fileno.return_value': 3})) is None
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+import radon.cli.harvest as harvest
+import radon.cli.pipeline as pipeline
+
+
+@pytest.fixture
+def sources(tmpdir):
+    for i in range(20):
+        body = '    if x:\n        x += 1\n' * i
+        tmpdir.join('mod{0:02}.py'.format(i)).write(
+            'def f(x):\n{0}    return x\n'.format(body)
+        )
+    tmpdir.join('bad.py').write('def f(:\n')
+    return tmpdir
+
+
+def test_prefetch_order(sources):
+    names = sorted(str(p) for p in sources.listdir())
+    files = list(pipeline.prefetch(names + ['-'], 3))
+    assert [name for name, _ in files] == names + ['-']
+    for name, fobj in files[:-1]:
+        with open(name) as orig:
+            assert fobj.read() == orig.read()
+    assert files[-1][1] is None
+
+
+def test_prefetch_bounded(sources, mocker):
+    read = mocker.spy(pipeline, '_read')
+    names = sorted(str(p) for p in sources.listdir())
+    files = pipeline.prefetch(names, 2, depth=3)
+    next(files)
+    assert read.call_count <= 4
+    files.close()
+
+
+@pytest.mark.parametrize(
+    'cls', [harvest.CCHarvester, harvest.RawHarvester, harvest.MIHarvester]
+)
+def test_run_pipeline(sources, cls, make_config):
+    paths = [str(sources)]
+    serial = list(cls(paths, make_config()).run())
+    pipelined = list(cls(paths, make_config(prefetch=4)).run())
+    assert pipelined == serial
+    assert len(serial) == 21
+
+
+def test_run_pipeline_close(sources, mocker, make_config):
+    mocker.patch.object(pipeline, 'QUEUE_SIZE', 1)
+    threads = threading.active_count()
+    harvester = harvest.CCHarvester([str(sources)], make_config())
+    results = pipeline.run_pipeline(harvester, 2)
+    next(results)
+    results.close()
+    assert threading.active_count() == threads
+
+
+def test_run_pipeline_error(sources, mocker, make_config):
+    mocker.patch.object(
+        harvest.CCHarvester, '_analyze', side_effect=KeyboardInterrupt
+    )
+    harvester = harvest.CCHarvester([str(sources)], make_config())
+    with pytest.raises(KeyboardInterrupt):
+        list(pipeline.run_pipeline(harvester, 2))
+
+
+def test_run_pipeline_journal(sources, mocker, make_config):
+    journal = str(sources.join('journal'))
+    paths = [str(sources.join('mod01.py')), str(sources.join('bad.py'))]
+    expected = list(harvest.CCHarvester(paths, make_config()).run())
+
+    config = make_config(journal=journal, prefetch=2)
+    assert list(harvest.CCHarvester(paths, config).run()) == expected
+
+    gobble = mocker.patch.object(
+        harvest.CCHarvester, 'gobble', side_effect=AssertionError
+    )
+    config = make_config(journal=journal, resume=True, prefetch=2)
+    assert list(harvest.CCHarvester(paths, config).run()) == expected
+    assert gobble.call_count == 0
@@ -0,0 +1,109 @@
+import os
+import time
+
+import pytest
+
+import radon.cli.harvest as harvest
+import radon.cli.schedule as schedule
+
+
+def test_schedule_largest_first():
+    files = [(0, 'a.py', 10), (1, 'b.py', 500), (2, 'c.py', 20)]
+    assert schedule.schedule(files, batch_size=100) == [
+        [(1, 'b.py')],
+        [(2, 'c.py'), (0, 'a.py')],
+    ]
+
+
+def test_schedule_batches():
+    files = [(i, 'f{0}.py'.format(i), 40) for i in range(5)]
+    assert schedule.schedule(files, batch_size=100) == [
+        [(0, 'f0.py'), (1, 'f1.py')],
+        [(2, 'f2.py'), (3, 'f3.py')],
+        [(4, 'f4.py')],
+    ]
+    assert schedule.schedule(files, batch_size=1000, batch_files=3) == [
+        [(0, 'f0.py'), (1, 'f1.py'), (2, 'f2.py')],
+        [(3, 'f3.py'), (4, 'f4.py')],
+    ]
+
+
+def test_file_size(tmpdir):
+    path = tmpdir.join('mod.py')
+    path.write('x = 1\n')
+    assert schedule.file_size(str(path)) == 6
+    assert schedule.file_size(str(tmpdir.join('missing.py'))) == 0
+
+
+def test_run_parallel(tmpdir, mocker, make_config):
+    mocker.patch.object(schedule, 'BATCH_SIZE', 64)
+    for i in range(6):
+        body = '    if x:\n        x += 1\n' * i
+        tmpdir.join('mod{0}.py'.format(i)).write(
+            'def f(x):\n{0}    return x\n'.format(body)
+        )
+    tmpdir.join('bad.py').write('def f(:\n')
+    paths = [str(tmpdir)]
+
+    serial = list(harvest.CCHarvester(paths, make_config()).run())
+    parallel = list(harvest.CCHarvester(paths, make_config(jobs=2)).run())
+    assert parallel == serial
+    assert len(serial) == 7
+    assert 'error' in dict(serial)[str(tmpdir.join('bad.py'))]
+
+
+class BudgetHarvester(harvest.CCHarvester):
+    '''Spend too much time or memory on some files.'''
+
+    def gobble(self, fobj):
+        if 'slow' in fobj.name:
+            time.sleep(5)
+        if 'big' in fobj.name:
+            bytearray(1 << 30)
+        return super(BudgetHarvester, self).gobble(fobj)
+
+
+def test_run_parallel_timeout(tmpdir, capsys, make_config):
+    for name in ('fast.py', 'slow.py'):
+        tmpdir.join(name).write('def f(x):\n    return x\n')
+    harvester = BudgetHarvester([str(tmpdir)], make_config(timeout=0.2))
+
+    results = dict(harvester.run())
+    slow = str(tmpdir.join('slow.py'))
+    assert results[slow] == {'error': 'timeout'}
+    assert 'error' not in results[str(tmpdir.join('fast.py'))]
+    assert harvester.skipped == [(slow, 'timeout')]
+    assert capsys.readouterr().err == (
+        '1 files skipped:\n    {0} (timeout)\n'.format(slow)
+    )
+
+
+@pytest.mark.skipif(
+    not os.path.exists('/proc/self/statm'), reason='needs /proc'
+)
+def test_run_parallel_memory_limit(tmpdir, make_config):
+    for name in ('small.py', 'big.py'):
+        tmpdir.join(name).write('def f(x):\n    return x\n')
+    with open('/proc/self/statm') as fobj:
+        pages = int(fobj.read().split()[0])
+    used = pages * os.sysconf('SC_PAGE_SIZE') // (1 << 20)
+    config = make_config(memory_limit=used + 256)
+    harvester = BudgetHarvester([str(tmpdir)], config)
+
+    results = dict(harvester.run())
+    big = str(tmpdir.join('big.py'))
+    assert results[big] == {'error': 'out of memory'}
+    assert 'error' not in results[str(tmpdir.join('small.py'))]
+    assert harvester.skipped == [(big, 'out of memory')]
+
+
+def test_log_skipped(capsys, make_config):
+    harvester = harvest.CCHarvester([], make_config())
+    harvester.log_skipped()
+    assert capsys.readouterr().err == ''
+
+    harvester.skipped = [('a.py', 'timeout'), ('b.py', 'out of memory')]
+    harvester.log_skipped()
+    assert capsys.readouterr().err == (
+        '2 files skipped:\n    a.py (timeout)\n    b.py (out of memory)\n'
+    )
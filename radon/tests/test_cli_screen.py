@@ -0,0 +1,179 @@
+import io
+
+import pytest
+
+import radon.cli.harvest as harvest
+from radon.cli.screen import (
+    GENERATED_ERROR,
+    PREFIX_SIZE,
+    Screen,
+    generated_error,
+    is_generated,
+)
+from radon.cli.tools import SourceFile
+
+PB2 = (
+    '# -*- coding: utf-8 -*-\n'
+    '# Generated by the protocol buffer compiler.  DO NOT EDIT!\n'
+    '# source: a.proto\n'
+    'from google.protobuf import descriptor as _descriptor\n'
+)
+MODULE = 'def f(x):\n    return x\n'
+
+
+@pytest.mark.parametrize(
+    'screen,prefix,size,reason',
+    [
+        (Screen(), PB2, len(PB2), "marker 'DO NOT EDIT'"),
+        (Screen('generated by'), PB2, len(PB2), "marker 'generated by'"),
+        (Screen(''), PB2, len(PB2), None),
+        (Screen(), MODULE, len(MODULE), None),
+        # The markers are only searched in the comments
+        (Screen(), '"""Generated by f."""\n', 22, None),
+        (Screen(), '\n' * 20 + '# DO NOT EDIT\n', 34, None),
+        (Screen(max_size=100), MODULE, 101, 'larger than 100 bytes'),
+        (Screen(), 'x=1;' * 100, 4000, 'mean line length of 400'),
+        (Screen(line_length=0), 'x=1;' * 100, 4000, None),
+        (Screen(), b'# @generated\n', 13, "marker '@generated'"),
+    ],
+)
+def test_screen_check(screen, prefix, size, reason):
+    assert screen.check(prefix, size) == reason
+
+
+def test_screen_check_file(tmpdir):
+    screen = Screen(max_size=PREFIX_SIZE * 2)
+    data = PB2 + 'x = 1\n' * PREFIX_SIZE
+    source = SourceFile('a.py', data.encode('utf-8'))
+    assert screen.check_file(source) == 'larger than 8192 bytes'
+    assert screen.check_file(io.StringIO(PB2)) == "marker 'DO NOT EDIT'"
+
+    path = tmpdir.join('a.py')
+    path.write(PB2)
+    with open(str(path)) as fobj:
+        assert screen.check_file(fobj) == "marker 'DO NOT EDIT'"
+        # The file is rewound
+        assert fobj.read() == PB2
+
+
+def test_screen_check_file_unseekable():
+    class Stream(object):
+        def seekable(self):
+            return False
+
+        def read(self, size=-1):
+            raise AssertionError
+
+    assert Screen().check_file(Stream()) is None
+
+
+def test_is_generated():
+    assert is_generated({'error': generated_error('marker')})
+    assert not is_generated({'error': GENERATED_ERROR})
+    assert not is_generated({'error': 'invalid syntax'})
+    assert not is_generated([])
+
+
+def test_screen_from_config(make_config):
+    assert Screen.from_config(make_config()) is None
+    screen = Screen.from_config(
+        make_config(
+            generated='skip',
+            generated_markers='a, b,',
+            generated_size=2,
+            generated_line_length=80,
+        )
+    )
+    assert screen.key() == ('a,b', 2048, 80)
+
+
+@pytest.fixture
+def sources(tmpdir):
+    tmpdir.join('a_pb2.py').write(PB2)
+    tmpdir.join('b.py').write(MODULE)
+    tmpdir.join('c.min.py').write('x=1;' * 1000 + '\n')
+    return tmpdir
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_run_generated_skip(sources, capsys, mocker, jobs, make_config):
+    mocker.patch('radon.cli.schedule.BATCH_SIZE', 1)
+    gobble = mocker.spy(harvest.CCHarvester, 'gobble')
+    harvester = harvest.CCHarvester(
+        [str(sources)], make_config(generated='skip', jobs=jobs)
+    )
+    results = dict(harvester.run())
+    assert list(results) == [str(sources.join('b.py'))]
+    assert harvester.skipped == []
+    assert capsys.readouterr().err == ''
+    if jobs == 1:
+        assert gobble.call_count == 1
+
+
+def test_run_generated_report(sources, capsys, make_config):
+    harvester = harvest.CCHarvester(
+        [str(sources)], make_config(generated='report')
+    )
+    assert list(dict(harvester.run())) == [str(sources.join('b.py'))]
+    assert sorted(harvester.skipped) == [
+        (
+            str(sources.join('a_pb2.py')),
+            "generated code: marker 'DO NOT EDIT'",
+        ),
+        (
+            str(sources.join('c.min.py')),
+            'generated code: mean line length of 4000',
+        ),
+    ]
+    assert capsys.readouterr().err.startswith('2 files skipped:\n')
+
+
+def test_run_generated_cache(sources, tmpdir, mocker, make_config):
+    config = make_config(
+        generated='report', cache_dir=str(tmpdir.join('cache'))
+    )
+    first = harvest.CCHarvester([str(sources)], config)
+    list(first.run())
+
+    # The outcome of the screen is cached as well
+    mocker.patch.object(
+        harvest.CCHarvester, 'gobble', side_effect=AssertionError
+    )
+    mocker.patch.object(Screen, 'check', side_effect=AssertionError)
+    second = harvest.CCHarvester([str(sources)], config)
+    assert list(dict(second.run())) == [str(sources.join('b.py'))]
+    assert sorted(second.skipped) == sorted(first.skipped)
+
+    # Without the pre-screen, only the generated modules are analyzed, since
+    # the results of the others are still in the cache
+    mocker.stopall()
+    gobble = mocker.spy(harvest.CCHarvester, 'gobble')
+    config.generated = None
+    third = harvest.CCHarvester([str(sources)], config)
+    assert len(list(third.run())) == 3
+    assert gobble.call_count == 2
+
+    # Changing the rules screens the files again, without analyzing them
+    mocker.patch.object(
+        harvest.CCHarvester, 'gobble', side_effect=AssertionError
+    )
+    check = mocker.spy(Screen, 'check')
+    config.generated = 'skip'
+    config.generated_line_length = 0
+    fourth = harvest.CCHarvester([str(sources)], config)
+    assert sorted(dict(fourth.run())) == [
+        str(sources.join('b.py')),
+        str(sources.join('c.min.py')),
+    ]
+    assert check.call_count == 3
+
+
+def test_run_generated_journal(sources, make_config):
+    journal = str(sources.join('journal'))
+    paths = [str(sources)]
+    list(harvest.CCHarvester(paths, make_config(journal=journal)).run())
+
+    # The journal is keyed on the rules of the screen
+    config = make_config(journal=journal, resume=True, generated='skip')
+    results = dict(harvest.CCHarvester(paths, config).run())
+    assert list(results) == [str(sources.join('b.py'))]
@@ -0,0 +1,148 @@
+import sqlite3
+
+import pytest
+
+from radon.cli import Config
+from radon.cli.harvest import (
+    CCHarvester,
+    HCHarvester,
+    MIHarvester,
+    RawHarvester,
+)
+from radon.cli.store import SQLiteStore
+from radon.metrics import h_visit
+from radon.tests.test_cli_harvest import (
+    BASE_CONFIG,
+    CC_CONFIG,
+    MI_CONFIG,
+    RAW_CONFIG,
+)
+from radon.visitors import Class, Function
+
+CC_RESULTS = [
+    Function('f', 1, 0, 5, False, None, [], 3),
+    Class(
+        'A',
+        7,
+        0,
+        12,
+        [Function('meth', 8, 4, 12, True, 'A', [], 12)],
+        [],
+        12,
+    ),
+    Function('meth', 8, 4, 12, True, 'A', [], 12),
+]
+
+RAW_RESULT = {
+    'loc': 24,
+    'lloc': 27,
+    'sloc': 15,
+    'comments': 3,
+    'multi': 3,
+    'single_comments': 3,
+    'blank': 3,
+}
+
+HAL_CODE = '''
+def f(a, b):
+    return a + b * 2
+
+def g(c):
+    return -c
+'''
+
+
+@pytest.fixture
+def database(tmpdir):
+    return str(tmpdir.join('radon.db'))
+
+
+def query(database, sql, *args):
+    connection = sqlite3.connect(database)
+    try:
+        return connection.execute(sql, args).fetchall()
+    finally:
+        connection.close()
+
+
+def test_store_batches(database):
+    with SQLiteStore(database, batch_size=2) as store:
+        run_id = store.start_run('cc', 'label')
+        store.add(run_id, 'cc', 'a.py', CC_RESULTS)
+        # The last row is still buffered
+        assert store._pending == {'cc': [store._pending['cc'][0]]}
+
+    assert query(database, 'SELECT id, metric, label FROM runs') == [
+        (run_id, 'cc', 'label')
+    ]
+    assert query(database, 'SELECT * FROM cc ORDER BY lineno, name') == [
+        (run_id, 'a.py', 'f', 'function', 1, 5, 0, 3, 'A'),
+        (run_id, 'a.py', 'A', 'class', 7, 12, 0, 12, 'C'),
+        (run_id, 'a.py', 'A.meth', 'method', 8, 12, 4, 12, 'C'),
+    ]
+
+
+def test_store_rollback(database):
+    with pytest.raises(ValueError):
+        with SQLiteStore(database) as store:
+            store.start_run('mi')
+            raise ValueError
+    assert query(database, 'SELECT * FROM runs') == []
+
+
+def test_store_indexes(database):
+    SQLiteStore(database).close()
+    plan = query(
+        database,
+        'EXPLAIN QUERY PLAN SELECT complexity FROM cc '
+        'WHERE run_id = ? AND path = ? AND name = ?',
+        1,
+        'a.py',
+        'f',
+    )
+    assert 'cc_run_path_name' in str(plan)
+
+
+def test_cc_to_sqlite(database):
+    h = CCHarvester([], CC_CONFIG)
+    h._results = [('a.py', CC_RESULTS), ('b.py', {'error': 'mystr'})]
+    first = h.to_sqlite(database)
+    second = h.to_sqlite(database, label='second')
+
+    assert second == first + 1
+    assert query(database, 'SELECT COUNT(*) FROM cc') == [(6,)]
+    assert query(database, 'SELECT run_id, path, error FROM errors') == [
+        (first, 'b.py', 'mystr'),
+        (second, 'b.py', 'mystr'),
+    ]
+
+
+def test_raw_to_sqlite(database):
+    h = RawHarvester([], RAW_CONFIG)
+    h._results = [('a.py', RAW_RESULT)]
+    run_id = h.to_sqlite(database)
+
+    assert query(database, 'SELECT * FROM raw') == [
+        (run_id, 'a.py', '', 24, 27, 15, 3, 3, 3, 3)
+    ]
+
+
+def test_mi_to_sqlite(database):
+    h = MIHarvester([], MI_CONFIG)
+    h._results = [('a.py', {'mi': 42.5, 'rank': 'A'})]
+    run_id = h.to_sqlite(database)
+
+    assert query(database, 'SELECT * FROM mi') == [
+        (run_id, 'a.py', '', 42.5, 'A')
+    ]
+
+
+def test_hal_to_sqlite(database):
+    config = BASE_CONFIG.config_values.copy()
+    config['by_function'] = False
+    h = HCHarvester([], Config(**config))
+    h._results = [('a.py', h_visit(HAL_CODE))]
+    h.to_sqlite(database)
+
+    rows = query(database, 'SELECT path, name, h1, N2 FROM hal')
+    assert rows == [('a.py', '', 3, 5), ('a.py', 'f', 2, 4), ('a.py', 'g', 1, 1)]
@@ -7,6 +7,8 @@ import sys
 import pytest
 
 import radon.cli.tools as tools
+from radon.complexity import cc_visit
+from radon.metrics import Halstead, HalsteadReport, h_visit
 from radon.raw import Module
 from radon.visitors import Class, Function
 
@@ -327,6 +329,21 @@ def test_raw_to_dict():
     }
 
 
+
+def test_iter_xml():
+    assert list(tools.iter_xml([])) == ['<ccm />']
+    assert list(tools.iter_xml([('a', []), ('b', {'error': 'e'})])) == [
+        '<ccm />'
+    ]
+
+    block = dict(CC_TO_XML_CASE[0], name=u'<f\xe9&>')
+    chunks = list(tools.iter_xml([('a', [block]), ('b', []), ('c', [block])]))
+    assert len(chunks) == 3
+    assert chunks[0].startswith('<ccm><metric>')
+    assert chunks[1].startswith('<metric>')
+    assert chunks[2] == '</ccm>'
+    assert u'<unit>&lt;f&#233;&amp;&gt;</unit>' in chunks[0]
+
 def test_cc_to_xml():
     assert (
         tools.dict_to_xml({'filename': CC_TO_XML_CASE})
@@ -401,6 +418,104 @@ def test_cc_to_md():
     assert md == _md
 
 
+
+def test_iter_md():
+    chunks = list(
+        tools.iter_md(('Filename', 'MI'), [[('a', 1), ('a', 2)], [], [('b', 3)]])
+    )
+    assert chunks == [
+        '\n| Filename | MI |\n| -------- | -- |\n',
+        '| a | 1 |\n| a | 2 |\n',
+        '| b | 3 |\n',
+    ]
+
+
+def test_raw_to_md_rows():
+    result = {'loc': 24, 'lloc': 27, 'sloc': 15, 'comments': 3, 'multi': 3,
+              'single_comments': 2, 'blank': 9}
+    assert tools.raw_to_md_rows('a.py', result) == [
+        ['a.py', 24, 27, 15, 3, 2, 3, 9]
+    ]
+
+
+def test_mi_to_md_rows():
+    assert tools.mi_to_md_rows('a.py', {'mi': 71.2345, 'rank': 'A'}) == [
+        ('a.py', '71.23', 'A')
+    ]
+
+
+def test_hal_to_md_rows():
+    report = HalsteadReport(*range(12))
+    result = Halstead(report, [('f', report)])
+    assert tools.hal_to_md_rows('a.py', result) == [
+        ('a.py', '') + tuple(range(12))
+    ]
+    assert tools.hal_to_md_rows('a.py', result, True) == [
+        ('a.py', 'f') + tuple(range(12))
+    ]
+
+
+JSON_SOURCE = u'''
+class Caf\xe9(object):
+    def method(self, x):
+        def closure():
+            return x and 1
+        return closure
+
+    class Inner:
+        pass
+
+
+def f(x, y):
+    if x or y:
+        return 1
+    return 2.0
+'''
+
+
+def test_cc_to_dict_order():
+    block = [b for b in cc_visit(JSON_SOURCE) if b.name == u'Caf\xe9'][0]
+    assert list(tools.cc_to_dict(block)) == [
+        'type',
+        'rank',
+        'name',
+        'lineno',
+        'col_offset',
+        'endline',
+        'complexity',
+        'methods',
+    ]
+
+
+def test_cc_to_json():
+    for block in cc_visit(JSON_SOURCE):
+        assert tools.cc_to_json(block) == json.dumps(tools.cc_to_dict(block))
+        for method in getattr(block, 'methods', []):
+            assert tools.cc_to_json(method) == json.dumps(
+                tools.cc_to_dict(method)
+            )
+
+
+def test_hal_to_json():
+    result = h_visit(JSON_SOURCE)
+    assert tools.hal_to_json(result) == json.dumps(
+        {
+            'total': result.total._asdict(),
+            'functions': dict(
+                (name, report._asdict()) for name, report in result.functions
+            ),
+        }
+    )
+    report = HalsteadReport(1, 2, 3, 4, 5, 6, 7.5, float('nan'), 0, 1e20,
+                            float('inf'), True)
+    assert tools.hal_report_to_json(report) == json.dumps(report._asdict())
+
+
+def test_iter_json():
+    assert list(tools.iter_json([])) == ['{}']
+    chunks = list(tools.iter_json([('a', '1'), (u'\xe9', '[]')]))
+    assert chunks == ['{"a": 1', ', "\\u00e9": []', '}']
+
 def test_cc_error_to_codeclimate():
     error_result = {'error': 'Error: invalid syntax (<unknown>, line 100)'}
 
@@ -439,6 +554,13 @@ def test_cc_error_to_codeclimate():
     assert actual_sorted == expected_sorted
 
 
+
+def test_file_to_codeclimate_issues():
+    assert tools.file_to_codeclimate_issues(
+        'filename', CC_TO_CODECLIMATE_CASE
+    ) == tools.dict_to_codeclimate_issues({'filename': CC_TO_CODECLIMATE_CASE})
+    assert tools.file_to_codeclimate_issues('filename', []) == []
+
 def test_cc_to_codeclimate():
     actual_results = tools.dict_to_codeclimate_issues(
         {'filename': CC_TO_CODECLIMATE_CASE}
@@ -614,3 +736,154 @@ def test_cc_to_terminal():
         120,
         6,
     )
+
+
+ARCHIVE_MEMBERS = {
+    'pkg/__init__.py': b'',
+    'pkg/mod.py': b'# -*- coding: latin-1 -*-\ns = "\xe8"\n',
+    'pkg/data.txt': b'not python',
+}
+
+
+@pytest.fixture
+def zip_archive(tmpdir):
+    import zipfile
+
+    path = str(tmpdir.join('pkg-1.0-py3-none-any.whl'))
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, data in sorted(ARCHIVE_MEMBERS.items()):
+            archive.writestr(name, data)
+    return path
+
+
+@pytest.fixture
+def tar_archive(tmpdir):
+    import io
+    import tarfile
+
+    path = str(tmpdir.join('pkg-1.0.tar.gz'))
+    with tarfile.open(path, 'w:gz') as archive:
+        for name, data in sorted(ARCHIVE_MEMBERS.items()):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+def test_is_archive():
+    assert tools._is_archive('a.whl')
+    assert tools._is_archive('a.zip')
+    assert tools._is_archive('a.tar.gz')
+    assert not tools._is_archive('a.py')
+    assert not tools._is_archive('a.tar')
+
+
+def test_decode_source():
+    assert tools.decode_source(b'# coding: latin-1\nx = "\xe8"\n') == (
+        u'# coding: latin-1\nx = "\xe8"\n'
+    )
+    assert tools.decode_source(b'\xef\xbb\xbfx = 1\n') == u'x = 1\n'
+
+
+
+@pytest.mark.parametrize(
+    'data,encoding',
+    [
+        (b'x = 1\n', 'utf-8'),
+        (b'', 'utf-8'),
+        (b'# -*- coding: latin-1 -*-\n', 'iso8859-1'),
+        (b'#!/usr/bin/env python\n# vim: fileencoding=cp1252 :\n', 'cp1252'),
+        (b'x = 1\n# coding: latin-1\n', 'utf-8'),
+        (b'\xef\xbb\xbfx = 1\n', 'utf-8-sig'),
+        (b'\xef\xbb\xbf# coding: utf-8\n', 'utf-8-sig'),
+    ],
+)
+def test_detect_source_encoding(data, encoding):
+    assert tools.detect_source_encoding(data) == encoding
+
+
+@pytest.mark.parametrize(
+    'data', [b'# coding: unknown\n', b'\xef\xbb\xbf# coding: latin-1\n']
+)
+def test_detect_source_encoding_errors(data):
+    with pytest.raises(SyntaxError):
+        tools.detect_source_encoding(data)
+
+
+def test_source_file(tmpdir):
+    path = tmpdir.join('mod.py')
+    path.write_binary(b'# coding: latin-1\r\ns = "\xe8"\r\n')
+    with tools.SourceFile.from_path(str(path)) as fobj:
+        assert fobj.name == str(path)
+        assert fobj.read() == u'# coding: latin-1\ns = "\xe8"\n'
+        assert fobj.read_source() == path.read_binary()
+
+    fobj = tools.SourceFile('mod.py', b'\xef\xbb\xbfs = "\xc3\xa8"\n')
+    assert fobj.read() == u's = "\xe8"\n'
+
+    fobj = tools.SourceFile('mod.py', b's = "\xc3\xa8"\n', 'latin-1')
+    assert fobj.read() == u's = "\xc3\xa8"\n'
+    assert fobj.read_source() == fobj.read()
+
+
+@pytest.mark.parametrize('archive', ['zip_archive', 'tar_archive'])
+def test_iter_archive(archive, request):
+    path = request.getfixturevalue(archive)
+    members = [
+        (name, fobj.read()) for name, fobj in tools.iter_archive(path)
+    ]
+    assert members == [
+        (path + '!pkg/__init__.py', u''),
+        (path + '!pkg/mod.py', u'# -*- coding: latin-1 -*-\ns = "\xe8"\n'),
+    ]
+
+    excluded = tools.iter_archive(path, ['*/__init__.py'])
+    assert [name for name, _ in excluded] == [path + '!pkg/mod.py']
+
+
+def test_iter_filenames_archive(zip_archive, iter_files):
+    assert iter_files([zip_archive]) == [zip_archive]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 1 << 16])
+@pytest.mark.parametrize(
+    'data,paths',
+    [
+        (b'', []),
+        (b'a.py\nb.py\n', ['a.py', 'b.py']),
+        (b'a.py\r\n\r\nb.py', ['a.py', 'b.py']),
+        (b'a.py\0b\n.py\0\0', ['a.py', 'b\n.py']),
+        (b'dir/\xc3\xa9.py', ['dir/\xe9.py']),
+    ],
+)
+def test_iter_file_list(data, paths, chunk_size):
+    import io
+
+    fobj = io.BytesIO(data)
+    assert list(tools.iter_file_list(fobj, chunk_size)) == paths
+
+
+def test_iter_file_list_lazy():
+    chunks = [b'a.py\nb', b'.py\n', b'c.py']
+
+    class Pipe(object):
+        def read1(self, size):
+            return chunks.pop(0) if chunks else b''
+
+    paths = tools.iter_file_list(Pipe())
+    assert next(paths) == 'a.py'
+    assert len(chunks) == 2
+    assert list(paths) == ['b.py', 'c.py']
+
+
+def test_iter_listed_files(tmpdir, mocker):
+    import io
+
+    path = tmpdir.join('files')
+    path.write_binary(b'a.py\ntests/test_a.py\nb.py\n')
+    listed = tools.iter_listed_files(str(path), 'tests/*')
+    assert list(listed) == ['a.py', 'b.py']
+
+    stdin = mocker.patch('sys.stdin')
+    stdin.buffer = io.BytesIO(b'c.py\0d.py')
+    assert list(tools.iter_listed_files('-')) == ['c.py', 'd.py']
@@ -5,6 +5,7 @@ import pytest
 
 from radon.complexity import *
 from radon.contrib.flake8 import Flake8Checker
+from radon.raw import analyze
 from radon.visitors import Class, Function
 
 from .test_complexity_visitor import GENERAL_CASES, dedent
@@ -116,3 +117,41 @@ def test_flake8_checker():
     assert list(c.run()) == []
     c.max_cc = 3
     assert list(c.run()) == [(7, 0, 'R701 \'f\' is too complex (4)', type(c))]
+
+
+def test_flake8_checker_other_metrics():
+    code = dedent(GENERAL_CASES[0][0])
+    c = Flake8Checker(ast.parse(code), 'test case', code.splitlines(True))
+    assert list(c.run()) == []
+    c.min_mi = 60
+    c.max_effort = 400
+    c.max_sloc = 14
+    c.max_lloc = 15
+    assert list(c.run()) == [
+        (1, 0, 'R702 maintainability index is too low (56.82)', type(c)),
+        (7, 0, 'R703 \'f\' has too high Halstead effort (474.69)', type(c)),
+        (1, 0, 'R704 too many source lines of code (15)', type(c)),
+    ]
+    assert c.raw == analyze(code)
+
+    # Without the lines, only the AST-based checks are run
+    c = Flake8Checker(ast.parse(code), 'test case')
+    c.min_mi = 60
+    c.max_effort = 400
+    c.max_sloc = 14
+    assert [e[2][:4] for e in c.run()] == ['R703']
+
+
+def test_flake8_checker_cache(tmpdir, mocker):
+    code = dedent(GENERAL_CASES[0][0])
+    lines = code.splitlines(True)
+    mocker.patch.object(Flake8Checker, 'cache_dir', str(tmpdir))
+    mocker.patch.object(Flake8Checker, 'max_cc', 3)
+    expected = [(7, 0, 'R701 \'f\' is too complex (4)', Flake8Checker)]
+
+    c = Flake8Checker(ast.parse(code), 'test case', lines)
+    assert list(c.run()) == expected
+    visitor_mock = mocker.patch('radon.contrib.flake8.ComplexityVisitor')
+    c = Flake8Checker(ast.parse(code), 'test case', lines)
+    assert list(c.run()) == expected
+    assert visitor_mock.from_ast.call_count == 0
@@ -0,0 +1,110 @@
+import io
+import os
+
+import pytest
+
+from radon.cli.harvest import CCHarvester, Harvester
+from radon.complexity import add_inner_blocks, cc_visit
+from radon.metrics import h_visit, mi_visit
+from radon.raw import analyze
+from radon.serialize import (
+    MAGIC,
+    FormatError,
+    ResultWriter,
+    dump_record,
+    dumps,
+    iter_results,
+    loads,
+    read_record,
+)
+from radon.tests.test_cli_harvest import BASE_CONFIG, CC_CONFIG
+
+SOURCE = '''\
+import os
+
+class A(object):
+    """Docstring."""
+
+    class B:
+        def m(self):
+            return 1 if self else 2
+
+    def n(self, x):
+        def closure():
+            return x
+        return closure
+
+async def f(a, b):
+    # Comment
+    return a and b or os.sep
+'''
+
+
+def results():
+    return {
+        'cc': add_inner_blocks(cc_visit(SOURCE)),
+        'raw': analyze(SOURCE),
+        'mi': mi_visit(SOURCE, True),
+        'hal': h_visit(SOURCE),
+    }
+
+
+def test_round_trip():
+    expected = results()
+    assert loads(dumps(expected)) == expected
+    assert loads(dumps({})) == {}
+    assert loads(dumps({'cc': {'error': 'e'}})) == {'cc': {'error': 'e'}}
+
+
+def test_harvester_results():
+    raw = analyze(SOURCE)
+    data = dump_record('raw', 'a.py', dict(raw._asdict()))
+    assert read_record(io.BytesIO(data)) == ('raw', 'a.py', raw)
+    data = dump_record('mi', 'a.py', {'mi': 42.5, 'rank': 'A'})
+    assert read_record(io.BytesIO(data)) == ('mi', 'a.py', 42.5)
+
+
+def test_writer_reader():
+    fobj = io.BytesIO()
+    writer = ResultWriter(fobj)
+    records = [
+        (metric, u'dir/\xe9\udcff.py', result)
+        for metric, result in sorted(results().items())
+    ]
+    records.append(('hal', 'b.py', {'error': 'invalid syntax'}))
+    for record in records:
+        writer.write(*record)
+    fobj.seek(0)
+    assert list(iter_results(fobj)) == records
+
+
+def test_errors():
+    with pytest.raises(ValueError):
+        dump_record('unknown', 'a.py', 1)
+    with pytest.raises(FormatError):
+        list(iter_results(io.BytesIO(b'nope')))
+    with pytest.raises(FormatError):
+        loads(b'nope')
+
+    data = dump_record('cc', 'a.py', cc_visit(SOURCE))
+    for size in (1, 10, len(data) - 1):
+        with pytest.raises(FormatError):
+            read_record(io.BytesIO(data[:size]))
+        with pytest.raises(FormatError):
+            loads(MAGIC + data[:size])
+    assert read_record(io.BytesIO(b'')) is None
+    with pytest.raises(FormatError):
+        read_record(io.BytesIO(b'X' + data[1:]))
+
+
+def test_harvester_to_binary():
+    h = CCHarvester([os.path.dirname(__file__)], CC_CONFIG)
+    fobj = io.BytesIO()
+    h.to_binary(fobj)
+    fobj.seek(0)
+    assert [(path, result) for _, path, result in iter_results(fobj)] == list(
+        h.results
+    )
+
+    with pytest.raises(NotImplementedError):
+        Harvester([], BASE_CONFIG).to_binary(io.BytesIO())